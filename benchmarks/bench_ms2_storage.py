@@ -0,0 +1,88 @@
+"""Benchmark storage managers of MS MAIN table on bundled test data.
+
+Compare MS whose MAIN columns are all stored with StandardStMan
+(layout before IncrementalStMan was introduced) with the default
+layout, where constant or rarely changing columns are stored with
+IncrementalStMan. Write time of MAIN table and on-disk size of
+MAIN table and of whole MS are measured.
+
+Usage:
+    python benchmarks/bench_ms2_storage.py [-n REPEAT] [nqmfile ...]
+"""
+import argparse
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import timeit
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2._casa import build_table, put_table_keyword
+from nro45data.psw.ms2.builder import SUBTABLES, build_ms2, build_ms2_subtable
+from nro45data.psw.ms2.filler import fill_ms2
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.filler.main import fill_main
+from nro45data.psw.ms2.schema.column_description import DataManager
+from nro45data.psw.ms2.schema.main import MsMainTable
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data")
+
+
+def build_standard(msfile: str):
+    table_desc = MsMainTable.as_dict()
+    incremental_columns = [name for name, desc in table_desc.items() if desc["dataManagerType"] == "IncrementalStMan"]
+    standard = DataManager("StandardStMan", columns=incremental_columns)
+    build_table(msfile, MsMainTable.as_dict([standard]))
+    put_table_keyword(msfile, "MS_VERSION", 2.0)
+    for subtable_name, table_schema in SUBTABLES:
+        build_ms2_subtable(msfile, subtable_name, table_schema.as_dict())
+
+
+def main_table_size(msfile: str) -> int:
+    return sum(e.stat().st_size for e in os.scandir(msfile) if e.is_file())
+
+
+def total_size(msfile: str) -> int:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(msfile) for f in files)
+
+
+def measure(builder, hdu, msfile: str, repeat: int) -> tuple[float, int, int]:
+    context = ConversionContext(hdu)
+
+    def setup():
+        shutil.rmtree(msfile, ignore_errors=True)
+        builder(msfile)
+
+    elapsed = min(timeit.repeat(lambda: fill_main(msfile, context), setup=setup, number=1, repeat=repeat))
+
+    shutil.rmtree(msfile, ignore_errors=True)
+    builder(msfile)
+    fill_ms2(msfile, hdu, context)
+    return elapsed, main_table_size(msfile), total_size(msfile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--repeat", type=int, default=10)
+    parser.add_argument("nqmfiles", nargs="*")
+    args = parser.parse_args()
+
+    nqmfiles = args.nqmfiles or sorted(glob.glob(os.path.join(DATA_DIR, "*.nqm")))
+
+    logging.disable(logging.INFO)
+    print(f"{'file':32s} {'layout':12s} {'write [ms]':>11s} {'MAIN [KiB]':>11s} {'MS [KiB]':>10s}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        msfile = os.path.join(tmpdir, "out.ms")
+        for nqmfile in nqmfiles:
+            hdu = _read_psw_table(nqmfile)
+            for layout, builder in (("standard", build_standard), ("incremental", build_ms2)):
+                elapsed, main_size, ms_size = measure(builder, hdu, msfile, args.repeat)
+                print(
+                    f"{os.path.basename(nqmfile):32s} {layout:12s} {elapsed * 1e3:11.3f} "
+                    f"{main_size / 1024:11.1f} {ms_size / 1024:10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
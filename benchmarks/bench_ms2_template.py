@@ -0,0 +1,48 @@
+"""Benchmark creation of empty MS.
+
+Compare building MAIN table and all subtables from the schema
+(build_ms2) with copying cached template MS (build_ms2_from_template).
+Template is built before measurement so that only the cost of
+copying is measured for the latter.
+
+Usage:
+    python benchmarks/bench_ms2_template.py [-n REPEAT]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import timeit
+
+from nro45data.psw.ms2.builder import build_ms2
+from nro45data.psw.ms2.template import build_ms2_from_template, get_template
+
+
+def measure(builder, msfile: str, repeat: int) -> float:
+    def setup():
+        shutil.rmtree(msfile, ignore_errors=True)
+
+    return min(timeit.repeat(lambda: builder(msfile), setup=setup, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # keep template away from user cache
+        os.environ["NRO45DATA_CACHE_DIR"] = os.path.join(tmpdir, "cache")
+        get_template()
+
+        msfile = os.path.join(tmpdir, "out.ms")
+        print(f"{'method':12s} {'elapsed [ms]':>13s}")
+        for method, builder in (("build", build_ms2), ("template", build_ms2_from_template)):
+            elapsed = measure(builder, msfile, args.repeat)
+            print(f"{method:12s} {elapsed * 1e3:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
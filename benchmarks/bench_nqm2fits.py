@@ -0,0 +1,60 @@
+"""Benchmark nqm2fits writers on bundled test data.
+
+Compare astropy round-trip (_read_psw + _to_fits) with raw passthrough
+writer (_to_fits_raw). Plain file copy is also measured as a lower
+bound of conversion time.
+
+Usage:
+    python benchmarks/bench_nqm2fits.py [-n REPEAT] [nqmfile ...]
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import timeit
+import warnings
+
+from nro45data.psw.io import _read_psw, _to_fits, _to_fits_raw
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data")
+
+
+def write_astropy(nqmfile: str, fitsfile: str):
+    _to_fits(_read_psw(nqmfile), fitsfile, overwrite=True)
+
+
+def write_raw(nqmfile: str, fitsfile: str):
+    _to_fits_raw(nqmfile, fitsfile, overwrite=True)
+
+
+def copy(nqmfile: str, fitsfile: str):
+    shutil.copyfile(nqmfile, fitsfile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("nqmfiles", nargs="*")
+    args = parser.parse_args()
+
+    nqmfiles = args.nqmfiles or sorted(glob.glob(os.path.join(DATA_DIR, "*.nqm")))
+
+    warnings.simplefilter("ignore")
+    print(f"{'file':40s} {'astropy [ms]':>14s} {'raw [ms]':>14s} {'speedup':>8s} {'copy [ms]':>10s}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fitsfile = os.path.join(tmpdir, "out.fits")
+        for nqmfile in nqmfiles:
+            results = []
+            for func in (write_astropy, write_raw, copy):
+                elapsed = min(timeit.repeat(lambda: func(nqmfile, fitsfile), number=1, repeat=args.repeat))
+                results.append(elapsed * 1e3)
+            t_astropy, t_raw, t_copy = results
+            print(
+                f"{os.path.basename(nqmfile):40s} {t_astropy:14.3f} {t_raw:14.3f} "
+                f"{t_astropy / t_raw:8.1f} {t_copy:10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
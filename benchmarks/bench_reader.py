@@ -0,0 +1,64 @@
+"""Benchmark PSW readers on bundled test data.
+
+Compare astropy-based reader (_read_psw) with native structured-dtype
+reader (_read_psw_table). Each measurement includes access to all
+columns so that lazy loading in astropy is taken into account.
+Metadata-only access through column projection is also measured.
+
+Usage:
+    python benchmarks/bench_reader.py [-n REPEAT] [nqmfile ...]
+"""
+import argparse
+import glob
+import os
+import timeit
+import warnings
+
+from nro45data.psw.io import _read_psw, _read_psw_table
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data")
+
+
+def read_astropy(nqmfile: str):
+    hdu = _read_psw(nqmfile)[0]
+    for name in hdu.columns.names:
+        hdu.data[name]
+
+
+def read_native(nqmfile: str):
+    table = _read_psw_table(nqmfile)
+    for name in table.columns:
+        table.data[name]
+
+
+def read_projected(nqmfile: str):
+    columns = ["MJDST", "MJDET", "TEMP", "PATM", "VWIND", "DWIND"]
+    table = _read_psw_table(nqmfile, columns=columns)
+    for name in columns:
+        table.data[name].copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("nqmfiles", nargs="*")
+    args = parser.parse_args()
+
+    nqmfiles = args.nqmfiles or sorted(glob.glob(os.path.join(DATA_DIR, "*.nqm")))
+
+    warnings.simplefilter("ignore")
+    print(f"{'file':40s} {'astropy [ms]':>14s} {'native [ms]':>14s} {'speedup':>8s} {'projected [ms]':>15s}")
+    for nqmfile in nqmfiles:
+        results = []
+        for func in (read_astropy, read_native, read_projected):
+            elapsed = min(timeit.repeat(lambda: func(nqmfile), number=1, repeat=args.repeat))
+            results.append(elapsed * 1e3)
+        t_astropy, t_native, t_projected = results
+        print(
+            f"{os.path.basename(nqmfile):40s} {t_astropy:14.3f} {t_native:14.3f} "
+            f"{t_astropy / t_native:8.1f} {t_projected:15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 from .psw import nqm2fits
+from .psw import nqm2fits_batch
 from .psw import nqm2ms2
+from .psw import nqm2ms2_batch
+from .psw import nqm2sdfits
+from .psw import probe_nqm
 
 __version__ = "1.2.1"
-__all__ = ["nqm2fits", "nqm2ms2"]
+__all__ = ["nqm2fits", "nqm2fits_batch", "nqm2ms2", "nqm2ms2_batch", "nqm2sdfits", "probe_nqm"]
 
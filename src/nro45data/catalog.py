@@ -0,0 +1,452 @@
+"""Catalog of NRO 45m PSW data (.nqm) backed by SQLite.
+
+Directory trees are indexed incrementally into a local SQLite database
+so that files matching given conditions are found without reading them.
+
+Example:
+    >>> from nro45data.catalog import Catalog
+    >>> with Catalog("nqm.sqlite") as catalog:
+    ...     catalog.update("/path/to/archive")
+    ...     files = catalog.query(object="NML-Tau", receiver="H40", processor="AOS-Wide")
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import fnmatch
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .psw.io.compression import DECOMPRESSION_ERRORS
+from .psw.io.header import read_psw_header
+from .psw.io.probe import _summarize_header
+from .psw.io.reader import _read_psw_table
+from .psw.ms2.filler.utils import get_intent_map, get_processor_map
+
+LOG = logging.getLogger(__name__)
+
+CATALOG_SCHEMA_VERSION = 1
+
+# columns needed to summarize scans, intents, and arrays
+SUMMARY_COLUMNS = [
+    "ISCN",
+    "SCNTP",
+    "ARRYT",
+    "MJDST",
+    "MJDET",
+    "RX",
+    "POLTP",
+    "MULTN",
+    "NCH",
+    "NFCAL",
+    "FQCAL",
+    "CHCAL",
+]
+
+# file name patterns of NRO 45m PSW data including compressed ones
+NQM_PATTERNS = ("*.nqm", "*.nqm.gz", "*.nqm.xz", "*.nqm.zst")
+
+# errors that make a single file fail to be indexed without aborting update
+INDEX_ERRORS = (RuntimeError, ValueError, KeyError, OSError) + DECOMPRESSION_ERRORS
+
+# MJD epoch for conversion from datetime to MJD seconds
+MJD_EPOCH = datetime.datetime(1858, 11, 17, tzinfo=datetime.timezone.utc)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    telescope TEXT,
+    observer TEXT,
+    object TEXT COLLATE NOCASE,
+    ra TEXT,
+    dec TEXT,
+    epoch REAL,
+    arry1 TEXT,
+    arry2 TEXT,
+    arry3 TEXT,
+    arry4 TEXT,
+    num_rows INTEGER,
+    row_size INTEGER,
+    num_scans INTEGER,
+    start_time TEXT,
+    end_time TEXT,
+    time_start REAL,
+    time_end REAL
+);
+CREATE INDEX IF NOT EXISTS files_object ON files (object);
+CREATE INDEX IF NOT EXISTS files_time ON files (time_start, time_end);
+CREATE TABLE IF NOT EXISTS processors (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    processor TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (file_id, processor)
+);
+CREATE INDEX IF NOT EXISTS processors_processor ON processors (processor);
+CREATE TABLE IF NOT EXISTS arrays (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    array TEXT NOT NULL,
+    receiver TEXT COLLATE NOCASE,
+    polarization TEXT,
+    beam INTEGER,
+    num_chan INTEGER,
+    freq_start REAL,
+    freq_end REAL,
+    PRIMARY KEY (file_id, array)
+);
+CREATE INDEX IF NOT EXISTS arrays_receiver ON arrays (receiver);
+CREATE TABLE IF NOT EXISTS intents (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    intent TEXT NOT NULL COLLATE NOCASE,
+    intent_id INTEGER NOT NULL,
+    num_scans INTEGER,
+    num_rows INTEGER,
+    time_start REAL,
+    time_end REAL,
+    PRIMARY KEY (file_id, intent)
+);
+CREATE INDEX IF NOT EXISTS intents_intent ON intents (intent);
+"""
+
+
+@dataclasses.dataclass
+class CatalogUpdate:
+    """Statistics of catalog update.
+
+    Attributes:
+        indexed: List of files newly indexed or re-indexed
+        skipped: Number of unchanged files
+        removed: List of files removed from the catalog
+        failed: List of files that could not be indexed
+    """
+
+    indexed: List[str] = dataclasses.field(default_factory=list)
+    skipped: int = 0
+    removed: List[str] = dataclasses.field(default_factory=list)
+    failed: List[str] = dataclasses.field(default_factory=list)
+
+
+def _to_mjd_seconds(value: Union[datetime.datetime, datetime.date, float]) -> float:
+    """Convert time to MJD in seconds, which is the unit of MJDST/MJDET.
+
+    Args:
+        value: datetime, date, or MJD in seconds. Naive datetime is
+            regarded as UTC.
+
+    Returns:
+        MJD in seconds
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return (value - MJD_EPOCH).total_seconds()
+    elif isinstance(value, datetime.date):
+        return _to_mjd_seconds(datetime.datetime(value.year, value.month, value.day))
+    else:
+        return float(value)
+
+
+def _summarize_arrays(data) -> List[Tuple[Any, ...]]:
+    """Summarize arrays in the same way as get_array_configuration.
+
+    Args:
+        data: Column accessor of PSW data
+
+    Returns:
+        List of (array, receiver, polarization, beam, num_chan, freq_start, freq_end)
+    """
+    unique_array, array_index = np.unique(data["ARRYT"], return_index=True)
+    sort_index = np.argsort([int(x.lstrip("A")) for x in unique_array])
+    poltp = data["POLTP"][array_index]
+    rx = data["RX"][array_index]
+    pol_spec = rx if np.all(poltp == "") else poltp
+
+    summary = []
+    for isort in sort_index:
+        i = array_index[isort]
+        ncal = data["NFCAL"][i]
+        nchan = int(data["NCH"][i])
+        freq_start, freq_end = np.interp([0, nchan - 1], data["CHCAL"][i, :ncal], data["FQCAL"][i, :ncal])
+        summary.append(
+            (
+                str(unique_array[isort]),
+                str(rx[isort]),
+                str(pol_spec[isort]),
+                int(data["MULTN"][i]),
+                nchan,
+                float(freq_start),
+                float(freq_end),
+            )
+        )
+
+    return summary
+
+
+def _summarize_intents(data) -> List[Tuple[Any, ...]]:
+    """Summarize scan intents in the same way as get_intent_map.
+
+    Args:
+        data: Column accessor of PSW data
+
+    Returns:
+        List of (intent, intent_id, num_scans, num_rows, time_start, time_end)
+    """
+    intent_column = data["SCNTP"]
+    intent_map = get_intent_map(data["ISCN"], intent_column)
+
+    summary = []
+    for intent, intent_id in intent_map.items():
+        mask = intent_column == intent
+        summary.append(
+            (
+                str(intent),
+                int(intent_id),
+                len(np.unique(data["ISCN"][mask])),
+                int(np.count_nonzero(mask)),
+                float(data["MJDST"][mask].min()),
+                float(data["MJDET"][mask].max()),
+            )
+        )
+
+    return summary
+
+
+class Catalog:
+    """SQLite-backed catalog of NRO 45m PSW data.
+
+    Args:
+        dbpath: Name of the SQLite database. Created if it doesn't exist.
+    """
+
+    def __init__(self, dbpath: str):
+        self.dbpath = dbpath
+        self._connection = sqlite3.connect(dbpath)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+
+    def __enter__(self) -> Catalog:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close database connection."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _iter_files(self, root: str, pattern: Union[str, Sequence[str]]) -> Iterator[str]:
+        patterns = [pattern] if isinstance(pattern, str) else pattern
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(f for f in filenames if any(fnmatch.fnmatch(f, p) for p in patterns)):
+                yield os.path.abspath(os.path.join(dirpath, filename))
+
+    def _insert(self, path: str, stat: os.stat_result):
+        header, _ = read_psw_header(path)
+        summary = _summarize_header(path, header)
+        data = _read_psw_table(path, columns=SUMMARY_COLUMNS).data
+        processors, _ = get_processor_map(*summary.arrays)
+
+        cursor = self._connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        cursor.execute(
+            "INSERT INTO files (path, size, mtime_ns, telescope, observer, object, ra, dec, epoch, "
+            "arry1, arry2, arry3, arry4, num_rows, row_size, num_scans, start_time, end_time, time_start, time_end) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                summary.telescope,
+                summary.observer,
+                summary.object,
+                summary.ra,
+                summary.dec,
+                summary.epoch,
+                *summary.arrays,
+                summary.num_rows,
+                summary.row_size,
+                len(np.unique(data["ISCN"])),
+                summary.start_time,
+                summary.end_time,
+                float(data["MJDST"].min()) if summary.num_rows > 0 else None,
+                float(data["MJDET"].max()) if summary.num_rows > 0 else None,
+            ),
+        )
+        file_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO processors (file_id, processor) VALUES (?, ?)", [(file_id, p) for p in processors]
+        )
+        if summary.num_rows > 0:
+            cursor.executemany(
+                "INSERT INTO arrays VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(file_id, *a) for a in _summarize_arrays(data)],
+            )
+            cursor.executemany(
+                "INSERT INTO intents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(file_id, *i) for i in _summarize_intents(data)],
+            )
+
+    def update(
+        self, root: str, pattern: Union[str, Sequence[str]] = NQM_PATTERNS, prune: bool = True
+    ) -> CatalogUpdate:
+        """Index files under given directory.
+
+        Files whose size and modification time are unchanged since
+        the last update are skipped. Files that cannot be read, e.g.
+        truncated or corrupt archives, are reported as failed while
+        the other files are indexed.
+
+        Args:
+            root: Top directory to index
+            pattern: Glob pattern(s) of file names. Default is NQM_PATTERNS,
+                which includes compressed data.
+            prune: Remove catalog entries under root for files that
+                no longer exist. Default is True.
+
+        Returns:
+            Statistics of the update
+        """
+        result = CatalogUpdate()
+        root = os.path.abspath(root)
+        known = dict(
+            (path, (size, mtime_ns))
+            for path, size, mtime_ns in self._connection.execute("SELECT path, size, mtime_ns FROM files")
+        )
+
+        found = set()
+        with self._connection:
+            for path in self._iter_files(root, pattern):
+                found.add(path)
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_size, stat.st_mtime_ns):
+                    result.skipped += 1
+                    continue
+
+                # failure of one file only discards its own entries
+                self._connection.execute("SAVEPOINT index_file")
+                try:
+                    self._insert(path, stat)
+                except INDEX_ERRORS as e:
+                    LOG.warning("Failed to index %s: %s", path, e)
+                    self._connection.execute("ROLLBACK TO index_file")
+                    self._connection.execute("RELEASE index_file")
+                    result.failed.append(path)
+                else:
+                    self._connection.execute("RELEASE index_file")
+                    result.indexed.append(path)
+
+            if prune:
+                prefix = os.path.join(root, "")
+                result.removed = sorted(p for p in known if p.startswith(prefix) and p not in found)
+                self._connection.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in result.removed])
+
+        LOG.info(
+            "catalog update: indexed %d, skipped %d, removed %d, failed %d",
+            len(result.indexed),
+            result.skipped,
+            len(result.removed),
+            len(result.failed),
+        )
+        return result
+
+    def query(
+        self,
+        object: Optional[str] = None,
+        receiver: Optional[str] = None,
+        processor: Optional[str] = None,
+        intent: Optional[str] = None,
+        observer: Optional[str] = None,
+        start: Optional[Union[datetime.datetime, datetime.date, float]] = None,
+        end: Optional[Union[datetime.datetime, datetime.date, float]] = None,
+    ) -> List[str]:
+        """Find files that match all given conditions.
+
+        String conditions are case-insensitive.
+
+        Args:
+            object: Name of the target (OBJECT)
+            receiver: Name of the receiver (RX), e.g. "H40"
+            processor: Type of the spectrometer, e.g. "AOS-Wide" or "AC45"
+            intent: Scan type (SCNTP), e.g. "ON"
+            observer: Name of the observer (OBSERVER)
+            start: Find files whose observation ends after start.
+                Either datetime in UTC or MJD in seconds.
+            end: Find files whose observation starts before end.
+                Either datetime in UTC or MJD in seconds.
+
+        Returns:
+            List of file paths sorted by observation start time
+        """
+        conditions = []
+        parameters: List[Any] = []
+        if object is not None:
+            conditions.append("f.object = ?")
+            parameters.append(object)
+        if observer is not None:
+            conditions.append("f.observer = ? COLLATE NOCASE")
+            parameters.append(observer)
+        if receiver is not None:
+            conditions.append("EXISTS (SELECT 1 FROM arrays a WHERE a.file_id = f.id AND a.receiver = ?)")
+            parameters.append(receiver)
+        if processor is not None:
+            conditions.append("EXISTS (SELECT 1 FROM processors p WHERE p.file_id = f.id AND p.processor = ?)")
+            parameters.append(processor)
+        if intent is not None:
+            conditions.append("EXISTS (SELECT 1 FROM intents i WHERE i.file_id = f.id AND i.intent = ?)")
+            parameters.append(intent)
+        if start is not None:
+            conditions.append("f.time_end >= ?")
+            parameters.append(_to_mjd_seconds(start))
+        if end is not None:
+            conditions.append("f.time_start <= ?")
+            parameters.append(_to_mjd_seconds(end))
+
+        sql = "SELECT f.path FROM files f"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY f.time_start, f.path"
+
+        return [row[0] for row in self._connection.execute(sql, parameters)]
+
+    def describe(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get catalog entry of given file.
+
+        Args:
+            path: Name of the file
+
+        Returns:
+            Header metadata with "processors", "arrays", and "intents" summaries.
+            None if the file is not in the catalog.
+        """
+        self._connection.row_factory = sqlite3.Row
+        try:
+            row = self._connection.execute("SELECT * FROM files WHERE path = ?", (os.path.abspath(path),)).fetchone()
+            if row is None:
+                return None
+
+            entry = dict(row)
+            file_id = entry.pop("id")
+            entry["processors"] = [
+                r["processor"]
+                for r in self._connection.execute("SELECT * FROM processors WHERE file_id = ?", (file_id,))
+            ]
+            for table, order in (("arrays", "rowid"), ("intents", "intent_id")):
+                entry[table] = [
+                    {k: r[k] for k in r.keys() if k != "file_id"}
+                    for r in self._connection.execute(
+                        f"SELECT * FROM {table} WHERE file_id = ? ORDER BY {order}", (file_id,)  # nosec B608
+                    )
+                ]
+        finally:
+            self._connection.row_factory = None
+
+        return entry
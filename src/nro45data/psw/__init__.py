@@ -1,9 +1,19 @@
 import logging
+from typing import Optional, Sequence
 
+from .batch import BatchReport
+from .batch import _run_batch
+from .io import NqmSummary
+from .io import _probe_psw
 from .io import _read_psw
-from .io import _to_fits
+from .io import _read_psw_table
+from .io import _to_fits_raw
+from .io import _to_fits_compressed
 from .ms2 import _to_ms2
+from .ms2.filler.context import ConversionContext
 from .ms4 import _to_ms4
+from .sdfits import SDFITS_SOURCE_COLUMNS
+from .sdfits import _to_sdfits
 
 
 logging.basicConfig(
@@ -14,23 +24,79 @@ logging.basicConfig(
 )
 
 
-def nqm2fits(nqmfile: str, fitsfile: str, overwrite: bool = False) -> bool:
+def probe_nqm(nqmfile: str) -> NqmSummary:
+    """Summarize NRO45m PSW data (.nqm) from its header.
+
+    Only header blocks are read so that it is cheap enough
+    to triage many files.
+
+    Args:
+        nqmfile: Input NRO45m PSW file name
+
+    Returns:
+        Summary of the data such as target, map center,
+        number of rows, and observing time range.
+    """
+    return _probe_psw(nqmfile)
+
+
+def nqm2fits(
+    nqmfile: str, fitsfile: str, overwrite: bool = False, checksum: bool = False, compression: Optional[str] = None
+) -> bool:
     """Convert NRO45m PSW data (.nqm) to FITS.
 
+    Data section is copied from the input as it is without being
+    parsed so that memory usage is constant regardless of data size.
+
+    If compression is specified, quantized spectra (LDATA) are written
+    to a separate tile-compressed image extension named LDATA while
+    the other columns are kept in the binary table. Tiles are compressed
+    losslessly.
+
     Args:
         nqmfile: Input NRO45m PSW file name
         fitsfile: Output FITS file name
         overwrite: Overwrite existing output file or not.
             Default is False (not overwrite).
+        checksum: Write CHECKSUM and DATASUM keywords. Data checksum is
+            computed while the input is read. Default is False.
+        compression: Tile compression algorithm for spectra, either
+            "RICE_1", "GZIP_1", or "GZIP_2". Default is None (no compression).
 
     Returns:
         Conversion status. True is successful.
     """
-    hdulist = _read_psw(nqmfile)
-    return _to_fits(hdulist, fitsfile, overwrite)
+    if compression:
+        hdulist = _read_psw(nqmfile)
+        return _to_fits_compressed(hdulist, fitsfile, overwrite, checksum=checksum, compression=compression)
+
+    return _to_fits_raw(nqmfile, fitsfile, overwrite, checksum=checksum)
+
+
+def nqm2sdfits(nqmfile: str, sdfitsfile: str, overwrite: bool = False) -> bool:
+    """Convert NRO45m PSW data (.nqm) to SDFITS.
+
+    Unlike nqm2fits, spectra are decoded from quantized values
+    (SFCTR * LDATA + ADOFF) and stored as float32 DATA column together
+    with frequency axis (CRPIX1/CRVAL1/CDELT1), TSYS, and scan/intent
+    columns of each row.
+
+    Args:
+        nqmfile: Input NRO45m PSW file name
+        sdfitsfile: Output SDFITS file name
+        overwrite: Overwrite existing output file or not.
+            Default is False (not overwrite).
+
+    Returns:
+        Conversion status. True is successful.
+    """
+    table = _read_psw_table(nqmfile, columns=SDFITS_SOURCE_COLUMNS)
+    return _to_sdfits(table, sdfitsfile, overwrite)
 
 
-def nqm2ms2(nqmfile: str, msfile: str, overwrite: bool = False) -> bool:
+def nqm2ms2(
+    nqmfile: str, msfile: str, overwrite: bool = False, storage_profile: str = "default", jobs: int = 1
+) -> bool:
     """Convert NRO45m PSW data (.nqm) to MeasurementSet v2.
 
     Not implemented yet.
@@ -40,12 +106,64 @@ def nqm2ms2(nqmfile: str, msfile: str, overwrite: bool = False) -> bool:
         msfile: Output MSv2 file name
         overwrite: Overwrite existing output file or not.
             Default is False (not overwrite).
+        storage_profile: Storage profile of FLOAT_DATA and FLAG columns.
+            "default" uses StandardStMan. "write-optimized" and
+            "read-optimized" use TiledShapeStMan with tile shape
+            suitable for writing and reading, respectively.
+            "compressed-lossy" stores FLOAT_DATA as 16-bit integers
+            with per-row scale and offset. It is lossy.
+        jobs: Number of worker processes to fill subtables. If more
+            than 1, subtables are filled concurrently with MAIN table.
+            Default is 1.
 
     Returns:
         Conversion status. True is successful.
     """
-    hdulist = _read_psw(nqmfile)
-    return _to_ms2(hdulist, msfile, overwrite)
+    # spectra are read chunk by chunk while MAIN table is filled
+    context = ConversionContext.from_file(nqmfile)
+    return _to_ms2(context.hdu, msfile, overwrite, storage_profile, jobs, context=context)
+
+
+def nqm2fits_batch(
+    nqmfiles: Sequence[str], outdir: str, jobs: Optional[int] = None, overwrite: bool = False
+) -> BatchReport:
+    """Convert multiple NRO45m PSW data (.nqm) to FITS in parallel.
+
+    Output file name is the base name of the input with ".fits" suffix.
+
+    Args:
+        nqmfiles: List of input NRO45m PSW file names
+        outdir: Output directory
+        jobs: Number of worker processes. Defaults to number of CPUs.
+        overwrite: Overwrite existing output files or not.
+            Default is False (not overwrite).
+
+    Returns:
+        Summary of the conversion. Results are ordered as inputs.
+        Failure of one file doesn't affect others.
+    """
+    return _run_batch(nqm2fits, nqmfiles, outdir, ".fits", jobs=jobs, overwrite=overwrite)
+
+
+def nqm2ms2_batch(
+    nqmfiles: Sequence[str], outdir: str, jobs: Optional[int] = None, overwrite: bool = False
+) -> BatchReport:
+    """Convert multiple NRO45m PSW data (.nqm) to MeasurementSet v2 in parallel.
+
+    Output file name is the base name of the input with ".ms" suffix.
+
+    Args:
+        nqmfiles: List of input NRO45m PSW file names
+        outdir: Output directory
+        jobs: Number of worker processes. Defaults to number of CPUs.
+        overwrite: Overwrite existing output files or not.
+            Default is False (not overwrite).
+
+    Returns:
+        Summary of the conversion. Results are ordered as inputs.
+        Failure of one file doesn't affect others.
+    """
+    return _run_batch(nqm2ms2, nqmfiles, outdir, ".ms", jobs=jobs, overwrite=overwrite)
 
 
 def nqm2ms4(nqmfile: str, psfile: str, overwrite: bool = False) -> bool:
@@ -0,0 +1,175 @@
+import concurrent.futures
+import dataclasses
+import logging
+import os
+import time
+import traceback
+from typing import Callable, List, Optional, Sequence
+
+LOG = logging.getLogger(__name__)
+
+# suffixes of compressed input that are removed from output file name
+COMPRESSION_SUFFIXES = (".gz", ".xz", ".zst")
+
+
+@dataclasses.dataclass
+class ConversionResult:
+    """Result of conversion of a single file.
+
+    Attributes:
+        input: Input NRO45m PSW file name
+        output: Output file name
+        status: Conversion status. True is successful.
+        error: Error message including traceback if conversion raised
+        elapsed: Elapsed time in seconds
+    """
+
+    input: str
+    output: str
+    status: bool
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+@dataclasses.dataclass
+class BatchReport:
+    """Summary of batch conversion.
+
+    Attributes:
+        results: Conversion results in the order of inputs
+        elapsed: Elapsed time of whole batch in seconds
+    """
+
+    results: List[ConversionResult]
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[ConversionResult]:
+        return [r for r in self.results if r.status]
+
+    @property
+    def failed(self) -> List[ConversionResult]:
+        return [r for r in self.results if not r.status]
+
+    @property
+    def status(self) -> bool:
+        return len(self.failed) == 0
+
+    def summary(self) -> str:
+        """Make human-readable summary of the batch.
+
+        Returns:
+            Summary text
+        """
+        lines = [
+            f"{len(self.succeeded)} of {len(self.results)} files converted successfully in {self.elapsed:.1f} sec"
+        ]
+        for r in self.failed:
+            reason = r.error.strip().splitlines()[-1] if r.error else "conversion returned False"
+            lines.append(f"  FAILED {r.input}: {reason}")
+        return "\n".join(lines)
+
+
+def _make_output_name(nqmfile: str, outdir: str, suffix: str) -> str:
+    """Make output file name from input file name.
+
+    Args:
+        nqmfile: Input NRO45m PSW file name
+        outdir: Output directory
+        suffix: Suffix of output file, e.g. ".ms"
+
+    Returns:
+        Output file name
+    """
+    basename = os.path.basename(nqmfile.rstrip(os.sep))
+    root, ext = os.path.splitext(basename)
+    if ext.lower() in COMPRESSION_SUFFIXES:
+        basename = root
+        root, ext = os.path.splitext(basename)
+    if ext.lower() == ".nqm":
+        basename = root
+    return os.path.join(outdir, basename + suffix)
+
+
+def _convert_one(converter: Callable[[str, str, bool], bool], nqmfile: str, outfile: str, overwrite: bool):
+    """Run conversion of a single file with error isolation.
+
+    Args:
+        converter: Conversion function, e.g. nqm2ms2
+        nqmfile: Input NRO45m PSW file name
+        outfile: Output file name
+        overwrite: Overwrite existing output file or not
+
+    Returns:
+        Conversion result
+    """
+    start = time.perf_counter()
+    try:
+        status = bool(converter(nqmfile, outfile, overwrite))
+        error = None
+    except Exception:
+        status = False
+        error = traceback.format_exc()
+
+    return ConversionResult(nqmfile, outfile, status, error, time.perf_counter() - start)
+
+
+def _run_batch(
+    converter: Callable[[str, str, bool], bool],
+    nqmfiles: Sequence[str],
+    outdir: str,
+    suffix: str,
+    jobs: Optional[int] = None,
+    overwrite: bool = False,
+) -> BatchReport:
+    """Convert multiple files in parallel.
+
+    Args:
+        converter: Conversion function, e.g. nqm2ms2. It must be
+            picklable, i.e., defined at module level.
+        nqmfiles: List of input NRO45m PSW file names
+        outdir: Output directory. Created if it doesn't exist.
+        suffix: Suffix of output files, e.g. ".ms"
+        jobs: Number of worker processes. Defaults to number of CPUs.
+            Files are converted in the calling process if jobs is 1.
+        overwrite: Overwrite existing output files or not
+
+    Raises:
+        ValueError: jobs is not positive or output file names collide
+
+    Returns:
+        Summary of the batch with results in the order of inputs
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 0:
+        raise ValueError(f"jobs must be positive: {jobs}")
+
+    outfiles = [_make_output_name(f, outdir, suffix) for f in nqmfiles]
+    if len(set(outfiles)) != len(outfiles):
+        raise ValueError("Output file names collide. Input files must have unique base names.")
+
+    os.makedirs(outdir, exist_ok=True)
+    jobs = min(jobs, max(len(nqmfiles), 1))
+    LOG.info("converting %d files with %d processes", len(nqmfiles), jobs)
+
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [_convert_one(converter, f, o, overwrite) for f, o in zip(nqmfiles, outfiles)]
+    else:
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_convert_one, converter, f, o, overwrite) for f, o in zip(nqmfiles, outfiles)]
+            for f, o, future in zip(nqmfiles, outfiles, futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    # worker process died, e.g. by segmentation fault
+                    results.append(ConversionResult(f, o, False, traceback.format_exc()))
+
+    report = BatchReport(results, time.perf_counter() - start)
+    for r in report.failed:
+        LOG.error("conversion failed: %s\n%s", r.input, r.error or "")
+    LOG.info("%s", report.summary())
+
+    return report
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .io import PswTable
+
+
+def _get_frequency_spec(hdu: PswTable, row_id: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Get channel frequencies of given row.
+
+    Args:
+        hdu: NRO45m psw data.
+        row_id: Row index.
+
+    Returns:
+        Channel frequencies, channel widths, and net sideband
+        (1 for USB, -1 for LSB, and 0 for DSB).
+    """
+    data = hdu.data
+    center_freq = data["F0CAL"][row_id]
+    chwid = data["CHWID"][row_id]
+    nch = data["NCH"][row_id]
+    sidbd = data["SIDBD"][row_id]
+
+    if sidbd == "USB":
+        net_sideband = 1
+    elif sidbd == "LSB":
+        net_sideband = -1
+    else:  # DSB
+        net_sideband = 0
+
+    if net_sideband < 0:  # LSB
+        chan_freq = np.array([chwid * ((nch - 1) / 2 - i) + center_freq for i in range(nch)], dtype=float)
+        chan_width = np.ones(nch, dtype=float) * (-chwid)
+    else:  # USB or DSB
+        chan_freq = np.array([chwid * (i - (nch - 1) / 2) + center_freq for i in range(nch)], dtype=float)
+        chan_width = np.ones(nch, dtype=float) * chwid
+
+    return chan_freq, chan_width, net_sideband
+
+
+def _get_frequency_axis(hdu: PswTable) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get linear frequency axis of all rows at once.
+
+    Frequency of channel i (0-based) is CRVAL + CDELT * (i + 1 - CRPIX),
+    which is identical to chan_freq returned by _get_frequency_spec.
+
+    Args:
+        hdu: NRO45m psw data.
+
+    Returns:
+        Reference pixel (1-based), frequency at the reference pixel,
+        and frequency increment per channel for each row.
+    """
+    data = hdu.data
+    nch = data["NCH"]
+    chwid = data["CHWID"].astype(float)
+
+    crpix = (nch + 1) / 2
+    crval = data["F0CAL"].astype(float)
+    cdelt = np.where(data["SIDBD"] == "LSB", -chwid, chwid)
+
+    return crpix, crval, cdelt
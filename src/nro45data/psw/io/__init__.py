@@ -1,4 +1,31 @@
+from .checksum import DataChecksum
+from .compression import write_seekable_zstd
+from .header import read_psw_header
+from .probe import NqmSummary
+from .probe import _probe_psw
 from .reader import _read_psw
+from .reader import _read_psw_table
+from .reader import iter_psw_chunks
+from .reader import read_psw_configuration
 from .fits import _to_fits
+from .fits import _to_fits_raw
+from .fits import _to_fits_compressed
+from .table import Categorical
+from .table import PswTable
 
-__all__ = ["_read_psw", "_to_fits"]
+__all__ = [
+    "DataChecksum",
+    "write_seekable_zstd",
+    "read_psw_header",
+    "NqmSummary",
+    "_probe_psw",
+    "_read_psw",
+    "_read_psw_table",
+    "iter_psw_chunks",
+    "read_psw_configuration",
+    "_to_fits",
+    "_to_fits_raw",
+    "_to_fits_compressed",
+    "Categorical",
+    "PswTable",
+]
@@ -0,0 +1,168 @@
+from typing import Any, Mapping
+
+import numpy as np
+
+# process at most 2**30 words at once to avoid overflow of uint64 sum
+_MAX_WORDS_PER_SUM = 1 << 30
+
+# characters excluded from ASCII encoded checksum, i.e.,
+# punctuations between digits and upper case letters,
+# and between upper and lower case letters
+_EXCLUDED_CHARS = tuple(range(0x3A, 0x41)) + tuple(range(0x5B, 0x61))
+
+
+def _fold(value: int) -> int:
+    """Fold carries into 32-bit ones' complement sum.
+
+    Args:
+        value: Sum of 32-bit words
+
+    Returns:
+        32-bit ones' complement sum
+    """
+    while value >> 32:
+        value = (value & 0xFFFFFFFF) + (value >> 32)
+    return value
+
+
+class DataChecksum:
+    """Incremental FITS data checksum (DATASUM).
+
+    It computes 32-bit ones' complement sum of the data as defined in
+    FITS checksum convention. Data can be given in arbitrary pieces,
+    e.g. chunks read from a file, so that the checksum is obtained
+    without reading the data again.
+
+    Args:
+        initial: Initial value of the sum. Default is 0.
+    """
+
+    def __init__(self, initial: int = 0):
+        self._sum = initial
+        self._remainder = b""
+        self.nbytes = 0
+
+    def update(self, buffer) -> "DataChecksum":
+        """Add bytes to the checksum.
+
+        Args:
+            buffer: Bytes-like object
+
+        Returns:
+            Self
+        """
+        data = np.frombuffer(buffer, dtype="u1")
+        self.nbytes += len(data)
+        if self._remainder:
+            num_fill = min(4 - len(self._remainder), len(data))
+            self._remainder += data[:num_fill].tobytes()
+            data = data[num_fill:]
+            if len(self._remainder) < 4:
+                return self
+            self._sum += int.from_bytes(self._remainder, byteorder="big")
+            self._remainder = b""
+
+        num_words = len(data) // 4
+        if num_words * 4 < len(data):
+            self._remainder = data[num_words * 4 :].tobytes()
+
+        words = data[: num_words * 4].view(">u4")
+        for start in range(0, num_words, _MAX_WORDS_PER_SUM):
+            self._sum = _fold(self._sum + int(words[start : start + _MAX_WORDS_PER_SUM].sum(dtype="u8")))
+
+        return self
+
+    @property
+    def value(self) -> int:
+        """32-bit ones' complement sum of the data.
+
+        Incomplete trailing word is padded with zeros.
+        """
+        value = self._sum
+        if self._remainder:
+            value += int.from_bytes(self._remainder.ljust(4, b"\0"), byteorder="big")
+        return _fold(value)
+
+    @property
+    def datasum(self) -> str:
+        """Value of DATASUM keyword."""
+        return str(self.value)
+
+
+def _compute_datasum(buffer) -> int:
+    """Compute FITS data checksum in one pass.
+
+    Args:
+        buffer: Bytes-like object holding the data
+
+    Returns:
+        32-bit ones' complement sum of the data
+    """
+    return DataChecksum().update(buffer).value
+
+
+def _encode_checksum(value: int) -> str:
+    """Encode checksum into 16-character ASCII string.
+
+    The algorithm follows FITS checksum convention. Note that
+    the value should be complemented beforehand to obtain CHECKSUM.
+
+    Args:
+        value: 32-bit checksum
+
+    Returns:
+        ASCII encoded checksum
+    """
+    encoded = [0] * 16
+    for i in range(4):
+        byte = (value >> ((3 - i) * 8)) & 0xFF
+        quotient = byte // 4 + ord("0")
+        remainder = byte % 4
+        chars = [quotient + remainder, quotient, quotient, quotient]
+
+        has_excluded = True
+        while has_excluded:
+            has_excluded = False
+            for j in (0, 2):
+                if chars[j] in _EXCLUDED_CHARS or chars[j + 1] in _EXCLUDED_CHARS:
+                    chars[j] += 1
+                    chars[j + 1] -= 1
+                    has_excluded = True
+
+        for j in range(4):
+            encoded[4 * j + i] = chars[j]
+
+    # rotate right by one character
+    return "".join(chr(encoded[(i + 15) % 16]) for i in range(16))
+
+
+def _compute_checksum(header_bytes: bytes, datasum: int) -> str:
+    """Compute value of CHECKSUM keyword.
+
+    Args:
+        header_bytes: Serialized header whose CHECKSUM is "0000000000000000"
+        datasum: Data checksum of the HDU
+
+    Returns:
+        Value of CHECKSUM keyword
+    """
+    value = DataChecksum(datasum).update(header_bytes).value
+    return _encode_checksum(~value & 0xFFFFFFFF)
+
+
+def _verify_data_size(header: Mapping[str, Any], data_size: int, filename: str):
+    """Verify that data section holds NAXIS1 x NAXIS2 bytes.
+
+    Args:
+        header: Header of the binary table
+        data_size: Size of data section
+        filename: Name of the data (for error message)
+
+    Raises:
+        RuntimeError: Data section is shorter than expected
+    """
+    expected = header["NAXIS1"] * header["NAXIS2"]
+    if data_size < expected:
+        raise RuntimeError(
+            f'Truncated data: "{filename}" has {data_size} bytes of data while NAXIS1 x NAXIS2 is {expected}.'
+        )
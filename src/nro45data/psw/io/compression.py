@@ -0,0 +1,306 @@
+import bisect
+import gzip
+import io
+import logging
+import lzma
+import struct
+import zlib
+from typing import BinaryIO, List, NamedTuple, Optional
+
+try:
+    _is_zstandard_available = True
+    import zstandard
+except ImportError:
+    _is_zstandard_available = False
+    zstandard = None
+
+LOG = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Zstandard seekable format
+# https://github.com/facebook/zstd/blob/dev/contrib/seekable_format/zstd_seekable_compression_format.md
+ZSTD_SKIPPABLE_MAGIC_SEEK_TABLE = 0x184D2A5E
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+ZSTD_SEEK_TABLE_FOOTER_SIZE = 9
+ZSTD_SEEK_TABLE_CHECKSUM_FLAG = 0x80
+
+DEFAULT_ZSTD_FRAME_SIZE = 1024 * 1024
+
+# errors raised while reading corrupt or truncated compressed data.
+# gzip.BadGzipFile is a subclass of OSError.
+DECOMPRESSION_ERRORS = (EOFError, lzma.LZMAError, zlib.error) + (
+    (zstandard.ZstdError,) if _is_zstandard_available else ()
+)
+
+
+class ZstdFrame(NamedTuple):
+    """Location of independent Zstandard frame.
+
+    Attributes:
+        compressed_offset: Offset to the frame in compressed file
+        compressed_size: Size of the frame in compressed file
+        offset: Offset to the frame content in decompressed stream
+        size: Size of the frame content
+    """
+
+    compressed_offset: int
+    compressed_size: int
+    offset: int
+    size: int
+
+
+def _test_zstandard():
+    if not _is_zstandard_available:
+        raise RuntimeError("zstandard is required to read or write Zstandard compressed data.")
+
+
+def _detect_compression(filename: str) -> Optional[str]:
+    """Detect compression format from magic number.
+
+    Args:
+        filename: Name of the file
+
+    Returns:
+        "gzip", "xz", "zstd", or None if the file is not compressed.
+    """
+    with open(filename, "rb") as f:
+        magic = f.read(len(XZ_MAGIC))
+
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    elif magic.startswith(XZ_MAGIC):
+        return "xz"
+    elif magic.startswith(ZSTD_MAGIC):
+        return "zstd"
+    else:
+        return None
+
+
+def _read_zstd_seek_table(f: BinaryIO) -> Optional[List[ZstdFrame]]:
+    """Read seek table of Zstandard seekable format.
+
+    Args:
+        f: Compressed file opened in binary mode
+
+    Returns:
+        List of frames. None if the file doesn't have seek table.
+    """
+    f.seek(0, io.SEEK_END)
+    file_size = f.tell()
+    if file_size < ZSTD_SEEK_TABLE_FOOTER_SIZE:
+        return None
+
+    f.seek(file_size - ZSTD_SEEK_TABLE_FOOTER_SIZE)
+    num_frames, descriptor, magic = struct.unpack("<IBI", f.read(ZSTD_SEEK_TABLE_FOOTER_SIZE))
+    if magic != ZSTD_SEEKABLE_MAGIC:
+        return None
+
+    entry_size = 12 if descriptor & ZSTD_SEEK_TABLE_CHECKSUM_FLAG else 8
+    table_size = num_frames * entry_size + ZSTD_SEEK_TABLE_FOOTER_SIZE
+    table_offset = file_size - table_size - 8
+    if table_offset < 0:
+        return None
+
+    f.seek(table_offset)
+    skippable_magic, frame_size = struct.unpack("<II", f.read(8))
+    if skippable_magic != ZSTD_SKIPPABLE_MAGIC_SEEK_TABLE or frame_size != table_size:
+        return None
+
+    entries = f.read(num_frames * entry_size)
+    frames = []
+    compressed_offset = 0
+    offset = 0
+    for i in range(num_frames):
+        compressed_size, size = struct.unpack_from("<II", entries, i * entry_size)
+        frames.append(ZstdFrame(compressed_offset, compressed_size, offset, size))
+        compressed_offset += compressed_size
+        offset += size
+
+    return frames
+
+
+class _SeekableZstdReader(io.RawIOBase):
+    """Random access reader of Zstandard seekable format.
+
+    Only frames that hold requested byte range are decompressed.
+    The last decompressed frame is kept so that sequential reads
+    decompress each frame only once.
+
+    Args:
+        f: Compressed file opened in binary mode
+        frames: List of frames taken from seek table
+    """
+
+    def __init__(self, f: BinaryIO, frames: List[ZstdFrame]):
+        super().__init__()
+        self._file = f
+        self._frames = frames
+        self._offsets = [frame.offset for frame in frames]
+        self._size = frames[-1].offset + frames[-1].size if frames else 0
+        self._position = 0
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._cached_index = -1
+        self._cached_frame = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def _decompress_frame(self, index: int) -> bytes:
+        if index != self._cached_index:
+            frame = self._frames[index]
+            self._file.seek(frame.compressed_offset)
+            compressed = self._file.read(frame.compressed_size)
+            if len(compressed) != frame.compressed_size:
+                raise EOFError(f"Compressed frame {index} is truncated")
+            content = self._decompressor.decompress(compressed, max_output_size=frame.size)
+            if len(content) != frame.size:
+                raise EOFError(f"Frame {index} is decompressed to {len(content)} bytes but {frame.size} is expected")
+            self._cached_frame = content
+            self._cached_index = index
+        return self._cached_frame
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        num_bytes = 0
+        while num_bytes < len(view) and self._position < self._size:
+            index = bisect.bisect_right(self._offsets, self._position) - 1
+            content = self._decompress_frame(index)
+            start = self._position - self._frames[index].offset
+            length = min(len(content) - start, len(view) - num_bytes)
+            view[num_bytes : num_bytes + length] = content[start : start + length]
+            num_bytes += length
+            self._position += length
+
+        return num_bytes
+
+    def readall(self) -> bytes:
+        buffer = bytearray(max(self._size - self._position, 0))
+        num_bytes = self.readinto(buffer)
+        return bytes(buffer[:num_bytes])
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def _open_zstd(filename: str) -> BinaryIO:
+    """Open Zstandard compressed file.
+
+    Random access reader is returned if the file has seek table.
+    Otherwise, the file is read as a stream that supports forward
+    seek only.
+
+    Args:
+        filename: Name of the file
+
+    Returns:
+        File object that provides decompressed content
+    """
+    _test_zstandard()
+
+    f = open(filename, "rb")
+    frames = _read_zstd_seek_table(f)
+    if frames is not None:
+        return _SeekableZstdReader(f, frames)
+
+    LOG.debug("%s has no seek table. Reading sequentially.", filename)
+    f.seek(0)
+    return zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True, closefd=True)
+
+
+def _open_psw(filename: str) -> BinaryIO:
+    """Open NRO 45m PSW data that may be compressed.
+
+    Compression format (gzip, xz, or Zstandard) is detected from
+    magic number and the content is decompressed on the fly.
+
+    Args:
+        filename: Name of the data
+
+    Returns:
+        File object in binary mode that provides decompressed content
+    """
+    compression = _detect_compression(filename)
+    if compression == "gzip":
+        return gzip.open(filename, "rb")
+    elif compression == "xz":
+        return lzma.open(filename, "rb")
+    elif compression == "zstd":
+        return _open_zstd(filename)
+    else:
+        return open(filename, "rb")
+
+
+def write_seekable_zstd(
+    src: str, dst: str, frame_size: int = DEFAULT_ZSTD_FRAME_SIZE, level: int = 3
+) -> List[ZstdFrame]:
+    """Compress file into Zstandard seekable format.
+
+    The file is compressed as a sequence of independent frames followed
+    by a seek table in a skippable frame. Resulting file is compatible
+    with standard zstd tools.
+
+    Args:
+        src: Name of the file to compress
+        dst: Name of the compressed file
+        frame_size: Size of uncompressed content per frame.
+            Default is 1 MiB.
+        level: Compression level. Default is 3.
+
+    Raises:
+        ValueError: frame_size is not positive
+
+    Returns:
+        List of frames
+    """
+    _test_zstandard()
+    if frame_size <= 0:
+        raise ValueError(f"frame_size must be positive: {frame_size}")
+
+    compressor = zstandard.ZstdCompressor(level=level)
+    frames = []
+    compressed_offset = 0
+    offset = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while True:
+            content = fin.read(frame_size)
+            if not content:
+                break
+            compressed = compressor.compress(content)
+            fout.write(compressed)
+            frames.append(ZstdFrame(compressed_offset, len(compressed), offset, len(content)))
+            compressed_offset += len(compressed)
+            offset += len(content)
+
+        entries = b"".join(struct.pack("<II", frame.compressed_size, frame.size) for frame in frames)
+        footer = struct.pack("<IBI", len(frames), 0, ZSTD_SEEKABLE_MAGIC)
+        fout.write(struct.pack("<II", ZSTD_SKIPPABLE_MAGIC_SEEK_TABLE, len(entries) + len(footer)))
+        fout.write(entries)
+        fout.write(footer)
+
+    return frames
@@ -1,12 +1,29 @@
-from typing import TYPE_CHECKING
+import datetime
+import os
+from typing import TYPE_CHECKING, Optional
 
 import astropy.io.fits as fits
 
+from .checksum import DataChecksum, _compute_checksum, _verify_data_size
+from .compression import _detect_compression, _open_psw
+from .header import FITS_BLOCK_SIZE
+from .reader import _get_read_datasum, _read_fixed_header
+
 if TYPE_CHECKING:
     from astropy.io.fits.hdu.hdulist import HDUList
+    from astropy.io.fits.header import Header
+
+# size of the buffer to copy data section
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# lossless tile compression algorithms for integer spectra
+COMPRESSION_TYPES = ("RICE_1", "GZIP_1", "GZIP_2")
 
+# number of spectra per compression tile
+DEFAULT_TILE_ROWS = 16
 
-def _to_fits(hdulist: "HDUList", fitsfile: str, overwrite: bool = False) -> bool:
+
+def _to_fits(hdulist: "HDUList", fitsfile: str, overwrite: bool = False, checksum: bool = False) -> bool:
     """Export HDUList to FITS.
 
     Args:
@@ -14,6 +31,12 @@ def _to_fits(hdulist: "HDUList", fitsfile: str, overwrite: bool = False) -> bool
         fitsfile: Output FITS file name
         overwrite: Overwrite existing output file or not.
             Default is False (not overwrite).
+        checksum: Write CHECKSUM and DATASUM keywords. Keywords are
+            added to the output file only so that header of the table
+            is not modified. Data checksum computed by _read_psw is
+            reused if the data has not been loaded since then.
+            Otherwise, data written to the file is summed.
+            Default is False.
 
     Returns:
         Export status. True is successful.
@@ -21,10 +44,275 @@ def _to_fits(hdulist: "HDUList", fitsfile: str, overwrite: bool = False) -> bool
     status = True
 
     primary_hdu = fits.PrimaryHDU()
-    output_hdulist = fits.HDUList([primary_hdu, hdulist[0]])
+    table_hdu = hdulist[0]
+    output_hdulist = fits.HDUList([primary_hdu, table_hdu])
+    datasum = _get_read_datasum(table_hdu) if checksum else None
 
     try:
+        if checksum:
+            primary_hdu.add_checksum()
         output_hdulist.writeto(fitsfile, output_verify="fix+warn", overwrite=overwrite)
+        if checksum:
+            _write_checksum(fitsfile, 1, datasum)
+    except Exception as e:
+        print(e)
+        status = False
+
+    return status
+
+
+def _pad_to_block(size: int) -> int:
+    """Return number of bytes to fill the last FITS block."""
+    return -size % FITS_BLOCK_SIZE
+
+
+def _add_checksum_keywords(header: "Header"):
+    """Add CHECKSUM and DATASUM keywords with placeholder values.
+
+    Values are filled in after data is written. Since the keywords
+    occupy fixed-length records, the size of the header doesn't change.
+
+    Args:
+        header: Header to be updated
+    """
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    header.set("DATASUM", "0", f"data unit checksum updated {timestamp}")
+    header.set("CHECKSUM", "0" * 16, f"HDU checksum updated {timestamp}", before="DATASUM")
+
+
+def _serialize_header(header: "Header", datasum: Optional[int] = None) -> bytes:
+    """Serialize header into FITS blocks.
+
+    Args:
+        header: Header to serialize
+        datasum: Data checksum. If given, CHECKSUM and DATASUM keywords
+            are updated accordingly.
+
+    Returns:
+        Serialized header padded to FITS block boundary
+    """
+    if datasum is not None:
+        header["DATASUM"] = str(datasum)
+        header["CHECKSUM"] = "0" * 16
+        header["CHECKSUM"] = _compute_checksum(header.tostring().encode("ascii"), datasum)
+
+    return header.tostring().encode("ascii")
+
+
+def _write_checksum(fitsfile: str, index: int, datasum: Optional[int] = None):
+    """Add CHECKSUM and DATASUM keywords to the HDU written to FITS file.
+
+    The header is read back from the file and rewritten with the
+    keywords. It is rewritten in place unless the keywords require
+    additional header block, in which case the file is rewritten.
+
+    Args:
+        fitsfile: Name of FITS file
+        index: Index of the HDU
+        datasum: Data checksum of the HDU. If None, data section
+            is read from the file and summed.
+    """
+    with fits.open(fitsfile) as hdulist:
+        info = hdulist.fileinfo(index)
+    header_offset = info["hdrLoc"]
+    data_offset = info["datLoc"]
+
+    with open(fitsfile, "r+b") as f:
+        f.seek(header_offset)
+        header = fits.Header.fromstring(f.read(data_offset - header_offset).decode("ascii"))
+        if datasum is None:
+            data_checksum = DataChecksum()
+            remaining = info["datSpan"]
+            while remaining > 0:
+                chunk = f.read(min(COPY_BUFFER_SIZE, remaining))
+                if not chunk:
+                    break
+                data_checksum.update(chunk)
+                remaining -= len(chunk)
+            datasum = data_checksum.value
+        _add_checksum_keywords(header)
+        serialized = _serialize_header(header, datasum)
+        if len(serialized) == data_offset - header_offset:
+            f.seek(header_offset)
+            f.write(serialized)
+            return
+
+        # header grows. rewrite the file with new header
+        tmpfile = f"{fitsfile}.tmp"
+        with open(tmpfile, "wb") as fout:
+            f.seek(0)
+            _copy_data(f, fout, header_offset)
+            fout.write(serialized)
+            f.seek(data_offset)
+            _copy_data(f, fout, os.fstat(f.fileno()).st_size - data_offset)
+    os.replace(tmpfile, fitsfile)
+
+
+def _copy_data(
+    fin, fout, data_size: int, checksum: Optional[DataChecksum] = None, use_sendfile: bool = False
+) -> int:
+    """Copy data section from input to output.
+
+    Data is transferred in the kernel by sendfile if allowed and
+    available. Otherwise, data is copied through a fixed-size buffer
+    so that memory usage doesn't depend on data size.
+
+    Args:
+        fin: Input file object positioned at the data section
+        fout: Output file object opened in unbuffered mode
+        data_size: Number of bytes to copy
+        checksum: Accumulator of data checksum. If given, data is
+            always copied through the buffer.
+        use_sendfile: Allow sendfile. Input must be a plain file.
+
+    Returns:
+        Number of bytes copied
+    """
+    num_bytes = 0
+    if use_sendfile and checksum is None and hasattr(os, "sendfile"):
+        data_offset = fin.tell()
+        try:
+            while num_bytes < data_size:
+                sent = os.sendfile(fout.fileno(), fin.fileno(), data_offset + num_bytes, data_size - num_bytes)
+                if sent == 0:
+                    break
+                num_bytes += sent
+            return num_bytes
+        except OSError:
+            if num_bytes > 0:
+                raise
+            # sendfile is not supported for the files, fall back to buffered copy
+
+    buffer = bytearray(min(COPY_BUFFER_SIZE, max(data_size, 1)))
+    view = memoryview(buffer)
+    while num_bytes < data_size:
+        n = fin.readinto(view[: min(len(view), data_size - num_bytes)])
+        if not n:
+            break
+        fout.write(view[:n])
+        if checksum is not None:
+            checksum.update(view[:n])
+        num_bytes += n
+
+    return num_bytes
+
+
+def _to_fits_raw(nqmfile: str, fitsfile: str, overwrite: bool = False, checksum: bool = False) -> bool:
+    """Export NRO 45m PSW data to FITS without parsing data section.
+
+    Output consists of minimal primary header, fixed extension header,
+    and data section copied from the input as it is. The result is
+    identical to _to_fits but memory usage is constant and conversion
+    speed is close to file copy.
+
+    Args:
+        nqmfile: Input NRO45m PSW file name
+        fitsfile: Output FITS file name
+        overwrite: Overwrite existing output file or not.
+            Default is False (not overwrite).
+        checksum: Write CHECKSUM and DATASUM keywords. Data checksum
+            is computed while data section is copied.
+            Default is False.
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Export status. True is successful.
+    """
+    header, data_offset = _read_fixed_header(nqmfile)
+    # mandatory keywords must be in the order defined by FITS standard
+    header.set("TFIELDS", after="GCOUNT")
+    data_size = header["NAXIS1"] * header["NAXIS2"] + header.get("PCOUNT", 0)
+
+    primary_header = fits.PrimaryHDU().header
+    if checksum:
+        _add_checksum_keywords(primary_header)
+        _add_checksum_keywords(header)
+    data_checksum = DataChecksum() if checksum else None
+
+    status = True
+    is_created = False
+    try:
+        if os.path.exists(fitsfile) and not overwrite:
+            raise FileExistsError(f"File {fitsfile!r} already exists. Set overwrite=True to overwrite it.")
+
+        with _open_psw(nqmfile) as fin, open(fitsfile, "wb", buffering=0) as fout:
+            is_created = True
+            fout.write(_serialize_header(primary_header, 0 if checksum else None))
+            header_offset = fout.tell()
+            fout.write(_serialize_header(header))
+
+            fin.seek(data_offset)
+            use_sendfile = _detect_compression(nqmfile) is None
+            num_bytes = _copy_data(fin, fout, data_size, data_checksum, use_sendfile=use_sendfile)
+            _verify_data_size(header, num_bytes, nqmfile)
+            fout.write(b"\0" * _pad_to_block(num_bytes))
+
+            if checksum:
+                fout.seek(header_offset)
+                fout.write(_serialize_header(header, data_checksum.value))
+    except Exception as e:
+        print(e)
+        status = False
+        # remove incomplete output
+        if is_created and os.path.exists(fitsfile):
+            os.remove(fitsfile)
+
+    return status
+
+
+def _to_fits_compressed(
+    hdulist: "HDUList",
+    fitsfile: str,
+    overwrite: bool = False,
+    checksum: bool = False,
+    compression: str = "RICE_1",
+    tile_rows: int = DEFAULT_TILE_ROWS,
+) -> bool:
+    """Export HDUList to FITS with tile-compressed spectra.
+
+    Output consists of primary HDU, binary table HDU that holds all
+    columns except LDATA, and tile-compressed image HDU named LDATA.
+    Row i of the image is LDATA of row i in the table. Each tile holds
+    tile_rows spectra. Tiles are compressed by astropy one by one in the
+    calling thread.
+
+    Args:
+        hdulist: HDUList generated from NRO 45m PSW file (.nqm)
+        fitsfile: Output FITS file name
+        overwrite: Overwrite existing output file or not.
+            Default is False (not overwrite).
+        checksum: Write CHECKSUM and DATASUM keywords.
+            Default is False.
+        compression: Compression algorithm. Either "RICE_1", "GZIP_1",
+            or "GZIP_2". Default is "RICE_1".
+        tile_rows: Number of spectra per compression tile.
+            Default is DEFAULT_TILE_ROWS.
+
+    Raises:
+        ValueError: Unsupported compression algorithm
+
+    Returns:
+        Export status. True is successful.
+    """
+    compression_type = compression.upper()
+    if compression_type not in COMPRESSION_TYPES:
+        raise ValueError(f"Unsupported compression: {compression}. Should be one of {COMPRESSION_TYPES}.")
+
+    status = True
+
+    hdu = hdulist[0]
+    columns = [c for c in hdu.columns if c.name != "LDATA"]
+    table_hdu = fits.BinTableHDU.from_columns(columns, header=hdu.header)
+
+    try:
+        ldata = hdu.data["LDATA"]
+        image_hdu = fits.CompImageHDU(
+            data=ldata, compression_type=compression_type, tile_shape=(tile_rows, ldata.shape[1]), name="LDATA"
+        )
+        output_hdulist = fits.HDUList([fits.PrimaryHDU(), table_hdu, image_hdu])
+        output_hdulist.writeto(fitsfile, output_verify="fix+warn", overwrite=overwrite, checksum=checksum)
     except Exception as e:
         print(e)
         status = False
@@ -0,0 +1,262 @@
+import functools
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .compression import _open_psw
+
+FITS_BLOCK_SIZE = 2880
+FITS_RECORD_SIZE = 80
+FITS_NUM_RECORDS_PER_BLOCK = FITS_BLOCK_SIZE // FITS_RECORD_SIZE
+
+# keywords whose records hold free text rather than value
+COMMENTARY_KEYWORDS = ("HISTORY", "COMMENT", "")
+
+HEADER_CACHE_SIZE = 256
+
+# header records are decoded in the same way as the original reader.
+# undecodable bytes are replaced rather than failing to read the header.
+HEADER_ENCODING = "utf-8"
+HEADER_DECODE_ERRORS = "replace"
+
+_KEYWORD_LENGTH = 8
+_END_KEYWORD = b"END".ljust(_KEYWORD_LENGTH)
+_NRO_PSW_SIGNATURE = b"XTENSION='BINTABLE'"
+_QUOTED_STRING_PATTERN = re.compile(r"'((?:[^']|'')*)'")
+
+
+def _slice_records(records: np.ndarray, start: int, stop: int = FITS_RECORD_SIZE) -> np.ndarray:
+    """Cut fixed columns out of header records.
+
+    Args:
+        records: Header records as an array of S80
+        start: Start column (0-based)
+        stop: End column (exclusive)
+
+    Returns:
+        Array of S(stop - start) holding the columns
+    """
+    chars = records.view("u1").reshape(len(records), FITS_RECORD_SIZE)
+    return np.ascontiguousarray(chars[:, start:stop]).view(f"S{stop - start}").ravel()
+
+
+def _read_header_blocks(f, filename: str) -> Tuple[np.ndarray, int]:
+    """Read header blocks from the beginning of the file.
+
+    Each block is inspected as a whole to find END record.
+
+    Args:
+        f: File object opened in binary mode
+        filename: Name of the file (for error message)
+
+    Raises:
+        RuntimeError: END record is not found
+
+    Returns:
+        Header records up to END as an array of S80 and offset to the data section
+    """
+    blocks = []
+    while True:
+        block = f.read(FITS_BLOCK_SIZE)
+        num_records = len(block) // FITS_RECORD_SIZE
+        if num_records == 0:
+            raise RuntimeError(f'Incompatible data: "{filename}" has no END record.')
+
+        records = np.frombuffer(block, dtype="S80", count=num_records)
+        is_end = _slice_records(records, 0, _KEYWORD_LENGTH) == _END_KEYWORD
+        end_index = np.flatnonzero(is_end)
+        if len(end_index) > 0:
+            blocks.append(records[: end_index[0]])
+            break
+        blocks.append(records)
+
+    # data starts at the block boundary following END record
+    data_offset = len(blocks) * FITS_BLOCK_SIZE
+
+    return np.concatenate(blocks), data_offset
+
+
+def _parse_strings(values: np.ndarray) -> List[str]:
+    """Extract quoted string values.
+
+    Trailing whitespaces are removed as astropy does.
+
+    Args:
+        values: Value fields starting with a quote
+
+    Returns:
+        List of string values
+    """
+    closing = np.char.find(values, b"'", 1)
+    parsed = []
+    for value, end in zip(values.tolist(), closing.tolist()):
+        if end < 0 or value[end + 1 : end + 2] == b"'":
+            # escaped quote or missing terminator: fall back to regex
+            text = value.decode(HEADER_ENCODING, HEADER_DECODE_ERRORS)
+            match = _QUOTED_STRING_PATTERN.match(text)
+            content = match[1].replace("''", "'") if match else text[1:]
+        else:
+            # closing position is in bytes so that value is decoded after slicing
+            content = value[1:end].decode(HEADER_ENCODING, HEADER_DECODE_ERRORS)
+        parsed.append(content.rstrip())
+
+    return parsed
+
+
+def _parse_non_strings(values: np.ndarray) -> List[Any]:
+    """Convert logical and numerical values.
+
+    Args:
+        values: Value fields other than strings
+
+    Returns:
+        List of bool, int, or float values. Unparsable values are kept as str.
+    """
+    if len(values) == 0:
+        return []
+
+    values = np.char.strip(np.char.partition(values, b"/")[:, 0])
+    parsed = np.empty(len(values), dtype=object)
+
+    is_logical = (values == b"T") | (values == b"F")
+    parsed[is_logical] = values[is_logical] == b"T"
+
+    digits = np.char.lstrip(values, b"+-")
+    is_int = ~is_logical & (np.char.str_len(digits) > 0) & np.char.isdigit(digits)
+    parsed[is_int] = values[is_int].astype(np.int64).tolist()
+
+    is_other = ~(is_logical | is_int)
+    others = np.char.replace(values[is_other], b"D", b"E")
+    try:
+        parsed[is_other] = others.astype(np.float64).tolist()
+    except ValueError:
+        parsed[is_other] = [_to_float_or_str(v) for v in others.tolist()]
+
+    return parsed.tolist()
+
+
+def _to_float_or_str(value: bytes) -> Any:
+    try:
+        return float(value)
+    except ValueError:
+        return value.decode(HEADER_ENCODING, HEADER_DECODE_ERRORS)
+
+
+def _parse_header_records(records: np.ndarray) -> Dict[str, Any]:
+    """Parse header records into keyword dictionary.
+
+    Records are processed in bulk. Fixups applied to NRO 45m PSW header
+    are equivalent to those of _follow_fits_standard and _rename_duplicate_types,
+    i.e., value indicator without trailing whitespace is accepted, and
+    duplicate TTYPEn values are renamed.
+
+    Args:
+        records: Header records as an array of S80
+
+    Returns:
+        Keyword dictionary. Values of commentary keywords such as HISTORY
+        are collected as a list of str. If keyword appears more than once,
+        the first value is taken.
+    """
+    keys = np.char.decode(
+        np.char.rstrip(_slice_records(records, 0, _KEYWORD_LENGTH)), HEADER_ENCODING, HEADER_DECODE_ERRORS
+    )
+    has_value = _slice_records(records, _KEYWORD_LENGTH, _KEYWORD_LENGTH + 1) == b"="
+    is_commentary = np.isin(keys, COMMENTARY_KEYWORDS)
+    has_value &= ~is_commentary
+
+    # value field may or may not have whitespace after "="
+    fields = np.char.lstrip(_slice_records(records, _KEYWORD_LENGTH + 1))
+    is_string = np.char.startswith(fields, b"'") & has_value
+    is_non_string = has_value & ~is_string
+
+    values = np.empty(len(records), dtype=object)
+    values[is_string] = _parse_strings(fields[is_string])
+    values[is_non_string] = _parse_non_strings(fields[is_non_string])
+
+    # commentary text, following FITS standard in the same way as the value cards
+    texts = np.char.rstrip(_slice_records(records, _KEYWORD_LENGTH))
+    texts = np.char.replace(np.char.replace(texts, b"=", b"= ", count=1), b" /", b"/")
+    values[is_commentary] = np.char.decode(texts[is_commentary], HEADER_ENCODING, HEADER_DECODE_ERRORS).tolist()
+
+    _rename_duplicate_type_values(keys, values)
+
+    header: Dict[str, Any] = {}
+    for key, value, valid, commentary in zip(keys.tolist(), values.tolist(), has_value, is_commentary):
+        if commentary:
+            header.setdefault(key, []).append(value)
+        elif valid:
+            # the first one takes precedence over duplicates as astropy does
+            header.setdefault(key, value)
+
+    return header
+
+
+def _rename_duplicate_type_values(keys: np.ndarray, values: np.ndarray):
+    """Make binary data keys unique by renaming duplicate TTYPEn values in-place.
+
+    Args:
+        keys: Array of keywords
+        values: Array of parsed values
+    """
+    type_index = np.flatnonzero(np.char.startswith(keys, "TTYPE"))
+    type_values = np.array(values[type_index].tolist(), dtype=str)
+    _, first_index = np.unique(type_values, return_index=True)
+    is_duplicate = np.ones(len(type_index), dtype=bool)
+    is_duplicate[first_index] = False
+    for i in type_index[is_duplicate]:
+        name = values[i]
+        values[i] = name[:-1] + chr(ord(name[-1]) + 1)
+
+
+@functools.lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _read_psw_header_cached(path: str, size: int, mtime_ns: int) -> Tuple[Dict[str, Any], int]:
+    """Read and parse header of NRO 45m PSW data.
+
+    File size and modification time are not used but are part of
+    the cache key so that updated file is read again.
+
+    Args:
+        path: Absolute path to the data
+        size: Size of the file in bytes
+        mtime_ns: Modification time of the file in nanoseconds
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Keyword dictionary and offset to the data section
+    """
+    with _open_psw(path) as f:
+        records, data_offset = _read_header_blocks(f, path)
+
+    if len(records) == 0 or not records[0].startswith(_NRO_PSW_SIGNATURE):
+        raise RuntimeError("Incompatible data: " f'"{path}" is not in NRO 45m PSW format.')
+
+    return _parse_header_records(records), data_offset
+
+
+def read_psw_header(filename: str) -> Tuple[Dict[str, Any], int]:
+    """Read header of NRO 45m PSW data as a keyword dictionary.
+
+    Parsed headers are cached by file path, size, and modification time
+    so that scanning many files repeatedly reads each header only once.
+    Compressed data (gzip, xz, or Zstandard) are also accepted.
+
+    Args:
+        filename: Name of the data
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Keyword dictionary and offset to the data section. Dictionary
+        is a copy of the cached one so that it can be modified freely.
+    """
+    stat = os.stat(filename)
+    header, data_offset = _read_psw_header_cached(os.path.realpath(filename), stat.st_size, stat.st_mtime_ns)
+
+    header = {k: list(v) if isinstance(v, list) else v for k, v in header.items()}
+    return header, data_offset
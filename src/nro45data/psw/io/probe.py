@@ -0,0 +1,100 @@
+import dataclasses
+from typing import Any, Dict, List, Optional, Tuple
+
+from .header import read_psw_header
+
+
+@dataclasses.dataclass(frozen=True)
+class NqmSummary:
+    """Summary of NRO 45m PSW data taken from its header.
+
+    Attributes:
+        filename: Name of the data
+        telescope: Name of the telescope (TELESCOP)
+        observer: Name of the observer (OBSERVER)
+        object: Name of the target (OBJECT)
+        ra: Right ascension of the map center (RA)
+        dec: Declination of the map center (DEC)
+        epoch: Equinox of RA/DEC (EPOCH)
+        arrays: Array usage flags (ARRY1-ARRY4)
+        num_rows: Number of rows (NAXIS2)
+        row_size: Size of a row in bytes (NAXIS1)
+        start_time: Start time of the observation taken from HISTORY,
+            e.g. "20240926005854". None if not available.
+        end_time: End time of the observation taken from HISTORY.
+            None if not available.
+    """
+
+    filename: str
+    telescope: str
+    observer: str
+    object: str
+    ra: str
+    dec: str
+    epoch: float
+    arrays: Tuple[str, str, str, str]
+    num_rows: int
+    row_size: int
+    start_time: Optional[str]
+    end_time: Optional[str]
+
+
+def _get_newstar_value(history_cards: List[str], key: str) -> Optional[str]:
+    """Get value of NEWSTAR entry in HISTORY cards.
+
+    Args:
+        history_cards: List of HISTORY cards
+        key: Name of the entry, e.g. "START-TIME"
+
+    Returns:
+        Value of the entry. None if the entry is not found.
+    """
+    prefix = f"NEWSTAR {key}"
+    for card in history_cards:
+        if card.startswith(prefix) and card[len(prefix) :].lstrip().startswith("="):
+            return card.split("=", maxsplit=1)[-1].strip(" '")
+
+    return None
+
+
+def _summarize_header(filename: str, header: Dict[str, Any]) -> NqmSummary:
+    """Make summary from the header of NRO 45m PSW data.
+
+    Args:
+        filename: Name of the data
+        header: Keyword dictionary returned by read_psw_header
+
+    Returns:
+        Summary of the data
+    """
+    history_cards = header.get("HISTORY", [])
+    return NqmSummary(
+        filename=filename,
+        telescope=str(header.get("TELESCOP", "")).strip(),
+        observer=str(header.get("OBSERVER", "")).strip(),
+        object=str(header.get("OBJECT", "")).strip(),
+        ra=str(header.get("RA", "")).strip(),
+        dec=str(header.get("DEC", "")).strip(),
+        epoch=float(header.get("EPOCH", 0)),
+        arrays=tuple(str(header.get(f"ARRY{i}", "")).strip() for i in range(1, 5)),
+        num_rows=int(header["NAXIS2"]),
+        row_size=int(header["NAXIS1"]),
+        start_time=_get_newstar_value(history_cards, "START-TIME"),
+        end_time=_get_newstar_value(history_cards, "END-TIME"),
+    )
+
+
+def _probe_psw(filename: str) -> NqmSummary:
+    """Summarize NRO 45m PSW data without reading its data section.
+
+    Args:
+        filename: Name of the data
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Summary of the data
+    """
+    header, _ = read_psw_header(filename)
+    return _summarize_header(filename, header)
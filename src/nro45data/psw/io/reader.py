@@ -1,13 +1,30 @@
 import collections
-import os
+import io
+import mmap
 import re
-from typing import List, Tuple
+import shutil
+import weakref
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from astropy.io.fits import open as fits_open
 from astropy.io.fits.hdu.hdulist import HDUList
+from astropy.io.fits.hdu.table import BinTableHDU
+from astropy.io.fits.header import Header
+
+from .checksum import DataChecksum, _compute_datasum, _verify_data_size
+from .compression import _detect_compression, _open_psw
+from .header import FITS_BLOCK_SIZE, FITS_NUM_RECORDS_PER_BLOCK, FITS_RECORD_SIZE, _read_header_blocks, read_psw_header
+from .table import PswTable, _build_dtype, _project_dtype
+
+DEFAULT_ROWS_PER_CHUNK = 4096
+
+# data checksums computed by _read_psw keyed by HDU
+_READ_DATASUMS: "weakref.WeakKeyDictionary[BinTableHDU, int]" = weakref.WeakKeyDictionary()
 
-FITS_BLOCK_SIZE = 2880
-FITS_RECORD_SIZE = 80
-FITS_NUM_RECORDS_PER_BLOCK = FITS_BLOCK_SIZE // FITS_RECORD_SIZE
+# size of the chunk to decompress data into memory
+DEFAULT_READ_SIZE = 1024 * 1024
 
 
 def _is_nro_psw(filename: str) -> bool:
@@ -20,42 +37,134 @@ def _is_nro_psw(filename: str) -> bool:
         True if the file is in NRO 45m PSW format, otherwise False.
     """
     expected = "XTENSION='BINTABLE'"
-    with open(filename, "rb") as f:
+    with _open_psw(filename) as f:
         first_record = f.read(FITS_RECORD_SIZE).decode()
 
     return first_record.startswith(expected)
 
 
-def _read_header_and_data(filename: str) -> Tuple[List[str], bytes]:
+def _map_file(filename: str, random_access: bool = False, writable: bool = False) -> mmap.mmap:
+    """Map given file into memory.
+
+    The file descriptor is closed on return. The mapping stays valid
+    as long as the returned object (or any view on it) is alive.
+
+    Args:
+        filename: Name of the file
+        random_access: Disable read-ahead of the mapped pages. It is
+            beneficial when only a part of each row is accessed.
+            Default is False.
+        writable: Map the file in copy-on-write mode. Modification
+            only affects the mapped pages and is never written back
+            to the file. Default is False (read-only).
+
+    Returns:
+        Memory map of the whole file
+    """
+    access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+    with open(filename, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=access)
+
+    if random_access and hasattr(mmap, "MADV_RANDOM"):
+        mapped.madvise(mmap.MADV_RANDOM)
+
+    return mapped
+
+
+def _load_file(filename: str, random_access: bool = False):
+    """Load content of given file as a buffer.
+
+    Plain file is mapped into memory so that it is never copied.
+    Compressed file (gzip, xz, or Zstandard) is decompressed into
+    memory without going through temporary file.
+
+    Args:
+        filename: Name of the file
+        random_access: Disable read-ahead of the mapped pages.
+            Only effective for plain file. Default is False.
+
+    Returns:
+        Buffer holding the whole (decompressed) content
+    """
+    if _detect_compression(filename) is None:
+        return _map_file(filename, random_access=random_access)
+
+    with _open_psw(filename) as f:
+        return f.read()
+
+
+def _readinto_exact(f, buffer) -> int:
+    """Fill buffer with file content as much as possible.
+
+    Decompressing readers may return less bytes than requested
+    even if the stream doesn't reach the end.
+
+    Args:
+        f: File object opened in binary mode
+        buffer: Writable buffer
+
+    Returns:
+        Number of bytes read
+    """
+    view = memoryview(buffer)
+    num_bytes = 0
+    while num_bytes < len(view):
+        n = f.readinto(view[num_bytes:])
+        if not n:
+            break
+        num_bytes += n
+    return num_bytes
+
+
+def _read_header_records(buffer, filename: str) -> Tuple[List[str], int]:
+    """Read header records from the beginning of the buffer.
+
+    Args:
+        buffer: Buffer holding file content, e.g. memory map of the file
+        filename: Name of the file (for error message)
+
+    Raises:
+        RuntimeError: END record is not found
+
+    Returns:
+        List of header records and offset to the data section
+    """
+    header = []
+    is_end_of_header = False
+    num_records = 0
+    while not is_end_of_header:
+        s = num_records * FITS_RECORD_SIZE
+        e = s + FITS_RECORD_SIZE
+        if e > len(buffer):
+            raise RuntimeError(f'Incompatible data: "{filename}" has no END record.')
+        record = bytes(buffer[s:e]).decode()
+        num_records += 1
+        header.append(record)
+        is_end_of_header = record.strip() == "END"
+
+    # data starts at the block boundary following END record
+    num_blocks = (num_records + FITS_NUM_RECORDS_PER_BLOCK - 1) // FITS_NUM_RECORDS_PER_BLOCK
+
+    return header, num_blocks * FITS_BLOCK_SIZE
+
+
+def _read_header_and_data(filename: str) -> Tuple[List[str], memoryview]:
     """Read given file and return its header and data separately.
 
+    The file is mapped into memory and the data section is returned
+    as a view on the mapped pages so that it is never copied. Compressed
+    file is decompressed into memory instead.
+
     Args:
         filename: Name of the file
 
     Returns:
         List of header records and binary data
     """
-    with open(filename, "rb+") as f:
-        # header
-        header = []
-        is_end_of_header = False
-        num_records = 0
-        while not is_end_of_header:
-            block = f.read(FITS_BLOCK_SIZE)
-            for i in range(FITS_NUM_RECORDS_PER_BLOCK):
-                s = i * FITS_RECORD_SIZE
-                e = s + FITS_RECORD_SIZE
-                record_bytes = block[s:e]
-                num_records += 1
-                record = record_bytes.decode()
-                header.append(record)
-                is_end_of_header = record.strip() == "END"
-                if is_end_of_header:
-                    break
-
-        # data
-        f.seek(num_records * FITS_RECORD_SIZE, os.SEEK_SET)
-        data = f.read()
+    mapped = _load_file(filename)
+
+    header, data_offset = _read_header_records(mapped, filename)
+    data = memoryview(mapped)[data_offset:]
 
     return header, data
 
@@ -114,27 +223,339 @@ def _rename_duplicate_types(records: List[str]) -> List[str]:
     return fixed_records
 
 
-def _read_psw(filename: str) -> HDUList:
-    """Read NRO 45m PSW data.
+def _fix_header_records(record_list: List[str]) -> List[str]:
+    """Fix header records to follow FITS standard.
+
+    Args:
+        record_list: List of header records
+
+    Returns:
+        List of fixed header records
+    """
+    record_list = _follow_fits_standard(record_list)
+
+    # rename duplicate TTYPE names
+    return _rename_duplicate_types(record_list)
+
+
+def _fix_header(record_list: List[str]) -> Header:
+    """Fix header records to follow FITS standard and parse them.
+
+    Args:
+        record_list: List of header records
+
+    Returns:
+        Fixed header
+    """
+    return Header.fromstring("".join(_fix_header_records(record_list)))
+
+
+def _read_fixed_header_and_data(filename: str) -> Tuple[Header, memoryview]:
+    """Read NRO 45m PSW data and fix its header to follow FITS standard.
 
     Args:
         filename: Name of the data
-        mode: Observation mode. Either 'psw' or 'otf'.
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Fixed header and binary data
     """
     if not _is_nro_psw(filename):
         raise RuntimeError("Incompatible data: " f'"{filename}" is not in NRO 45m PSW format.')
 
     record_list, binary_data = _read_header_and_data(filename)
 
-    record_list = _follow_fits_standard(record_list)
+    return _fix_header(record_list), binary_data
 
-    # rename duplicate TTYPE names
-    record_list = _rename_duplicate_types(record_list)
-    # for r in record_list:
-    #     print(r)
 
-    header = "".join(record_list).encode()
+def _read_fixed_header(filename: str) -> Tuple[Header, int]:
+    """Read and fix header of NRO 45m PSW data without touching data section.
+
+    Args:
+        filename: Name of the data
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format
+
+    Returns:
+        Fixed header and offset to the data section
+    """
+    if not _is_nro_psw(filename):
+        raise RuntimeError("Incompatible data: " f'"{filename}" is not in NRO 45m PSW format.')
+
+    with _open_psw(filename) as f:
+        records, data_offset = _read_header_blocks(f, filename)
+
+    return _fix_header([r.decode() for r in records.tolist()]), data_offset
+
+
+def _get_buffer(f) -> memoryview:
+    """Get writable view of in-memory file without copying."""
+    if isinstance(f, io.BytesIO):
+        return f.getbuffer()
+    return memoryview(f)
+
+
+def _open_fixed_psw(filename: str) -> Tuple[BinaryIO, int]:
+    """Open NRO 45m PSW data as in-memory FITS file with fixed header.
+
+    Plain file is mapped in copy-on-write mode and fixed header records
+    are written over the original ones so that data section is never
+    copied. Modification never reaches the file. Compressed file is
+    decompressed into memory.
+
+    Args:
+        filename: Name of the data
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format or
+            data section is shorter than NAXIS1 x NAXIS2
+
+    Returns:
+        File object positioned at the beginning and offset to the data section
+    """
+    if not _is_nro_psw(filename):
+        raise RuntimeError("Incompatible data: " f'"{filename}" is not in NRO 45m PSW format.')
+
+    if _detect_compression(filename) is None:
+        f = _map_file(filename, writable=True)
+    else:
+        f = io.BytesIO()
+        with _open_psw(filename) as fin:
+            shutil.copyfileobj(fin, f, DEFAULT_READ_SIZE)
+        f.seek(0)
+
+    with _get_buffer(f) as view:
+        record_list, data_offset = _read_header_records(view, filename)
+        data_size = len(view) - data_offset
+        header_size = len(record_list) * FITS_RECORD_SIZE
+        fixed_header = "".join(_fix_header_records(record_list)).encode()
+        if len(fixed_header) == header_size:
+            view[:header_size] = fixed_header
+        else:
+            # header size changed. pad fixed header to block boundary again
+            padded_size = -(-len(fixed_header) // FITS_BLOCK_SIZE) * FITS_BLOCK_SIZE
+            f = io.BytesIO(fixed_header.ljust(padded_size) + view[data_offset:].tobytes())
+            data_offset = padded_size
+
+    header = Header.fromstring(fixed_header.decode())
+    _verify_data_size(header, data_size, filename)
+
+    return f, data_offset
+
+
+def _read_psw(filename: str, checksum: bool = False) -> HDUList:
+    """Read NRO 45m PSW data.
+
+    Args:
+        filename: Name of the data
+        checksum: Compute data checksum of the data section so that
+            writing the HDU with checksum=True doesn't need to sum the
+            data again. Header is not modified. Default is False.
+
+    Raises:
+        RuntimeError: The file is not in NRO 45m PSW format or
+            data section is shorter than NAXIS1 x NAXIS2
+
+    Returns:
+        HDUList holding single BinTableHDU
+    """
+    f, data_offset = _open_fixed_psw(filename)
+    # data section is loaded lazily so that it is written as it is
+    hdulist = fits_open(f, ignore_missing_simple=True, lazy_load_hdus=False)
+    hdu = hdulist[0]
 
-    hdulist = HDUList.fromstring(header + binary_data, ignore_missing_simple=True, lazy_load_hdus=False)
+    if checksum:
+        with _get_buffer(f) as view:
+            data_size = hdu.header["NAXIS1"] * hdu.header["NAXIS2"]
+            with view[data_offset : data_offset + data_size] as binary_data:
+                _READ_DATASUMS[hdu] = _compute_datasum(binary_data)
 
     return hdulist
+
+
+def _get_read_datasum(hdu: BinTableHDU) -> Optional[int]:
+    """Get data checksum computed by _read_psw.
+
+    Args:
+        hdu: HDU to be written
+
+    Returns:
+        Data checksum. None if the HDU is not read by _read_psw with
+        checksum=True or its data has been loaded since then, in which
+        case the data might be modified and should be summed again.
+    """
+    if hdu._data_loaded:
+        return None
+
+    return _READ_DATASUMS.get(hdu)
+
+
+def _read_psw_table(filename: str, columns: Optional[Sequence[str]] = None) -> PswTable:
+    """Read NRO 45m PSW data without astropy's HDU machinery.
+
+    Binary table is interpreted directly from TTYPEn/TFORMn/TDIMn
+    so that columns are views on the mapped file.
+
+    If columns are given, only byte ranges of those columns are accessed
+    through strided views. Since read-ahead is disabled in that case,
+    pages holding other columns, typically LDATA, are not read from disk.
+    Compressed data are decompressed chunk by chunk and only the given
+    columns are kept in memory.
+
+    Args:
+        filename: Name of the data
+        columns: List of column names to read. All columns are
+            read if omitted.
+
+    Returns:
+        PSW data table
+    """
+    header, data_offset = read_psw_header(filename)
+
+    if columns is not None and _detect_compression(filename) is not None:
+        projected = _project_dtype(_build_dtype(header), columns)
+        dtype = np.dtype([(name, projected.fields[name][0]) for name in columns])
+        array = np.empty(header["NAXIS2"], dtype=dtype)
+        start_row = 0
+        for chunk in iter_psw_chunks(filename):
+            end_row = start_row + len(chunk)
+            for name in columns:
+                array[name][start_row:end_row] = chunk.data.array[name]
+            start_row = end_row
+        return PswTable(header, array, dtype=dtype)
+
+    mapped = _load_file(filename, random_access=columns is not None)
+    binary_data = memoryview(mapped)[data_offset:]
+    _verify_data_size(header, len(binary_data), filename)
+
+    return PswTable(header, binary_data, columns=columns)
+
+
+def iter_psw_chunks(
+    filename: str,
+    rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK,
+    start_row: int = 0,
+    stop_row: Optional[int] = None,
+    checksum: Optional[DataChecksum] = None,
+) -> Iterator[PswTable]:
+    """Iterate over NRO 45m PSW data in blocks of rows.
+
+    Data section is read sequentially with plain file reads so that
+    memory usage is bounded by the chunk size rather than file length.
+    Compressed data are decompressed on the fly. For Zstandard seekable
+    format, only frames that hold requested row range are decompressed.
+    Chunk boundaries are aligned with integrations, i.e., rows sharing
+    the same MJDST are always delivered in the same chunk. Therefore,
+    a chunk may contain slightly more or less rows than rows_per_chunk.
+
+    Cross-row information such as array configuration or scan intents
+    should be taken from read_psw_configuration.
+
+    Args:
+        filename: Name of the data
+        rows_per_chunk: Nominal number of rows per chunk
+        start_row: First row to read. Default is 0.
+        stop_row: Row to stop reading (exclusive). Read until
+            the end of data if omitted.
+        checksum: Accumulator of data checksum. If given, it is updated
+            with the bytes of each chunk as they are read. Checksum of
+            the whole data section is available after the iteration.
+
+    Raises:
+        ValueError: rows_per_chunk is not positive or row range is invalid
+
+    Yields:
+        PSW data table holding a block of rows. Header is shared among chunks.
+    """
+    if rows_per_chunk <= 0:
+        raise ValueError(f"rows_per_chunk must be positive: {rows_per_chunk}")
+
+    header, data_offset = read_psw_header(filename)
+    dtype = _build_dtype(header)
+    num_rows = header["NAXIS2"]
+    if stop_row is None or stop_row > num_rows:
+        stop_row = num_rows
+    if start_row < 0 or stop_row < start_row:
+        raise ValueError(f"Invalid row range: start_row {start_row}, stop_row {stop_row}")
+    num_rows_remaining = stop_row - start_row
+
+    pending = np.empty(0, dtype=dtype)
+    with _open_psw(filename) as f:
+        f.seek(data_offset + start_row * dtype.itemsize)
+        while num_rows_remaining > 0:
+            num_rows_to_read = min(rows_per_chunk, num_rows_remaining)
+            buffer = bytearray(num_rows_to_read * dtype.itemsize)
+            num_bytes = _readinto_exact(f, buffer)
+            if num_bytes < len(buffer):
+                raise RuntimeError(f'Truncated data: "{filename}" ends before NAXIS2 rows.')
+            num_rows_remaining -= num_rows_to_read
+            if checksum is not None:
+                checksum.update(buffer)
+
+            rows = np.frombuffer(buffer, dtype=dtype)
+            if len(pending) > 0:
+                merged = np.empty(len(pending) + len(rows), dtype=dtype)
+                merged[:len(pending)] = pending
+                merged[len(pending):] = rows
+                rows = merged
+
+            if num_rows_remaining > 0:
+                # hold back rows of last integration which may continue in the next chunk
+                mjdst = rows["MJDST"]
+                boundary = np.flatnonzero(mjdst != mjdst[-1])
+                if len(boundary) == 0:
+                    pending = rows
+                    continue
+                split = boundary[-1] + 1
+                rows, pending = rows[:split], rows[split:]
+            else:
+                pending = np.empty(0, dtype=dtype)
+
+            yield PswTable(header, rows, dtype=dtype, nrows=len(rows))
+
+
+def read_psw_configuration(filename: str) -> PswTable:
+    """Read rows that define cross-row configuration of NRO 45m PSW data.
+
+    Returned table consists of the first row of each array (ARRYT) and
+    the first row of each scan type (SCNTP) in original order. It is
+    sufficient to derive array configuration and intent map, e.g. by
+    get_array_configuration and get_intent_map, when data are processed
+    with iter_psw_chunks. Compressed data are scanned chunk by chunk
+    so that whole data are never held in memory.
+
+    Args:
+        filename: Name of the data
+
+    Returns:
+        PSW data table holding configuration rows
+    """
+    if _detect_compression(filename) is None:
+        # avoid touching pages of other columns
+        projected = _read_psw_table(filename, columns=["ARRYT", "SCNTP"]).data.array
+        _, array_index = np.unique(projected["ARRYT"], return_index=True)
+        _, intent_index = np.unique(projected["SCNTP"], return_index=True)
+        table = _read_psw_table(filename)
+        rows = table.data.array[np.union1d(array_index, intent_index)]
+        return PswTable(table.header, rows, dtype=rows.dtype, nrows=len(rows))
+
+    header, _ = read_psw_header(filename)
+    dtype = _build_dtype(header)
+    known_arrays = set()
+    known_intents = set()
+    selected = [np.empty(0, dtype=dtype)]
+    for chunk in iter_psw_chunks(filename):
+        array = chunk.data.array
+        arrays, array_index = np.unique(array["ARRYT"], return_index=True)
+        intents, intent_index = np.unique(array["SCNTP"], return_index=True)
+        new_index = [i for a, i in zip(arrays, array_index) if a not in known_arrays]
+        new_index += [i for t, i in zip(intents, intent_index) if t not in known_intents]
+        known_arrays.update(arrays)
+        known_intents.update(intents)
+        selected.append(array[np.unique(np.array(new_index, dtype=int))])
+    rows = np.concatenate(selected, dtype=dtype)
+
+    return PswTable(header, rows, dtype=dtype, nrows=len(rows))
@@ -0,0 +1,316 @@
+import re
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# binary table format code to big-endian NumPy type
+# logical (L) is stored as "T"/"F" bytes and decoded on access
+TFORM_TO_DTYPE = {
+    "L": "S1",
+    "B": "u1",
+    "I": ">i2",
+    "J": ">i4",
+    "K": ">i8",
+    "A": "S",
+    "E": ">f4",
+    "D": ">f8",
+    "C": ">c8",
+    "M": ">c16",
+}
+
+_TFORM_PATTERN = re.compile(r"^\s*(?P<repeat>\d*)(?P<code>[A-Z])")
+
+
+def _parse_tform(tform: str) -> Tuple[int, str]:
+    """Parse TFORMn value.
+
+    Args:
+        tform: Value of TFORMn keyword, e.g. "4096J"
+
+    Raises:
+        ValueError: Unsupported format code
+
+    Returns:
+        Repeat count and format code
+    """
+    match = _TFORM_PATTERN.match(tform)
+    if match is None or match["code"] not in TFORM_TO_DTYPE:
+        raise ValueError(f"Unsupported TFORM: {tform}")
+
+    repeat = int(match["repeat"]) if match["repeat"] else 1
+    return repeat, match["code"]
+
+
+def _parse_tdim(tdim: str) -> Tuple[int, ...]:
+    """Parse TDIMn value into NumPy shape.
+
+    FITS dimensions are listed in Fortran order so that they are reversed.
+
+    Args:
+        tdim: Value of TDIMn keyword, e.g. "(2,10)"
+
+    Returns:
+        Shape of the column cell
+    """
+    dims = [int(x) for x in tdim.strip().strip("()").split(",")]
+    return tuple(reversed(dims))
+
+
+def _build_dtype(header: Mapping[str, Any]) -> np.dtype:
+    """Build structured dtype of binary table from TTYPEn/TFORMn/TDIMn.
+
+    Args:
+        header: Header of the binary table
+
+    Raises:
+        ValueError: Row size inconsistent with NAXIS1
+
+    Returns:
+        Big-endian structured dtype of a table row
+    """
+    names = []
+    formats = []
+    for i in range(1, header["TFIELDS"] + 1):
+        name = str(header[f"TTYPE{i}"]).strip()
+        repeat, code = _parse_tform(str(header[f"TFORM{i}"]))
+        tdim = header.get(f"TDIM{i}", None)
+
+        if code == "A":
+            if tdim:
+                shape = _parse_tdim(tdim)
+                fmt = (f"S{shape[-1]}", shape[:-1]) if len(shape) > 1 else f"S{shape[0]}"
+            else:
+                fmt = f"S{repeat}"
+        elif tdim:
+            fmt = (TFORM_TO_DTYPE[code], _parse_tdim(tdim))
+        elif repeat == 1:
+            fmt = TFORM_TO_DTYPE[code]
+        else:
+            fmt = (TFORM_TO_DTYPE[code], (repeat,))
+
+        names.append(name)
+        formats.append(fmt)
+
+    dtype = np.dtype({"names": names, "formats": formats})
+    if dtype.itemsize != header["NAXIS1"]:
+        raise ValueError(f"Row size mismatch: columns occupy {dtype.itemsize} bytes while NAXIS1 is {header['NAXIS1']}")
+
+    return dtype
+
+
+def _project_dtype(dtype: np.dtype, columns: Sequence[str]) -> np.dtype:
+    """Make structured dtype that exposes only given columns.
+
+    Offsets and row size are kept so that the resulting dtype provides
+    strided views on the original rows.
+
+    Args:
+        dtype: Structured dtype of a table row
+        columns: List of column names
+
+    Raises:
+        KeyError: Column does not exist
+
+    Returns:
+        Projected dtype
+    """
+    missing = [c for c in columns if c not in dtype.names]
+    if missing:
+        raise KeyError(f"Column(s) not found: {', '.join(missing)}")
+
+    return np.dtype(
+        {
+            "names": list(columns),
+            "formats": [dtype.fields[c][0] for c in columns],
+            "offsets": [dtype.fields[c][1] for c in columns],
+            "itemsize": dtype.itemsize,
+        }
+    )
+
+
+class Categorical(NamedTuple):
+    """String column encoded as integer codes.
+
+    Attributes:
+        categories: Sorted unique values of the column. Values are decoded
+            and stripped of trailing whitespace.
+        codes: Index to categories for each row
+    """
+
+    categories: np.ndarray
+    codes: np.ndarray
+
+    def code_of(self, value: str) -> int:
+        """Return code of the value, or -1 if the value is not in categories."""
+        index = np.searchsorted(self.categories, value)
+        if index < len(self.categories) and self.categories[index] == value:
+            return int(index)
+        return -1
+
+    def first_rows(self) -> np.ndarray:
+        """Return index of the first row of each category."""
+        _, first_rows = np.unique(self.codes, return_index=True)
+        return first_rows
+
+    def decode(self) -> np.ndarray:
+        """Return decoded values of all rows."""
+        return self.categories[self.codes]
+
+
+def _encode_categorical(column: np.ndarray) -> Categorical:
+    """Encode fixed-width string column into Categorical.
+
+    Only unique values are decoded so that the cost of string
+    processing does not scale with the number of rows.
+
+    Args:
+        column: Byte string or unicode string column
+
+    Returns:
+        Categorical representation of the column
+    """
+    unique_values, codes = np.unique(column, return_inverse=True)
+    if unique_values.dtype.kind == "S":
+        unique_values = np.char.decode(unique_values, "ascii")
+    decoded = np.char.rstrip(unique_values)
+    # different byte strings may become identical after stripping
+    categories, remap = np.unique(decoded, return_inverse=True)
+    return Categorical(categories, remap[codes.reshape(column.shape)])
+
+
+def _get_categorical(data: Any, name: str) -> Categorical:
+    """Return string column as Categorical.
+
+    PswData caches the encoded column. Other tables, e.g. FITS_rec
+    of astropy's BinTableHDU, are encoded on each call.
+
+    Args:
+        data: PswData or FITS_rec
+        name: Name of string column
+
+    Returns:
+        Categorical representation of the column
+    """
+    if isinstance(data, PswData):
+        return data.categorical(name)
+    return _encode_categorical(np.asarray(data[name]))
+
+
+class PswData:
+    """Column accessor for PSW binary table.
+
+    Numeric columns are returned as read-only views on the underlying
+    buffer. String columns are decoded and stripped of trailing
+    whitespace once, and logical columns are converted to bool, so that
+    column access behaves like astropy's FITS_rec. String columns are
+    also available as integer codes via categorical.
+    """
+
+    def __init__(self, array: np.ndarray, logical_columns: Tuple[str, ...] = ()):
+        self._array = array
+        self._logical_columns = logical_columns
+        self._decoded: Dict[str, np.ndarray] = {}
+        self._categorical: Dict[str, Categorical] = {}
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._array.dtype.names)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._array.dtype
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._array.dtype.names
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self._decoded:
+            return self._decoded[name]
+
+        column = self._array[name]
+        if column.dtype.kind != "S":
+            return column
+
+        if name in self._logical_columns:
+            decoded = column == b"T"
+        else:
+            decoded = self.categorical(name).decode()
+        self._decoded[name] = decoded
+        return decoded
+
+    def categorical(self, name: str) -> Categorical:
+        """Return string column as integer codes and categories.
+
+        Args:
+            name: Name of string column
+
+        Raises:
+            ValueError: Column is not a string column
+
+        Returns:
+            Categorical representation of the column
+        """
+        if name not in self._categorical:
+            column = self._array[name]
+            if column.dtype.kind != "S" or name in self._logical_columns:
+                raise ValueError(f"Column {name} is not a string column")
+            self._categorical[name] = _encode_categorical(column)
+        return self._categorical[name]
+
+    def field(self, name: str) -> np.ndarray:
+        return self[name]
+
+
+class PswTable:
+    """Lightweight replacement of BinTableHDU for NRO 45m PSW data.
+
+    It provides hdu.header[...] and hdu.data[...] interfaces used by MS
+    fillers without going through astropy's HDU machinery.
+
+    Args:
+        header: Header of the binary table, either astropy Header or
+            keyword dictionary returned by read_psw_header
+        buffer: Buffer holding the data section
+        dtype: Structured dtype of a table row. Built from header if omitted.
+        nrows: Number of rows in the buffer. Taken from NAXIS2 if omitted.
+        columns: List of column names to expose. All columns are
+            exposed if omitted.
+    """
+
+    def __init__(
+        self,
+        header: Mapping[str, Any],
+        buffer,
+        dtype: Optional[np.dtype] = None,
+        nrows: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ):
+        if dtype is None:
+            dtype = _build_dtype(header)
+        if columns is not None:
+            dtype = _project_dtype(dtype, columns)
+        if nrows is None:
+            nrows = header["NAXIS2"]
+        array = np.ndarray((nrows,), dtype=dtype, buffer=buffer)
+        logical_columns = tuple(
+            str(header[f"TTYPE{i}"]).strip()
+            for i in range(1, header["TFIELDS"] + 1)
+            if _parse_tform(str(header[f"TFORM{i}"]))[1] == "L"
+        )
+
+        self.header = header
+        self.data = PswData(array, logical_columns)
+
+    @property
+    def columns(self) -> List[str]:
+        return self.data.names
+
+    def __len__(self) -> int:
+        return len(self.data)
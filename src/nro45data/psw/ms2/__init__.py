@@ -1,27 +1,40 @@
 import logging
 import os
 import shutil
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from nro45data.psw.ms2.builder import build_ms2
 from nro45data.psw.ms2.filler import fill_ms2
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.session import MsWriteSession
+from nro45data.psw.ms2.template import build_ms2_from_template
 
 if TYPE_CHECKING:
-    from astropy.io.fits.hdu.hdulist import HDUList
+    from nro45data.psw.io import PswTable
 
 LOG = logging.getLogger(__name__)
 
 
-def _to_ms2(hdulist: "HDUList", msfile: str, overwrite: bool = False) -> bool:
-    """Export HDUList to MeasurementSet v2.
-
-    Not implemented yet.
+def _to_ms2(
+    table: "PswTable",
+    msfile: str,
+    overwrite: bool = False,
+    storage_profile: str = "default",
+    jobs: int = 1,
+    context: Optional[ConversionContext] = None,
+) -> bool:
+    """Export PSW data table to MeasurementSet v2.
 
     Args:
-        hdulist: HDUList generated from NRO 45m PSW file (.nqm)
-        fitsfile: Output MSv2 file name
+        table: Data table generated from NRO 45m PSW file (.nqm)
+        msfile: Output MSv2 file name
         overwrite: Overwrite existing output file or not.
             Default is False (not overwrite).
+        storage_profile: Storage profile of data columns, one of
+            "default", "write-optimized", "read-optimized", and "compressed-lossy".
+        jobs: Number of worker processes to fill subtables
+            concurrently with MAIN table.
+        context: Conversion context of table. If not given,
+            it is created from table.
 
     Returns:
         Export status. True is successful.
@@ -33,7 +46,13 @@ def _to_ms2(hdulist: "HDUList", msfile: str, overwrite: bool = False) -> bool:
         LOG.info(f'Overwrite existing {msfile}...')
         shutil.rmtree(msfile)
 
-    build_ms2(msfile)
-    fill_ms2(msfile, hdulist[0])
+    if context is None:
+        context = ConversionContext(table)
+    data_shape = None if storage_profile == "default" else context.data_shape
+    # empty MS is copied from cached template, and then, all tables
+    # are opened once and kept locked during fill
+    with MsWriteSession(msfile):
+        build_ms2_from_template(msfile, storage_profile, data_shape)
+        fill_ms2(msfile, table, context, jobs)
 
     return True
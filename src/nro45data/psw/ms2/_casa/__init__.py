@@ -4,36 +4,52 @@ from ._casa6 import _is_casa6_available
 from ._casacore import _is_casacore_available
 
 if _is_casa6_available:
+    BACKEND = "casatools"
     from ._casa6 import build_table
+    from ._casa6 import create_table
     from ._casa6 import open_table
+    from ._casa6 import open_table_tool
     from ._casa6 import _table
     from ._casa6 import convert_str_angle_to_rad
     from ._casa6 import put_table_keyword
+    from ._casa6 import put_column
     from ._casa6 import datestr2mjd
     from ._casa6 import mjd2datetime
 elif _is_casacore_available:
+    BACKEND = "casacore"
     from ._casacore import build_table
+    from ._casacore import create_table
     from ._casacore import open_table
+    from ._casacore import open_table_tool
     from ._casacore import _table
     from ._casacore import convert_str_angle_to_rad
     from ._casacore import put_table_keyword
+    from ._casacore import put_column
     from ._casacore import datestr2mjd
     from ._casacore import mjd2datetime
 else:
+    BACKEND = None
     build_table = None
+    create_table = None
     open_table = None
+    open_table_tool = None
     _table = None
     convert_str_angle_to_rad = None
     put_table_keyword = None
+    put_column = None
     datestr2mjd = None
     mjd2datetime = None
 
 __all__ = [
+    "BACKEND",
     "build_table",
+    "create_table",
     "open_table",
+    "open_table_tool",
     "_table",
     "convert_str_angle_to_rad",
     "put_table_keyword",
+    "put_column",
     "datestr2mjd",
     "mjd2datetime"
 ]
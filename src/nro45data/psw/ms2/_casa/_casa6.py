@@ -1,7 +1,9 @@
 import contextlib
 import datetime
 import logging
-from typing import Any
+from typing import Any, Optional
+
+import numpy as np
 
 try:
     _is_casa6_available = True
@@ -22,21 +24,56 @@ def _test_casatools():
         LOG.warning("casatools is not available")
 
 
-def build_table(table_name: str, table_desc: dict):
+def create_table(
+    table_name: str, table_desc: dict, dminfo: Optional[dict] = None, lock_mode: str = "default"
+) -> _table:
+    """Create new table and return table tool opened for writing.
+
+    Args:
+        table_name: Name of the table
+        table_desc: Table description
+        dminfo: Data manager information
+        lock_mode: Lock mode, e.g. "default" or "permanentwait"
+
+    Returns:
+        Table tool. Caller is responsible for closing it.
+    """
     _test_casatools()
 
     tb = _table()
-    tb.create(table_name, table_desc)
+    tb.create(table_name, table_desc, dminfo=dminfo or {}, lockoptions={"option": lock_mode})
+    return tb
+
+
+def build_table(table_name: str, table_desc: dict, dminfo: Optional[dict] = None):
+    tb = create_table(table_name, table_desc, dminfo)
     tb.close()
 
 
-@contextlib.contextmanager
-def open_table(table_name: str, read_only=True) -> _table:
+def open_table_tool(table_name: str, read_only: bool = True, lock_mode: str = "default") -> _table:
+    """Open table and return table tool.
+
+    Args:
+        table_name: Name of the table
+        read_only: Open table read-only or not
+        lock_mode: Lock mode, e.g. "default" or "permanentwait"
+
+    Returns:
+        Table tool. Caller is responsible for closing it.
+    """
     _test_casatools()
 
     tb = _table()
+    tb.open(table_name, nomodify=read_only, lockoptions={"option": lock_mode})
+    return tb
+
+
+@contextlib.contextmanager
+def open_table(table_name: str, read_only=True, lock_mode: str = "default") -> _table:
+    _test_casatools()
+
+    tb = open_table_tool(table_name, read_only=read_only, lock_mode=lock_mode)
     try:
-        tb.open(table_name, nomodify=read_only)
         yield tb
     finally:
         tb.close()
@@ -54,6 +91,20 @@ def put_table_keyword(table_name: str, keyword: str, value: Any):
         tb.putkeyword(keyword, value)
 
 
+def put_column(tb: _table, column_name: str, value: np.ndarray, start_row: int = 0, row_increment: int = 1):
+    """Put values to multiple rows of the column at once.
+
+    Args:
+        tb: Table opened for writing
+        column_name: Name of the column
+        value: Column values. The first axis corresponds to rows.
+        start_row: First row to put values
+        row_increment: Increment of row number
+    """
+    # casatools takes row as the last axis
+    tb.putcol(column_name, np.moveaxis(value, 0, -1), startrow=start_row, nrow=len(value), rowincr=row_increment)
+
+
 def datestr2mjd(date_str: str) -> float:
     """Convert datetime string into MJD in sec.
 
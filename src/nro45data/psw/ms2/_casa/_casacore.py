@@ -1,7 +1,10 @@
 import contextlib
+import copy
 import datetime
 import logging
-from typing import Any
+from typing import Any, Optional
+
+import numpy as np
 
 try:
     _is_casacore_available = True
@@ -20,19 +23,61 @@ def _test_casacore():
         LOG.warning("python-casacore is not available")
 
 
-def build_table(table_name: str, table_desc: dict):
+def create_table(
+    table_name: str, table_desc: dict, dminfo: Optional[dict] = None, lock_mode: str = "default"
+) -> _table:
+    """Create new table and return table tool opened for writing.
+
+    Args:
+        table_name: Name of the table
+        table_desc: Table description
+        dminfo: Data manager information
+        lock_mode: Lock mode, e.g. "default" or "permanentwait"
+
+    Returns:
+        Table tool. Caller is responsible for closing it.
+    """
     _test_casacore()
 
-    tb = _table.table(table_name, table_desc)
+    if dminfo:
+        # python-casacore reverses axes of column values,
+        # whereas row axis is always the last axis of the tile
+        dminfo = copy.deepcopy(dminfo)
+        for dm in dminfo.values():
+            tile_shape = dm["SPEC"].get("DEFAULTTILESHAPE")
+            if tile_shape is not None:
+                dm["SPEC"]["DEFAULTTILESHAPE"] = np.concatenate([tile_shape[-2::-1], tile_shape[-1:]])
+
+    return _table.table(table_name, table_desc, dminfo=dminfo or {}, lockoptions=lock_mode)
+
+
+def build_table(table_name: str, table_desc: dict, dminfo: Optional[dict] = None):
+    tb = create_table(table_name, table_desc, dminfo)
     tb.close()
 
 
+def open_table_tool(table_name: str, read_only: bool = True, lock_mode: str = "default") -> _table:
+    """Open table and return table tool.
+
+    Args:
+        table_name: Name of the table
+        read_only: Open table read-only or not
+        lock_mode: Lock mode, e.g. "default" or "permanentwait"
+
+    Returns:
+        Table tool. Caller is responsible for closing it.
+    """
+    _test_casacore()
+
+    return _table.table(table_name, readonly=read_only, lockoptions=lock_mode)
+
+
 @contextlib.contextmanager
-def open_table(table_name: str, read_only=True) -> _table:
+def open_table(table_name: str, read_only=True, lock_mode: str = "default") -> _table:
     _test_casacore()
 
+    tb = open_table_tool(table_name, read_only=read_only, lock_mode=lock_mode)
     try:
-        tb = _table.table(table_name, readonly=read_only)
         yield tb
     finally:
         tb.close()
@@ -49,6 +94,20 @@ def put_table_keyword(table_name: str, keyword: str, value: Any):
     with open_table(table_name, read_only=False) as tb:
         tb.putkeyword(keyword, value)
 
+
+def put_column(tb: _table, column_name: str, value: np.ndarray, start_row: int = 0, row_increment: int = 1):
+    """Put values to multiple rows of the column at once.
+
+    Args:
+        tb: Table opened for writing
+        column_name: Name of the column
+        value: Column values. The first axis corresponds to rows.
+        start_row: First row to put values
+        row_increment: Increment of row number
+    """
+    tb.putcol(column_name, value, startrow=start_row, nrow=len(value), rowincr=row_increment)
+
+
 def datestr2mjd(date_str: str) -> float:
     """Convert datetime string into MJD in sec.
 
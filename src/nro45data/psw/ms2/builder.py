@@ -1,5 +1,6 @@
 import logging
 import os
+from typing import Optional
 
 from nro45data.psw.ms2.schema.antenna import MsAntennaTable
 from nro45data.psw.ms2.schema.data_description import MsDataDescriptionTable
@@ -17,47 +18,72 @@ from nro45data.psw.ms2.schema.state import MsStateTable
 from nro45data.psw.ms2.schema.syscal import MsSyscalTable
 from nro45data.psw.ms2.schema.weather import MsWeatherTable
 from nro45data.psw.ms2.schema.main import MsMainTable
+from nro45data.psw.ms2.schema.storage import DataShape, get_data_managers
 
-from ._casa import build_table, put_table_keyword
+from ._casa import build_table
+from .session import _table_path, get_active_session, open_ms_table
 
 LOG = logging.getLogger(__name__)
 
 
+SUBTABLES = [
+    ("ANTENNA", MsAntennaTable),
+    ("DATA_DESCRIPTION", MsDataDescriptionTable),
+    ("FEED", MsFeedTable),
+    ("FIELD", MsFieldTable),
+    ("FLAG_CMD", MsFlagCmdTable),
+    ("HISTORY", MsHistoryTable),
+    ("OBSERVATION", MsObservationTable),
+    ("POINTING", MsPointingTable),
+    ("POLARIZATION", MsPolarizationTable),
+    ("PROCESSOR", MsProcessorTable),
+    ("SOURCE", MsSourceTable),
+    ("SPECTRAL_WINDOW", MsSpectralWindowTable),
+    ("STATE", MsStateTable),
+    ("SYSCAL", MsSyscalTable),
+    ("WEATHER", MsWeatherTable),
+]
+
+
+def _create_table(msfile: str, table_name: str, table_desc: dict, dminfo: Optional[dict] = None):
+    session = get_active_session(msfile)
+    if session is None:
+        build_table(_table_path(msfile, table_name), table_desc, dminfo)
+    else:
+        # keep table open until the end of the session
+        session.create_table(table_name, table_desc, dminfo)
+
+
 def build_ms2_subtable(msfile: str, subtable_name: str, table_desc: dict):
     assert os.path.exists(msfile), f"{msfile} MAIN table does not exist"
     subtable_path = os.path.join(msfile, subtable_name)
-    build_table(subtable_path, table_desc)
+    _create_table(msfile, subtable_name, table_desc)
     LOG.info("created %s", subtable_name)
     LOG.debug("subtable path is %s", subtable_path)
 
 
-def build_ms2_main(msfile: str):
-    table_desc = MsMainTable.as_dict()
-    build_table(msfile, table_desc)
-    put_table_keyword(msfile, "MS_VERSION", 2.0)
+def build_ms2_main(msfile: str, storage_profile: str = "default", data_shape: Optional[DataShape] = None):
+    data_managers = get_data_managers(storage_profile, data_shape)
+    table_desc = MsMainTable.as_dict(data_managers)
+    _create_table(msfile, "MAIN", table_desc, MsMainTable.dminfo(data_managers))
+    with open_ms_table(msfile, "MAIN") as tb:
+        tb.putkeyword("MS_VERSION", 2.0)
     LOG.info("created %s MAIN", msfile)
 
 
-def build_ms2(msfile: str):
+def build_ms2(msfile: str, storage_profile: str = "default", data_shape: Optional[DataShape] = None):
+    """Build empty MS.
+
+    Args:
+        msfile: Name of MS file.
+        storage_profile: Storage profile of data columns of MAIN table,
+            one of "default", "write-optimized", "read-optimized",
+            and "compressed-lossy". Default is "default" (StandardStMan).
+        data_shape: Shape of data columns used to compute tile shape.
+            Required for "write-optimized" and "read-optimized".
+    """
     LOG.info("Building MS")
-    build_ms2_main(msfile)
-    subtables = [
-        ("ANTENNA", MsAntennaTable),
-        ("DATA_DESCRIPTION", MsDataDescriptionTable),
-        ("FEED", MsFeedTable),
-        ("FIELD", MsFieldTable),
-        ("FLAG_CMD", MsFlagCmdTable),
-        ("HISTORY", MsHistoryTable),
-        ("OBSERVATION", MsObservationTable),
-        ("POINTING", MsPointingTable),
-        ("POLARIZATION", MsPolarizationTable),
-        ("PROCESSOR", MsProcessorTable),
-        ("SOURCE", MsSourceTable),
-        ("SPECTRAL_WINDOW", MsSpectralWindowTable),
-        ("STATE", MsStateTable),
-        ("SYSCAL", MsSyscalTable),
-        ("WEATHER", MsWeatherTable),
-    ]
-    for subtable_name, table_schema in subtables:
+    build_ms2_main(msfile, storage_profile, data_shape)
+    for subtable_name, table_schema in SUBTABLES:
         build_ms2_subtable(msfile, subtable_name, table_schema.as_dict())
     LOG.info("created %s", msfile)
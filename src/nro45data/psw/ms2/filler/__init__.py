@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import concurrent.futures
 import logging
+import multiprocessing
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-import nro45data.psw.ms2._casa as _casa
+from ..session import get_active_session, open_ms_table
 from .antenna import fill_antenna
+from .context import ConversionContext
 from .data_description import fill_data_description
 from .feed import fill_feed
 from .field import fill_field
@@ -21,20 +24,99 @@ from .syscal import fill_syscal
 from .weather import fill_weather
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from ...io import PswTable
 
 LOG = logging.getLogger(__name__)
 
 
-def fill_ms2(msfile: str, hdu: BinTableHDU):
+SUBTABLE_FILLERS = {
+    'ANTENNA': fill_antenna,
+    'DATA_DESCRIPTION': fill_data_description,
+    'FEED': fill_feed,
+    'FIELD': fill_field,
+    'OBSERVATION': fill_observation,
+    'POINTING': fill_pointing,
+    'POLARIZATION': fill_polarization,
+    'PROCESSOR': fill_processor,
+    'SOURCE': fill_source,
+    'SPECTRAL_WINDOW': fill_spectral_window,
+    'STATE': fill_state,
+    'SYSCAL': fill_syscal,
+    'WEATHER': fill_weather,
+    'FLAG_CMD': None,
+    'HISTORY': None,
+}
+
+# conversion context inherited by worker processes created by fork
+_worker_context: Optional[ConversionContext] = None
+
+
+def _fill_subtable(msfile: str, subtable_name: str) -> str:
+    """Fill MS subtable in worker process.
+
+    Args:
+        msfile: Name of MS file.
+        subtable_name: Name of subtable.
+
+    Returns:
+        Name of subtable.
+    """
+    SUBTABLE_FILLERS[subtable_name](msfile, _worker_context)
+    return subtable_name
+
+
+def _fill_concurrently(msfile: str, context: ConversionContext, subtable_names: list[str], jobs: int):
+    """Fill subtables in worker processes while filling MAIN table.
+
+    casa table backends are not thread-safe so that subtables
+    are filled in separate processes. Worker processes are created
+    by fork to share the context without pickling the data.
+
+    Args:
+        msfile: Name of MS file.
+        context: Conversion context.
+        subtable_names: Names of subtables to fill.
+        jobs: Number of worker processes.
+    """
+    global _worker_context
+
+    # derive everything before fork so that workers don't repeat it
+    context.precompute()
+
+    # subtables are opened by worker processes
+    session = get_active_session(msfile)
+    if session is not None:
+        for name in subtable_names:
+            session.release(name)
+
+    _worker_context = context
+    try:
+        mp_context = multiprocessing.get_context("fork")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as executor:
+            futures = [executor.submit(_fill_subtable, msfile, name) for name in subtable_names]
+            fill_main(msfile, context)
+            LOG.debug("MAIN table filled")
+            for future in futures:
+                LOG.debug("%s table filled", future.result())
+    finally:
+        _worker_context = None
+
+
+def fill_ms2(msfile: str, hdu: PswTable, context: Optional[ConversionContext] = None, jobs: int = 1):
     """Fill MS tables with data from FITS HDU.
 
     Note that the MS file must be generated before calling this function.
+    Information derived from the data, such as array configuration, is
+    computed once and shared among fillers through conversion context.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        hdu: NRO45m psw data in the form of PswTable or BinTableHDU object.
+        context: Conversion context of hdu. If not given, it is
+            created from hdu.
+        jobs: Number of worker processes to fill subtables. If more than 1,
+            subtables are filled concurrently with MAIN table. Falls back to
+            sequential filling if fork is not available. Default is 1.
 
     Raises:
         FileNotFoundError: If MS file does not exist.
@@ -42,26 +124,22 @@ def fill_ms2(msfile: str, hdu: BinTableHDU):
     if not os.path.exists(msfile):
         FileNotFoundError("MS must be built before calling fill_ms2")
 
-    fill_main(msfile, hdu)
-    subtable_filler_methods = {
-        'ANTENNA': fill_antenna,
-        'DATA_DESCRIPTION': fill_data_description,
-        'FEED': fill_feed,
-        'FIELD': fill_field,
-        'OBSERVATION': fill_observation,
-        'POINTING': fill_pointing,
-        'POLARIZATION': fill_polarization,
-        'PROCESSOR': fill_processor,
-        'SOURCE': fill_source,
-        'SPECTRAL_WINDOW': fill_spectral_window,
-        'STATE': fill_state,
-        'SYSCAL': fill_syscal,
-        'WEATHER': fill_weather,
-        'FLAG_CMD': None,
-        'HISTORY': None,
-    }
-    for subtable_name, filler_method in subtable_filler_methods.items():
-        if filler_method:
-            filler_method(msfile, hdu)
-        subtable_path = os.path.join(msfile, subtable_name)
-        _casa.put_table_keyword(msfile, subtable_name, f"Table: {subtable_path}")
+    if context is None:
+        context = ConversionContext(hdu)
+
+    subtable_names = [name for name, filler_method in SUBTABLE_FILLERS.items() if filler_method]
+    if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        LOG.warning("fork is not available. Fill subtables sequentially.")
+        jobs = 1
+
+    if jobs > 1:
+        _fill_concurrently(msfile, context, subtable_names, jobs)
+    else:
+        fill_main(msfile, context)
+        for subtable_name in subtable_names:
+            SUBTABLE_FILLERS[subtable_name](msfile, context)
+
+    with open_ms_table(msfile, "MAIN") as tb:
+        for subtable_name in SUBTABLE_FILLERS:
+            subtable_path = os.path.join(msfile, subtable_name)
+            tb.putkeyword(subtable_name, f"Table: {subtable_path}")
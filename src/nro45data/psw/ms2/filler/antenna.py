@@ -5,26 +5,25 @@ from typing import Generator, TYPE_CHECKING
 
 import numpy as np
 
-from .utils import get_array_configuration, fill_ms_table
+from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_antenna_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_antenna_row(context: ConversionContext) -> Generator[dict, None, None]:
     """Provide antenna row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing antenna row information.
     """
-    array_conf = get_array_configuration(hdu)
-    beam_list = np.unique(sorted([x[1] for x in array_conf.values()]))
+    hdu = context.hdu
+    beam_list = context.beam_list
     num_beam = len(beam_list)
 
     antenna_name_base = str(hdu.header["TELESCOP"]).strip()
@@ -75,11 +74,11 @@ def _get_antenna_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
         yield row
 
 
-def fill_antenna(msfile: str, hdu: BinTableHDU):
+def fill_antenna(msfile: str, context: ConversionContext):
     """Fill MS ANTENNA table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "ANTENNA", _get_antenna_row)
+    fill_ms_table(msfile, context, "ANTENNA", _get_antenna_row)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import functools
+import logging
+from typing import TYPE_CHECKING, Generator, Optional
+
+import numpy as np
+
+from ...io import iter_psw_chunks, read_psw_header, _read_psw_table
+from ...io.reader import DEFAULT_ROWS_PER_CHUNK
+from ...io.table import _build_dtype, _get_categorical
+from ..schema.storage import DataShape
+from .utils import (
+    DataChunk,
+    IntegrationIndex,
+    get_array_configuration,
+    get_data_description_map,
+    get_processor_map,
+)
+
+if TYPE_CHECKING:
+    from ...io import Categorical, PswTable
+
+LOG = logging.getLogger(__name__)
+
+# columns that are read chunk by chunk rather than kept in the context
+CHUNKED_COLUMNS = ("LDATA",)
+
+
+class ConversionContext:
+    """Information derived from NRO45m psw data shared among fillers.
+
+    Each item is computed on first access and then cached so that
+    expensive derivations, such as array configuration, are done
+    only once per conversion.
+
+    Fillers of MAIN, SYSCAL, WEATHER, and POINTING tables read rows
+    through iter_chunks. If the context is associated with the file,
+    rows are read chunk by chunk so that spectra need not be held in
+    memory at once.
+
+    Args:
+        hdu: NRO45m psw data in the form of PswTable or BinTableHDU object.
+        filename: Name of the data. If given, rows are read from
+            the file chunk by chunk. Default is None.
+        rows_per_chunk: Nominal number of rows per chunk.
+    """
+
+    def __init__(
+        self, hdu: PswTable, filename: Optional[str] = None, rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK
+    ):
+        self.hdu = hdu
+        self.filename = filename
+        self.rows_per_chunk = rows_per_chunk
+
+    @classmethod
+    def from_file(cls, filename: str, rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK) -> ConversionContext:
+        """Create context from NRO45m psw data file.
+
+        All columns except for CHUNKED_COLUMNS are read into the context.
+        Columns in CHUNKED_COLUMNS are read chunk by chunk by fillers.
+
+        Args:
+            filename: Name of the data
+            rows_per_chunk: Nominal number of rows per chunk.
+
+        Returns:
+            Conversion context
+        """
+        header, _ = read_psw_header(filename)
+        columns = [name for name in _build_dtype(header).names if name not in CHUNKED_COLUMNS]
+        table = _read_psw_table(filename, columns=columns)
+        return cls(table, filename=filename, rows_per_chunk=rows_per_chunk)
+
+    def precompute(self):
+        """Compute all items in advance.
+
+        This is useful before sharing the context with worker processes.
+        """
+        for name, value in vars(type(self)).items():
+            if isinstance(value, functools.cached_property):
+                getattr(self, name)
+
+    def iter_chunks(self) -> Generator[DataChunk, None, None]:
+        """Iterate over blocks of consecutive rows.
+
+        Each chunk holds all rows of the integrations of the chunk.
+        The whole data is a single chunk if the context is not associated
+        with the file or rows are not stored in time order.
+
+        Yields:
+            Chunk of rows
+        """
+        index = self.integration_index
+        if self.filename is None or not index.is_time_ordered:
+            yield DataChunk(self.hdu, 0, slice(0, len(index)))
+            return
+
+        row_offset = 0
+        for table in iter_psw_chunks(self.filename, rows_per_chunk=self.rows_per_chunk):
+            num_rows = len(table)
+            time_index = index.time_index[row_offset : row_offset + num_rows]
+            yield DataChunk(table, row_offset, slice(int(time_index[0]), int(time_index[-1]) + 1))
+            row_offset += num_rows
+
+    @functools.cached_property
+    def array_conf(self) -> dict:
+        """Array configuration. See get_array_configuration."""
+        return get_array_configuration(self.hdu)
+
+    @functools.cached_property
+    def data_description_map(self) -> tuple[dict, dict, dict, list]:
+        """Data description map. See get_data_description_map."""
+        return get_data_description_map(self.array_conf)
+
+    @functools.cached_property
+    def intent_codes(self) -> Categorical:
+        """SCNTP column as integer codes."""
+        return _get_categorical(self.hdu.data, "SCNTP")
+
+    @functools.cached_property
+    def intent_map(self) -> dict[str, int]:
+        """Map from intent (SCNTP) to STATE_ID.
+
+        STATE_ID is assigned in order of first appearance of intents
+        as get_intent_map does.
+        """
+        intent = self.intent_codes
+        appearance_order = np.argsort(intent.first_rows())
+        return dict((intent.categories[j], i) for i, j in enumerate(appearance_order))
+
+    @functools.cached_property
+    def state_ids(self) -> np.ndarray:
+        """STATE_ID of each row."""
+        intent = self.intent_codes
+        return np.array([self.intent_map[x] for x in intent.categories])[intent.codes]
+
+    @functools.cached_property
+    def processor_map(self) -> tuple[list[str], str]:
+        """Processor sub types and their prefixes. See get_processor_map."""
+        header = self.hdu.header
+        arry = [str(header[f"ARRY{i}"]).strip() for i in range(1, 5)]
+        return get_processor_map(*arry)
+
+    @functools.cached_property
+    def beam_list(self) -> list[int]:
+        """Sorted list of beam numbers. Index of the list is ANTENNA_ID."""
+        return sorted(set(conf[1] for conf in self.array_conf.values()))
+
+    @functools.cached_property
+    def array_codes(self) -> Categorical:
+        """ARRYT column as integer codes."""
+        return _get_categorical(self.hdu.data, "ARRYT")
+
+    @functools.cached_property
+    def integration_index(self) -> IntegrationIndex:
+        """Index of rows grouped by integration."""
+        return IntegrationIndex(self.hdu.data["MJDST"], self.hdu.data["MJDET"])
+
+    @functools.cached_property
+    def array_rows(self) -> dict[int, np.ndarray]:
+        """Row of each polarization for each integration.
+
+        Keys are those of array_conf. Values are arrays of shape
+        (number of integrations, number of polarizations) and -1
+        indicates missing data.
+        """
+        index = self.integration_index
+        arrays = self.array_codes
+        array_rows = {}
+        for key, conf in self.array_conf.items():
+            row_maps = [index.first_rows_where(arrays.codes == arrays.code_of(a)) for a in conf[3]]
+            array_rows[key] = np.stack(row_maps, axis=1)
+        return array_rows
+
+    @functools.cached_property
+    def data_shape(self) -> DataShape:
+        """Shape of data columns of MAIN table."""
+        npol = max(len(conf[3]) for conf in self.array_conf.values())
+        nchan = max(int(conf[0][2]) for conf in self.array_conf.values())
+        return DataShape(npol=npol, nchan=nchan)
@@ -5,26 +5,24 @@ from typing import Generator, TYPE_CHECKING
 
 import numpy as np
 
-from .utils import get_array_configuration, get_data_description_map, fill_ms_table
+from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_data_description_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_data_description_row(context: ConversionContext) -> Generator[dict, None, None]:
     """Provide data description row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing data description row information.
     """
-    array_conf = get_array_configuration(hdu)
-    ddd, _, _, _ = get_data_description_map(array_conf)
+    ddd, _, _, _ = context.data_description_map
 
     for _, (spw, pol) in ddd.items():
         spw_id = spw
@@ -42,11 +40,11 @@ def _get_data_description_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
         yield row
 
 
-def fill_data_description(msfile: str, hdu: BinTableHDU):
+def fill_data_description(msfile: str, context: ConversionContext):
     """Fill MS DATA_DESCRIPTION table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "DATA_DESCRIPTION", _get_data_description_row)
+    fill_ms_table(msfile, context, "DATA_DESCRIPTION", _get_data_description_row)
@@ -5,30 +5,30 @@ from typing import Generator, TYPE_CHECKING
 
 import numpy as np
 
+from ...io.table import _get_categorical
 from .._casa import datestr2mjd
-from .utils import get_array_configuration, fill_ms_table
+from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_feed_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_feed_row(context: ConversionContext) -> Generator[dict, None, None]:
     """Provide feed row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing feed row information.
     """
-    array_conf = get_array_configuration(hdu)
-    num_beam = len(np.unique([v[1] for v in array_conf.values()]))
+    hdu = context.hdu
+    num_beam = len(context.beam_list)
 
-    rx_str = np.unique(hdu.data["RX"])
-    poltp_str = np.unique(hdu.data["POLTP"])
+    rx_str = _get_categorical(hdu.data, "RX").categories
+    poltp_str = _get_categorical(hdu.data, "POLTP").categories
     if np.all(poltp_str == ""):
         pol_spec = rx_str[0].strip()[-1]
     else:
@@ -110,11 +110,11 @@ def _get_feed_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
         yield row
 
 
-def fill_feed(msfile: str, hdu: BinTableHDU):
+def fill_feed(msfile: str, context: ConversionContext):
     """Fill MS FEED table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "FEED", _get_feed_row)
+    fill_ms_table(msfile, context, "FEED", _get_feed_row)
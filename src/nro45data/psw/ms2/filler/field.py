@@ -10,17 +10,16 @@ from .._casa import convert_str_angle_to_rad
 from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_field_row(hdu: BinTableHDU) -> Generator[dict, None, dict]:
+def _get_field_row(context: ConversionContext) -> Generator[dict, None, dict]:
     """Provide field row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing field row information.
@@ -28,6 +27,8 @@ def _get_field_row(hdu: BinTableHDU) -> Generator[dict, None, dict]:
     Returns:
         Dictionary containing data-dependent column keywords.
     """
+    hdu = context.hdu
+
     # NAME
     field_name = hdu.header["OBJECT"].strip()
     LOG.debug("field_name: %s", field_name)
@@ -102,11 +103,11 @@ def _get_field_row(hdu: BinTableHDU) -> Generator[dict, None, dict]:
     return column_keywords  # noqa
 
 
-def fill_field(msfile: str, hdu: BinTableHDU):
+def fill_field(msfile: str, context: ConversionContext):
     """Fill MS FIELD table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "FIELD", _get_field_row)
+    fill_ms_table(msfile, context, "FIELD", _get_field_row)
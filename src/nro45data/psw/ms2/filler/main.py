@@ -1,201 +1,183 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import TYPE_CHECKING, Generator
 
 import numpy as np
 
-from .._casa import open_table
-from .utils import get_array_configuration, get_data_description_map, get_intent_map, get_processor_map
+from .utils import TIMES_PER_BLOCK, ColumnBlock, fill_ms_table, iter_time_blocks
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_main_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
-    array_conf = get_array_configuration(hdu)
-    dd_dict, array_dd_map, spw_map, pol_map = get_data_description_map(array_conf)
+def _view(buffer: np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    """Return contiguous view of the leading part of flat buffer."""
+    return buffer[:math.prod(shape)].reshape(shape)
 
-    mjdst = hdu.data["MJDST"]
-    mjdet = hdu.data["MJDET"]
-    arryt = np.array([a.strip() for a in hdu.data["ARRYT"]])
-    multn = hdu.data["MULTN"]
-    # integ = hdu.data['INTEG']
-    iscn = hdu.data["ISCN"]
-    scntp = hdu.data["SCNTP"]
-    bebw = hdu.data["BEBW"]
-    sfctr = hdu.data["SFCTR"]
-    adoff = hdu.data["ADOFF"]
-    ldata = hdu.data["LDATA"]
-
-    intent_map = get_intent_map(iscn, scntp)
-
-    arry1 = str(hdu.header["ARRY1"]).strip()
-    arry2 = str(hdu.header["ARRY2"]).strip()
-    arry3 = str(hdu.header["ARRY3"]).strip()
-    arry4 = str(hdu.header["ARRY4"]).strip()
-    _, processor_id_map = get_processor_map(arry1, arry2, arry3, arry4)
-
-    beam_list = sorted(set(multn))
-    unique_time = np.unique(mjdst)
-
-    for t in unique_time:
-        rows = np.where(mjdst == t)[0]
-
-        main_start_time = mjdst[rows[0]]
-        main_end_time = mjdet[rows[0]]
-        main_mid_time = (main_end_time + main_start_time) / 2
-        main_nominal_interval = main_end_time - main_start_time
-
-        array_sub_list = arryt[rows].tolist()
-
-        for _, conf in array_conf.items():
-            _, _, nchan = conf[0]
-            array_list = conf[3]
-            dd_id_list = set([array_dd_map[_a] for _a in array_list])
-            if not len(dd_id_list) == 1:
-                raise RuntimeError(f"Mismatch of DATA_DESC_ID in dual-pol data: array {array_list}")
-
-            dd_id = dd_id_list.pop()
-            dd_rows = [rows[array_sub_list.index(a)] if a in array_sub_list else -1 for a in array_list]
-            npol = len(dd_rows)
-
-            # TIME
-            time_midpoint = main_mid_time
-
-            # ANTENNA1
-            beam_number = conf[1]
-            antenna1 = beam_list.index(beam_number)
-
-            # ANTENNA2
-            antenna2 = antenna1
-
-            # FEED1: always 0
-            feed1 = 0
-
-            # FEED2: always 0
-            feed2 = 0
-
-            # DATA_DESC_ID
-            data_desc_id = dd_id
-
-            # PROCESSOR_ID
-            _pid = set(processor_id_map.find(a[0]) for a in array_list)
-            assert len(_pid) == 1
-            processor_id = _pid.pop()
-
-            # FIELD_ID: always 0
-            field_id = 0
-
-            # INTERVAL
-            interval = main_nominal_interval
-
-            # EXPOSURE
-            if all([x == -1 for x in dd_rows]):
-                exposure = 0
-            else:
-                idx = [x for x in dd_rows if x != -1]
-                exposure = interval
-
-            # TIME_CENTROID
-            time_centroid = time_midpoint
-
-            # SCAN_NUMBER
-            if all([x == -1 for x in dd_rows]):
-                scan_number = 0
-            else:
-                idx = [x for x in dd_rows if x != -1]
-                _scan_number = set(iscn[idx])
-                assert len(_scan_number) == 1
-                scan_number = _scan_number.pop()
-
-            # ARRAY_ID: always 0
-            array_id = 0
-
-            # OBSERVATION_ID: always 0
-            observation_id = 0
-
-            # STATE_ID
-            if all([x == -1 for x in dd_rows]):
-                state_id = -1
-            else:
-                idx = [x for x in dd_rows if x != -1]
-                scan_intent = set(scntp[idx])
-                assert len(scan_intent) == 1
-                state_id = intent_map[scan_intent.pop()]
-
-            # UVW: always [0, 0, 0]
-            uvw = np.zeros(3, dtype=float)
 
-            # FLOAT_DATA
-            float_data = np.zeros((npol, nchan), dtype=float)
-
-            # FLAG
-            flag = np.zeros((npol, nchan), dtype=bool)
-
-            for ipol, _row in enumerate(dd_rows):
-                if _row == -1:
-                    # invalid data
-                    flag[ipol, :] = True
+def _get_main_columns(context: ConversionContext) -> Generator[ColumnBlock, None, None]:
+    """Generate MAIN table columns.
+
+    MAIN table rows are ordered by time and then by array configuration.
+    Since spectral shape depends on array configuration, columns are
+    generated per array configuration for a block of integrations.
+    Rows of the block are start_row, start_row + row_increment, ...
+
+    Spectral data are read chunk by chunk through context.iter_chunks
+    and decoded into float32 buffers that are allocated once for the
+    largest block and reused for every block and array configuration,
+    so that memory usage is bounded by the chunk and block sizes.
+    Since yielded FLOAT_DATA and FLAG are views on those buffers, each
+    block must be consumed before the next one is requested, as
+    fill_ms_table does.
+
+    Args:
+        context: Conversion context of NRO45m psw data.
+
+    Yields:
+        Column block for each array configuration and block of integrations
+    """
+    hdu = context.hdu
+    array_conf = context.array_conf
+    dd_dict, array_dd_map, spw_map, pol_map = context.data_description_map
+
+    iscn = hdu.data["ISCN"]
+    intent_codes = context.intent_codes.codes
+
+    state_ids = context.state_ids
+
+    _, processor_id_map = context.processor_map
+
+    beam_list = context.beam_list
+
+    # attributes of integration are taken from the first row of each time
+    index = context.integration_index
+    num_time = len(index)
+    mid_time = index.mid_time
+    nominal_interval = index.interval
+
+    num_conf = len(array_conf)
+    conf_list = []
+    for key, conf in array_conf.items():
+        _, _, nchan = conf[0]
+        array_list = conf[3]
+        dd_id_list = set([array_dd_map[_a] for _a in array_list])
+        if not len(dd_id_list) == 1:
+            raise RuntimeError(f"Mismatch of DATA_DESC_ID in dual-pol data: array {array_list}")
+        dd_id = dd_id_list.pop()
+
+        _pid = set(processor_id_map.find(a[0]) for a in array_list)
+        assert len(_pid) == 1
+        processor_id = _pid.pop()
+
+        antenna1 = beam_list.index(conf[1])
+
+        # row of each polarization for each integration: (ntime, npol)
+        dd_rows = context.array_rows[key]
+
+        conf_list.append((nchan, dd_id, processor_id, antenna1, dd_rows))
+
+    max_block_size = min(num_time, TIMES_PER_BLOCK)
+    data_shape = context.data_shape
+    buffer_size = max_block_size * data_shape.npol * data_shape.nchan
+    ldata_buffer = np.empty(buffer_size, dtype=np.int32)
+    work_buffer = np.empty(buffer_size, dtype=np.float64)
+    float_data_buffer = np.empty(buffer_size, dtype=np.float32)
+    flag_buffer = np.empty(buffer_size, dtype=bool)
+
+    for chunk in context.iter_chunks():
+        bebw = chunk.table.data["BEBW"]
+        sfctr = chunk.table.data["SFCTR"]
+        adoff = chunk.table.data["ADOFF"]
+        ldata = chunk.table.data["LDATA"]
+
+        for block in iter_time_blocks(chunk.integrations.stop, start=chunk.integrations.start):
+            time_midpoint = mid_time[block]
+            interval = nominal_interval[block]
+            num_row = len(time_midpoint)
+
+            for conf_id, (nchan, dd_id, processor_id, antenna1, all_dd_rows) in enumerate(conf_list):
+                dd_rows = all_dd_rows[block]
+                npol = dd_rows.shape[1]
+                valid = dd_rows != -1
+                has_data = np.any(valid, axis=1)
+                rows = np.where(valid, dd_rows, 0)
+                # rows in the chunk
+                chunk_rows = np.where(valid, dd_rows - chunk.row_offset, 0)
+
+                # scan number and intent must be unique among polarizations
+                first_valid = rows[np.arange(num_row), np.argmax(valid, axis=1)]
+                assert np.all((iscn[rows] == iscn[first_valid][:, np.newaxis]) | ~valid)
+                assert np.all((intent_codes[rows] == intent_codes[first_valid][:, np.newaxis]) | ~valid)
+
+                # EXPOSURE
+                exposure = np.where(has_data, interval, 0)
+
+                # SCAN_NUMBER
+                scan_number = np.where(has_data, iscn[first_valid], 0)
+
+                # STATE_ID
+                state_id = np.where(has_data, state_ids[first_valid], -1)
+
+                # FLOAT_DATA
+                # decoded in double precision and then rounded to float once
+                cube_shape = (num_row, npol, nchan)
+                float_data = _view(float_data_buffer, cube_shape)
+                if np.any(valid):
+                    assert ldata.shape[1] == nchan
+                    ldata_rows = np.take(ldata, chunk_rows, axis=0, out=_view(ldata_buffer, cube_shape))
+                    decoded = _view(work_buffer, cube_shape)
+                    np.multiply(ldata_rows, sfctr[chunk_rows][..., np.newaxis], out=decoded)
+                    np.add(decoded, adoff[chunk_rows][..., np.newaxis], out=decoded)
+                    np.copyto(float_data, decoded, casting="same_kind")
+                    float_data[~valid] = 0
                 else:
-                    # valid data
-                    scaling_factor = sfctr[_row]
-                    offset_value = adoff[_row]
-                    quantized = ldata[_row, :]
-                    assert len(quantized) == nchan
-                    float_data[ipol] = scaling_factor * quantized + offset_value
-
-            # SIGMA
-            sigma = np.zeros(npol, dtype=float)
-            for ipol, _row in enumerate(dd_rows):
-                if _row != -1:
-                    bw = bebw[_row]
-                    sigma[ipol] = 1 / np.sqrt(2 * bw * interval)
-
-            # WEIGHT
-            weight = np.array([1 / (s * s) if s else 0 for s in sigma])
-
-            # FLAG_ROW
-            flag_row = False
-
-            row = {
-                "TIME": time_midpoint,
-                "ANTENNA1": antenna1,
-                "ANTENNA2": antenna2,
-                "FEED1": feed1,
-                "FEED2": feed2,
-                "DATA_DESC_ID": data_desc_id,
-                "PROCESSOR_ID": processor_id,
-                "FIELD_ID": field_id,
-                "INTERVAL": interval,
-                "EXPOSURE": exposure,
-                "TIME_CENTROID": time_centroid,
-                "SCAN_NUMBER": scan_number,
-                "ARRAY_ID": array_id,
-                "OBSERVATION_ID": observation_id,
-                "STATE_ID": state_id,
-                "UVW": uvw,
-                "FLOAT_DATA": float_data,
-                "FLAG": flag,
-                "SIGMA": sigma,
-                "WEIGHT": weight,
-                "FLAG_ROW": flag_row,
-            }
-
-            yield row
-
-
-def fill_main(msfile: str, hdu: BinTableHDU):
-    row_iterator = _get_main_row(hdu)
-    with open_table(msfile, read_only=False) as tb:
-        for row_id, row in enumerate(row_iterator):
-            if tb.nrows() <= row_id:
-                tb.addrows(tb.nrows() - row_id + 1)
-
-            for key, value in row.items():
-                LOG.debug("row %d key %s", row_id, key)
-                tb.putcell(key, row_id, value)
-            LOG.debug("main table %d row %s", row_id, row)
+                    float_data.fill(0)
+
+                # FLAG
+                flag = _view(flag_buffer, cube_shape)
+                flag[...] = ~valid[..., np.newaxis]
+
+                # SIGMA
+                with np.errstate(divide="ignore"):
+                    sigma = np.where(valid, 1 / np.sqrt(2 * bebw[chunk_rows] * interval[:, np.newaxis]), 0)
+
+                # WEIGHT
+                with np.errstate(divide="ignore"):
+                    weight = np.where(sigma != 0, 1 / (sigma * sigma), 0)
+
+                columns = {
+                    "TIME": time_midpoint,
+                    "ANTENNA1": np.full(num_row, antenna1, dtype=np.int32),
+                    "ANTENNA2": np.full(num_row, antenna1, dtype=np.int32),
+                    "FEED1": np.zeros(num_row, dtype=np.int32),
+                    "FEED2": np.zeros(num_row, dtype=np.int32),
+                    "DATA_DESC_ID": np.full(num_row, dd_id, dtype=np.int32),
+                    "PROCESSOR_ID": np.full(num_row, processor_id, dtype=np.int32),
+                    "FIELD_ID": np.zeros(num_row, dtype=np.int32),
+                    "INTERVAL": interval,
+                    "EXPOSURE": exposure,
+                    "TIME_CENTROID": time_midpoint,
+                    "SCAN_NUMBER": scan_number.astype(np.int32),
+                    "ARRAY_ID": np.zeros(num_row, dtype=np.int32),
+                    "OBSERVATION_ID": np.zeros(num_row, dtype=np.int32),
+                    "STATE_ID": state_id.astype(np.int32),
+                    "UVW": np.zeros((num_row, 3), dtype=float),
+                    "FLOAT_DATA": float_data,
+                    "FLAG": flag,
+                    "SIGMA": sigma.astype(np.float32),
+                    "WEIGHT": weight.astype(np.float32),
+                    "FLAG_ROW": np.zeros(num_row, dtype=bool),
+                }
+                LOG.debug("main table block %d-%d conf %d npol %d", block.start, block.stop, conf_id, npol)
+
+                yield ColumnBlock(columns, start_row=block.start * num_conf + conf_id, row_increment=num_conf)
+
+
+def fill_main(msfile: str, context: ConversionContext):
+    num_rows = len(context.integration_index) * len(context.array_conf)
+    fill_ms_table(msfile, context, "MAIN", _get_main_columns, num_rows=num_rows)
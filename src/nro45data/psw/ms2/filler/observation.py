@@ -9,21 +9,21 @@ from .._casa import datestr2mjd
 from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_observation_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_observation_row(context: ConversionContext) -> Generator[dict, None, None]:
     """Provide observation row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing observation row information.
     """
+    hdu = context.hdu
     history_cards = hdu.header["HISTORY"]
 
     # TELESCOPE_NAME
@@ -100,11 +100,11 @@ def _get_observation_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
     yield row
 
 
-def fill_observation(msfile: str, hdu: BinTableHDU):
+def fill_observation(msfile: str, context: ConversionContext):
     """Fill MS OBSERVATION table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "OBSERVATION", _get_observation_row)
+    fill_ms_table(msfile, context, "OBSERVATION", _get_observation_row)
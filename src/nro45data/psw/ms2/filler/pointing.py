@@ -5,21 +5,51 @@ from typing import TYPE_CHECKING, Generator
 
 import numpy as np
 
-from .._casa import open_table
+from .utils import ColumnBlock, fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_pointing_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
-    multn = hdu.data["MULTN"]
-    arryt = hdu.data["ARRYT"]
+def _get_pointing_rows(context: ConversionContext) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Get rows of psw data that provide pointing data for each beam.
+
+    Args:
+        context: Conversion context of NRO45m psw data.
+
+    Returns:
+        Beam numbers and, for each beam, rows of the first array
+        of the beam.
+    """
+    multn = context.hdu.data["MULTN"]
+    array_codes = context.array_codes.codes
 
     beam_id_list, array_index = np.unique(multn, return_index=True)
-    array_id_list = arryt[array_index]
+    array_code_list = array_codes[array_index]
+    rows_per_beam = [np.flatnonzero(array_codes == code) for code in array_code_list]
+
+    return beam_id_list, rows_per_beam
+
+
+def _get_pointing_columns(context: ConversionContext) -> Generator[ColumnBlock, None, dict]:
+    """Generate POINTING table columns.
+
+    Pointing directions are taken from the rows of the first array
+    of each beam. Rows are ordered by beam and then by time, and
+    pointing data are read chunk by chunk through context.iter_chunks.
+
+    Args:
+        context: Conversion context of NRO45m psw data.
+
+    Yields:
+        Column block for each beam and chunk
+
+    Returns:
+        Column keywords to update reference frame of direction columns
+    """
+    hdu = context.hdu
 
     epoch = hdu.header["EPOCH"]
     if epoch == 1950.0:
@@ -30,69 +60,48 @@ def _get_pointing_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
         LOG.warning("Unknown epoch %f. Fall back to ICRS.", epoch)
         direction_ref = "ICRS"
 
-    mjdst = hdu.data["MJDST"]
-    mjdet = hdu.data["MJDET"]
-    ra = hdu.data["RA"]
-    dec = hdu.data["DEC"]
-    dra = hdu.data["DRA"]
-    ddec = hdu.data["DDEC"]
-    az = hdu.data["AZ"]
-    el = hdu.data["EL"]
-
-    for beam_id, array_id in zip(beam_id_list, array_id_list):
-        rows = np.where(arryt == array_id)[0]
-        for row in rows:
-            antenna_id = int(beam_id)
-            pointing_start_time = mjdst[row]
-            pointing_end_time = mjdet[row]
-            pointing_mid_time = (pointing_start_time + pointing_end_time) / 2
-            pointing_interval = pointing_end_time - pointing_start_time
+    beam_id_list, rows_per_beam = _get_pointing_rows(context)
+    beam_offsets = np.cumsum([0] + [len(r) for r in rows_per_beam])
 
-            name = ""
+    for chunk in context.iter_chunks():
+        data = chunk.table.data
+        for beam_id, beam_rows, beam_offset in zip(beam_id_list, rows_per_beam, beam_offsets):
+            start, rows = chunk.select(beam_rows)
+            num_rows = len(rows)
+            if num_rows == 0:
+                continue
 
-            num_poly = 0
-
-            time_origin = pointing_mid_time
+            pointing_start_time = data["MJDST"][rows]
+            pointing_end_time = data["MJDET"][rows]
+            pointing_mid_time = (pointing_start_time + pointing_end_time) / 2
+            pointing_interval = pointing_end_time - pointing_start_time
 
-            direction = np.array([[ra[row], dec[row]]])
-            target = direction
-            encoder = np.array([az[row], el[row]])
-            source_offset = np.array([[dra[row], ddec[row]]])
-            tracking = True
+            direction = np.stack([data["RA"][rows], data["DEC"][rows]], axis=-1)[:, np.newaxis, :]
+            encoder = np.stack([data["AZ"][rows], data["EL"][rows]], axis=-1)
+            source_offset = np.stack([data["DRA"][rows], data["DDEC"][rows]], axis=-1)[:, np.newaxis, :]
 
-            pointing_row = {
-                "ANTENNA_ID": antenna_id,
+            columns = {
+                # ANTENNA_ID: beam number
+                "ANTENNA_ID": np.full(num_rows, int(beam_id), dtype=np.int32),
                 "TIME": pointing_mid_time,
                 "INTERVAL": pointing_interval,
-                "NAME": name,
-                "NUM_POLY": num_poly,
-                "TIME_ORIGIN": time_origin,
-                "DIRECTION_REF": direction_ref,
+                "NAME": np.full(num_rows, ""),
+                "NUM_POLY": np.zeros(num_rows, dtype=np.int32),
+                "TIME_ORIGIN": pointing_mid_time,
                 "DIRECTION": direction,
-                "TARGET": target,
+                "TARGET": direction,
                 "ENCODER": encoder,
                 "SOURCE_OFFSET": source_offset,
-                "TRACKING": tracking,
+                "TRACKING": np.ones(num_rows, dtype=bool),
             }
 
-            yield pointing_row
-
-
-def fill_pointing(msfile: str, hdu: BinTableHDU):
-    row_iterator = _get_pointing_row(hdu)
-    with open_table(msfile + "/POINTING", read_only=False) as tb:
-        for row_id, row in enumerate(row_iterator):
-            if tb.nrows() <= row_id:
-                tb.addrows(tb.nrows() - row_id + 1)
-
-            for key, value in row.items():
-                LOG.info("row %d, key %s", row_id, key)
-                if key == "DIRECTION_REF":
-                    for col in ("DIRECTION", "TARGET", "SOURCE_OFFSET"):
-                        colkeywords = tb.getcolkeywords(col)
-                        if colkeywords["MEASINFO"]["Ref"] != value:
-                            colkeywords["MEASINFO"]["Ref"] = value
-                            tb.putcolkeywords(col, colkeywords)
-                else:
-                    tb.putcell(key, row_id, value)
-            LOG.debug("spw %d row %s", row_id, row)
+            yield ColumnBlock(columns, start_row=int(beam_offset) + start)
+
+    measinfo = {"MEASINFO": {"Ref": direction_ref}}
+    return dict((col, measinfo) for col in ("DIRECTION", "TARGET", "SOURCE_OFFSET"))
+
+
+def fill_pointing(msfile: str, context: ConversionContext):
+    _, rows_per_beam = _get_pointing_rows(context)
+    num_rows = sum(len(r) for r in rows_per_beam)
+    fill_ms_table(msfile, context, "POINTING", _get_pointing_columns, num_rows=num_rows)
@@ -5,11 +5,10 @@ from typing import Generator, TYPE_CHECKING
 
 import numpy as np
 
-from .utils import fill_ms_table, get_array_configuration, get_data_description_map
+from .utils import fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
@@ -65,11 +64,11 @@ def pol_str_to_enum(pols: list[str]) -> list[int]:
         AssertionError("number of polarization must be either 1 or 2")
 
 
-def _get_polarization_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_polarization_row(context: ConversionContext) -> Generator[dict, None, None]:
     """Provide polarization row information.
 
     Args:
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
 
     Yields:
         Dictionary containing polarization row information.
@@ -77,8 +76,7 @@ def _get_polarization_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
     Raises:
         AssertionError: If number of polarization is not either 1 or 2.
     """
-    array_conf = get_array_configuration(hdu)
-    _, _, _, pol_map = get_data_description_map(array_conf)
+    _, _, _, pol_map = context.data_description_map
     # num_pol = len(pol_map)
 
     # CORR_TYPE
@@ -110,14 +108,14 @@ def _get_polarization_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
     yield row
 
 
-def fill_polarization(msfile: str, hdu: BinTableHDU):
+def fill_polarization(msfile: str, context: ConversionContext):
     """Fill MS POLARIZATION table.
 
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
     """
-    fill_ms_table(msfile, hdu, "POLARIZATION", _get_polarization_row)
+    fill_ms_table(msfile, context, "POLARIZATION", _get_polarization_row)
     # with open_table(msfile + "/POLARIZATION", read_only=False) as tb:
     #     num_pol = len(columns["NUM_CORR"])
     #     fix_nrow_to(num_pol, tb)
@@ -4,16 +4,18 @@ from typing import TYPE_CHECKING, Generator
 
 import numpy as np
 
-from .._casa import convert_str_angle_to_rad, open_table
+from .._casa import convert_str_angle_to_rad
+from ..session import open_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_source_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
+def _get_source_row(context: ConversionContext) -> Generator[dict, None, None]:
+    hdu = context.hdu
+
     # TIME and INTERVAL
     # use start and end time of the observation
     history_cards = hdu.header["HISTORY"]
@@ -99,9 +101,9 @@ def _get_source_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
     yield row
 
 
-def fill_source(msfile: str, hdu: BinTableHDU):
-    row_iterator = _get_source_row(hdu)
-    with open_table(msfile + "/SOURCE", read_only=False) as tb:
+def fill_source(msfile: str, context: ConversionContext):
+    row_iterator = _get_source_row(context)
+    with open_ms_table(msfile, "SOURCE") as tb:
         for row_id, row in enumerate(row_iterator):
             if tb.nrows() <= row_id:
                 tb.addrows(tb.nrows() - row_id + 1)
@@ -4,47 +4,22 @@ import collections
 import logging
 from typing import TYPE_CHECKING, Generator
 
-import numpy as np
-
-from .._casa import open_table
-from .utils import get_array_configuration, get_data_description_map
+from ...frequency import _get_frequency_spec
+from .utils import ColumnBlock, fill_ms_table, rows_to_column_blocks
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_frequency_spec(hdu: BinTableHDU, row_id: int) -> tuple[np.ndarray, np.ndarray, int]:
-    data = hdu.data
-    center_freq = data["F0CAL"][row_id]
-    chwid = data["CHWID"][row_id]
-    nch = data["NCH"][row_id]
-    sidbd = data["SIDBD"][row_id]
-
-    if sidbd == "USB":
-        net_sideband = 1
-    elif sidbd == "LSB":
-        net_sideband = -1
-    else:  # DSB
-        net_sideband = 0
-
-    if net_sideband < 0:  # LSB
-        chan_freq = np.array([chwid * ((nch - 1) / 2 - i) + center_freq for i in range(nch)], dtype=float)
-        chan_width = np.ones(nch, dtype=float) * (-chwid)
-    else:  # USB or DSB
-        chan_freq = np.array([chwid * (i - (nch - 1) / 2) + center_freq for i in range(nch)], dtype=float)
-        chan_width = np.ones(nch, dtype=float) * chwid
-
-    return chan_freq, chan_width, net_sideband
-
-
-def _get_spectral_window_row(hdu: BinTableHDU, array_conf: dict) -> Generator[dict, None, None]:
-    ddd, adm, spw_map, _ = get_data_description_map(array_conf)
+def _get_spectral_window_row(context: ConversionContext) -> Generator[dict, None, None]:
+    hdu = context.hdu
+    ddd, adm, spw_map, _ = context.data_description_map
 
     data = hdu.data
-    arry = data["ARRYT"]
+    arrays = context.array_codes
+    array_first_rows = arrays.first_rows()
     nch = data["NCH"]
 
     num_spw = len(spw_map)
@@ -60,7 +35,7 @@ def _get_spectral_window_row(hdu: BinTableHDU, array_conf: dict) -> Generator[di
     for spw_id in range(num_spw):
         dd_id = spw_dd_map[spw_id][0]
         array = dd_array_map[dd_id][0]
-        i = np.where(arry == array)[0][0]
+        i = array_first_rows[arrays.code_of(array)]
         meas_freq_ref = 1  # LSRK
 
         array_list = []
@@ -93,13 +68,22 @@ def _get_spectral_window_row(hdu: BinTableHDU, array_conf: dict) -> Generator[di
         yield spectral_window_row
 
 
-def fill_spectral_window(msfile: str, hdu: BinTableHDU):
-    array_conf = get_array_configuration(hdu)
-    row_iterator = _get_spectral_window_row(hdu, array_conf)
-    with open_table(msfile + "/SPECTRAL_WINDOW", read_only=False) as tb:
-        for spw_id, row in enumerate(row_iterator):
-            if tb.nrows() <= spw_id:
-                tb.addrows()
-            for key, value in row.items():
-                tb.putcell(key, spw_id, value)
-            LOG.debug("spw %d row %s", spw_id, row)
+def _get_spectral_window_columns(context: ConversionContext) -> Generator[ColumnBlock, None, None]:
+    """Generate SPECTRAL_WINDOW table columns.
+
+    Spectral windows with the same number of channels are put together.
+
+    Args:
+        context: Conversion context of NRO45m psw data.
+
+    Yields:
+        Column blocks
+    """
+    rows = list(_get_spectral_window_row(context))
+    yield from rows_to_column_blocks(rows)
+
+
+def fill_spectral_window(msfile: str, context: ConversionContext):
+    _, _, spw_map, _ = context.data_description_map
+    num_rows = len(spw_map)
+    fill_ms_table(msfile, context, "SPECTRAL_WINDOW", _get_spectral_window_columns, num_rows=num_rows)
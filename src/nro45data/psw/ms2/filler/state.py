@@ -3,20 +3,16 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Generator
 
-from .._casa import open_table
-from .utils import get_intent_map
+from ..session import open_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_state_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
-    iscn = hdu.data["ISCN"]
-    scntp = hdu.data["SCNTP"]
-    intent_map = get_intent_map(iscn, scntp)
+def _get_state_row(context: ConversionContext) -> Generator[dict, None, None]:
+    intent_map = context.intent_map
     inverted_map = dict((v, k) for k, v in intent_map.items())
 
     cal = 0
@@ -59,9 +55,9 @@ def _get_state_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
         yield row
 
 
-def fill_state(msfile: str, hdu: BinTableHDU):
-    row_iterator = _get_state_row(hdu)
-    with open_table(msfile + "/STATE", read_only=False) as tb:
+def fill_state(msfile: str, context: ConversionContext):
+    row_iterator = _get_state_row(context)
+    with open_ms_table(msfile, "STATE") as tb:
         for row_id, row in enumerate(row_iterator):
             if tb.nrows() <= row_id:
                 tb.addrows(tb.nrows() - row_id + 1)
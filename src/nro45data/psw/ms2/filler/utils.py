@@ -2,20 +2,161 @@ from __future__ import annotations
 
 import logging
 import pprint
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, Generator, NamedTuple, Optional, TYPE_CHECKING
 
 import numpy as np
 
-from .._casa import open_table
+from ...io.table import _get_categorical
+from .._casa import put_column
+from ..session import open_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
-
+    from ...io import PswTable
     from .._casa import _table
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
+# number of integrations (unique time stamps) processed at once
+TIMES_PER_BLOCK = 1024
+
+
+class ColumnBlock(NamedTuple):
+    """Values of multiple rows to be put to MS table at once.
+
+    Rows of the block are start_row, start_row + row_increment, ...
+
+    Attributes:
+        columns: Column values. The first axis of each value
+            corresponds to rows.
+        start_row: First row of the block
+        row_increment: Increment of row number
+    """
+
+    columns: dict[str, np.ndarray]
+    start_row: int = 0
+    row_increment: int = 1
+
+    @property
+    def num_rows(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+
+class DataChunk(NamedTuple):
+    """Block of consecutive rows of NRO45m psw data.
+
+    Attributes:
+        table: Data table holding rows of the chunk
+        row_offset: Index of the first row of the chunk in the whole data
+        integrations: Slice of integrations whose rows are in the chunk
+    """
+
+    table: PswTable
+    row_offset: int
+    integrations: slice
+
+    def select(self, rows: np.ndarray) -> tuple[int, np.ndarray]:
+        """Select rows that belong to the chunk.
+
+        Selected rows must be contiguous in the given rows, which holds
+        if rows are sorted or the chunk holds the whole data.
+
+        Args:
+            rows: Row indices in the whole data
+
+        Returns:
+            Position of the first selected row in rows, and
+            selected rows as indices into the chunk table
+        """
+        mask = (rows >= self.row_offset) & (rows < self.row_offset + len(self.table.data))
+        positions = np.flatnonzero(mask)
+        start = int(positions[0]) if len(positions) > 0 else 0
+        return start, rows[mask] - self.row_offset
+
+
+class IntegrationIndex:
+    """Index of rows grouped by integration.
+
+    Integration is a group of rows that share start time (MJDST).
+    Rows are sorted by time with stable argsort, and boundaries of
+    integrations are detected in the sorted order so that rows of each
+    integration are kept in the original order.
+
+    Args:
+        start_time: Start time of each row (MJDST)
+        end_time: End time of each row (MJDET)
+
+    Attributes:
+        order: Row indices sorted by time
+        starts: Start position of each integration in order
+        ends: End position of each integration in order
+        unique_time: Start time of each integration
+        first_rows: First row of each integration
+        time_index: Integration index of each row
+        start_time: Start time of each integration taken from first row
+        end_time: End time of each integration taken from first row
+    """
+
+    def __init__(self, start_time: np.ndarray, end_time: np.ndarray):
+        num_rows = len(start_time)
+        self.order = np.argsort(start_time, kind="stable")
+        sorted_time = start_time[self.order]
+        boundaries = np.flatnonzero(sorted_time[1:] != sorted_time[:-1]) + 1
+        self.starts = np.concatenate([[0], boundaries]) if num_rows > 0 else boundaries
+        self.ends = np.concatenate([boundaries, [num_rows]]) if num_rows > 0 else boundaries
+
+        self.unique_time = sorted_time[self.starts]
+        self.first_rows = self.order[self.starts]
+        self.time_index = np.empty(num_rows, dtype=int)
+        self.time_index[self.order] = np.repeat(np.arange(len(self.starts)), self.ends - self.starts)
+
+        self.start_time = start_time[self.first_rows]
+        self.end_time = end_time[self.first_rows]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def mid_time(self) -> np.ndarray:
+        return (self.start_time + self.end_time) / 2
+
+    @property
+    def interval(self) -> np.ndarray:
+        return self.end_time - self.start_time
+
+    @property
+    def is_time_ordered(self) -> bool:
+        """True if rows of each integration are contiguous and integrations are in time order."""
+        return bool(np.all(self.time_index[1:] >= self.time_index[:-1]))
+
+    def row_slice(self, integration: int) -> slice:
+        """Slice of order for given integration."""
+        return slice(self.starts[integration], self.ends[integration])
+
+    def rows(self, integration: int) -> np.ndarray:
+        """Rows of given integration in the original order."""
+        return self.order[self.row_slice(integration)]
+
+    def first_rows_where(self, mask: np.ndarray) -> np.ndarray:
+        """Find first row that satisfies the condition in each integration.
+
+        Args:
+            mask: Boolean array of the condition for each row
+
+        Returns:
+            Row index for each integration.
+            -1 if no row satisfies the condition in the integration.
+        """
+        positions = np.flatnonzero(mask[self.order])
+        integrations = self.time_index[self.order[positions]]
+        # integrations are sorted so that first position of each
+        # integration is where the integration changes
+        is_first = np.ones(len(positions), dtype=bool)
+        is_first[1:] = integrations[1:] != integrations[:-1]
+        row_map = np.full(len(self), -1, dtype=int)
+        row_map[integrations[is_first]] = self.order[positions[is_first]]
+        return row_map
+
 
 def fix_nrow_to(nrow: int, tb: _table) -> _table:
     nrow_current = tb.nrows()
@@ -27,12 +168,13 @@ def fix_nrow_to(nrow: int, tb: _table) -> _table:
     return tb
 
 
-def get_array_configuration(hdu: BinTableHDU):
+def get_array_configuration(hdu: PswTable):
     # return value
     # {(spw_id, pol_id): [(array, pol, beam), ...], ...}
     num_array = hdu.header["ARYNM"]
-    arryt = hdu.data["ARRYT"]
-    unique_array, array_index = np.unique(arryt, return_index=True)
+    arrays = _get_categorical(hdu.data, "ARRYT")
+    unique_array = arrays.categories
+    array_index = arrays.first_rows()
     assert len(unique_array) == num_array
     unique_array_id = np.array([int(x.lstrip("A")) for x in unique_array])
     LOG.debug("unique_array: %s", unique_array)
@@ -232,6 +374,70 @@ def get_data_description_map(array_conf: dict):
     return dd_dict, array_dd_map, spw_map, pol_map  # , array_beam_map
 
 
+def iter_time_blocks(num_time: int, start: int = 0) -> Generator[slice, None, None]:
+    """Split integrations into blocks of TIMES_PER_BLOCK.
+
+    Args:
+        num_time: Number of integrations
+        start: First integration of the first block. Default is 0.
+
+    Yields:
+        Slice of integrations in the block
+    """
+    for block_start in range(start, num_time, TIMES_PER_BLOCK):
+        yield slice(block_start, min(block_start + TIMES_PER_BLOCK, num_time))
+
+
+def rows_to_column_blocks(rows: list[dict]) -> Generator[ColumnBlock, None, None]:
+    """Convert table rows into column blocks.
+
+    Consecutive rows whose array values have the same shape are
+    gathered into one block.
+
+    Args:
+        rows: List of row dictionaries
+
+    Yields:
+        Column blocks
+    """
+
+    def _shapes(row: dict) -> tuple:
+        return tuple(np.shape(v) for v in row.values())
+
+    start = 0
+    while start < len(rows):
+        end = start + 1
+        while end < len(rows) and _shapes(rows[end]) == _shapes(rows[start]):
+            end += 1
+        columns = dict((key, np.array([row[key] for row in rows[start:end]])) for key in rows[start].keys())
+        yield ColumnBlock(columns, start_row=start)
+        start = end
+
+
+def put_column_block(tb: _table, block: ColumnBlock):
+    """Put column block to the table.
+
+    Rows are added to the table if necessary.
+
+    Args:
+        tb: Table opened for writing
+        block: Column block
+    """
+    num_rows = block.num_rows
+    if num_rows == 0:
+        return
+
+    last_row = block.start_row + (num_rows - 1) * block.row_increment
+    if tb.nrows() <= last_row:
+        tb.addrows(last_row + 1 - tb.nrows())
+
+    for key, value in block.columns.items():
+        LOG.debug("start_row %d key %s", block.start_row, key)
+        # FITS columns are big-endian
+        value = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("="))
+        put_column(tb, key, value, block.start_row, block.row_increment)
+
+
 def get_intent_map(scan_column: list[int], intent_column: list[str]) -> dict[str, int]:
     scan_intents, _indices = np.unique(intent_column, return_index=True)
     LOG.info("scan_intents %s, _indices %s", scan_intents, _indices)
@@ -280,53 +486,75 @@ def get_processor_map(arry1: str, arry2: str, arry3: str, arry4: str):
 
 def fill_ms_table(
         msfile: str,
-        hdu: BinTableHDU,
+        context: ConversionContext,
         table_name: str,
-        row_generator: Callable
+        row_generator: Callable,
+        num_rows: Optional[int] = None
 ):
     """Fill MS table.
 
+    Generator should follow either of the following protocols:
+
+      - yield row dictionary in order, which is put to the table
+        cell by cell. Rows are allocated at once after all rows
+        are generated, or,
+      - yield ColumnBlock, which is put to the table column by column.
+        Rows are allocated at once if num_rows is given. Otherwise,
+        rows are allocated for each block.
+
+    In both cases, the generator may return dictionary of column keywords
+    to be updated.
+
     Args:
         msfile: Name of MS file.
-        hdu: NRO45m psw data in the form of BinTableHDU object.
+        context: Conversion context of NRO45m psw data.
         table_name: Name of subtable or "MAIN" for MAIN table.
-        row_generator: Generator to yield table row.
+        row_generator: Generator to yield table row or column block.
+        num_rows: Total number of rows generated by column blocks.
+            Defaults to None (unknown).
     """
-    if table_name.upper() == "MAIN":
-        table_path = msfile
-    else:
-        table_path = f"{msfile}/{table_name.upper()}"
+    with open_ms_table(msfile, table_name) as tb:
+        if num_rows is not None:
+            fix_nrow_to(num_rows, tb)
 
-    with open_table(table_path, read_only=False) as tb:
         # iterator should provide row dictionary in order,
         # and then, if necessary, column keywords dictionary
         # should be returned additionally
-        iterator = enumerate(row_generator(hdu))
+        iterator = row_generator(context)
+        rows = []
         try:
             # fill table rows
             while True:
-                row_id, row = next(iterator)
-                if tb.nrows() <= row_id:
-                    tb.addrows(tb.nrows() - row_id + 1)
+                row = next(iterator)
+                if isinstance(row, ColumnBlock):
+                    put_column_block(tb, row)
+                    LOG.debug("%s table rows %d- (%d rows)", table_name, row.start_row, row.num_rows)
+                    continue
+
+                rows.append(row)
 
+        except StopIteration as s:
+            column_keywords = s.value
+
+        if rows:
+            fix_nrow_to(len(rows), tb)
+            for row_id, row in enumerate(rows):
                 for key, value in row.items():
                     LOG.debug("row %d key %s", row_id, key)
                     tb.putcell(key, row_id, value)
                 LOG.debug("%s table %d row %s", table_name, row_id, row)
 
-        except StopIteration as s:
-            # update column keywords if necessary
-            column_keywords = s.value
-            LOG.debug("return value: %s", s.value)
-            if isinstance(column_keywords, dict):
-                LOG.debug("column_keywords: %s", column_keywords)
-                for colname, colkeywords_new in column_keywords.items():
-                    colkeywords = tb.getcolkeywords(colname)
-                    for key, value_new in colkeywords_new.items():
-                        if key in colkeywords and isinstance(value_new, dict):
-                            LOG.debug("updating column keyword %s: %s, %s", colname, key, value_new)
-                            colkeywords[key].update(value_new)
-                        else:
-                            LOG.debug("adding column keyword %s: %s, %s", colname, key, value_new)
-                            colkeywords[key] = value_new
-                    tb.putcolkeywords(colname, colkeywords)
+        # update column keywords if necessary
+        LOG.debug("return value: %s", column_keywords)
+        if isinstance(column_keywords, dict):
+            LOG.debug("column_keywords: %s", column_keywords)
+            for colname, colkeywords_new in column_keywords.items():
+                colkeywords = tb.getcolkeywords(colname)
+                for key, value_new in colkeywords_new.items():
+                    if key in colkeywords and isinstance(value_new, dict):
+                        LOG.debug("updating column keyword %s: %s, %s", colname, key, value_new)
+                        colkeywords[key].update(value_new)
+                    else:
+                        LOG.debug("adding column keyword %s: %s, %s", colname, key, value_new)
+                        colkeywords[key] = value_new
+                tb.putcolkeywords(colname, colkeywords)
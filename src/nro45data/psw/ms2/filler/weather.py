@@ -5,74 +5,89 @@ from typing import TYPE_CHECKING, Generator
 
 import numpy as np
 
-from .._casa import open_table
+from .utils import ColumnBlock, fill_ms_table
 
 if TYPE_CHECKING:
-    import astropy.io.fits as fits
-    BinTableHDU = fits.BinTableHDU
+    from .context import ConversionContext
 
 LOG = logging.getLogger(__name__)
 
 
-def _get_weather_row(hdu: BinTableHDU) -> Generator[dict, None, None]:
-    multn = hdu.data['MULTN']
-    mjdst = hdu.data["MJDST"]
-    mjdet = hdu.data["MJDET"]
-    temp = hdu.data["TEMP"]
-    patm = hdu.data["PATM"]
-    vwind = hdu.data["VWIND"]
-    dwind = hdu.data["DWIND"]
+def _get_weather_rows(context: ConversionContext) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Get rows of psw data that provide weather data for each beam.
 
-    temp_unit = hdu.header["TUNIT56"]
-    if temp_unit == "C":
-        temp = temp.copy() + 273.16
+    Args:
+        context: Conversion context of NRO45m psw data.
 
+    Returns:
+        Beam numbers and, for each beam, rows of the first row of
+        each integration.
+    """
+    multn = context.hdu.data["MULTN"]
     unique_beams = np.unique(multn)
 
+    rows_per_beam = []
+    index = context.integration_index
     for beam in unique_beams:
-        beam_indices = np.where(multn == beam)[0]
-        _, _indices = np.unique(mjdst[beam_indices], return_index=True)
-        time_indices = beam_indices[_indices]
-        for i in time_indices:
-            antenna_id = int(beam)
-            weather_start_time = mjdst[i]
-            weather_end_time = mjdet[i]
-            weather_mid_time = (weather_start_time + weather_end_time) / 2
-            weather_interval = weather_end_time - weather_start_time
-
-            temperature = temp[i]
-
-            pressure = patm[i]
-
-            wind_speed = vwind[i]
-            wind_direction = dwind[i]
-
-            row = {
-                "ANTENNA_ID": antenna_id,
-                "TIME": weather_mid_time,
-                "INTERVAL": weather_interval,
-                "TEMPERATURE": temperature,
-                "TEMPERATURE_FLAG": False,
-                "PRESSURE": pressure,
-                "PRESSURE_FLAG": False,
-                "REL_HUMIDITY": 0.0,
-                "REL_HUMIDITY_FLAG": False,
-                "WIND_SPEED": wind_speed,
-                "WIND_SPEED_FLAG": False,
-                "WIND_DIRECTION": wind_direction,
-                "WIND_DIRECTION_FLAG": False,
+        beam_rows = index.first_rows_where(multn == beam)
+        rows_per_beam.append(beam_rows[beam_rows != -1])
+
+    return unique_beams, rows_per_beam
+
+
+def _get_weather_columns(context: ConversionContext) -> Generator[ColumnBlock, None, None]:
+    """Generate WEATHER table columns.
+
+    Weather data are taken from the first row of each integration
+    for each beam. Rows are ordered by beam and then by time, and
+    weather data are read chunk by chunk through context.iter_chunks.
+
+    Args:
+        context: Conversion context of NRO45m psw data.
+
+    Yields:
+        Column block for each beam and chunk
+    """
+    temp_unit = context.hdu.header["TUNIT56"]
+
+    unique_beams, rows_per_beam = _get_weather_rows(context)
+    beam_offsets = np.cumsum([0] + [len(r) for r in rows_per_beam])
+
+    for chunk in context.iter_chunks():
+        data = chunk.table.data
+        for beam, beam_rows, beam_offset in zip(unique_beams, rows_per_beam, beam_offsets):
+            start, rows = chunk.select(beam_rows)
+            num_rows = len(rows)
+            if num_rows == 0:
+                continue
+
+            weather_start_time = data["MJDST"][rows]
+            weather_end_time = data["MJDET"][rows]
+            temp = data["TEMP"][rows]
+            if temp_unit == "C":
+                temp = temp + 273.16
+            no_flag = np.zeros(num_rows, dtype=bool)
+
+            columns = {
+                "ANTENNA_ID": np.full(num_rows, int(beam), dtype=np.int32),
+                "TIME": (weather_start_time + weather_end_time) / 2,
+                "INTERVAL": weather_end_time - weather_start_time,
+                "TEMPERATURE": temp,
+                "TEMPERATURE_FLAG": no_flag,
+                "PRESSURE": data["PATM"][rows],
+                "PRESSURE_FLAG": no_flag,
+                "REL_HUMIDITY": np.zeros(num_rows, dtype=float),
+                "REL_HUMIDITY_FLAG": no_flag,
+                "WIND_SPEED": data["VWIND"][rows],
+                "WIND_SPEED_FLAG": no_flag,
+                "WIND_DIRECTION": data["DWIND"][rows],
+                "WIND_DIRECTION_FLAG": no_flag,
             }
 
-            yield row
+            yield ColumnBlock(columns, start_row=int(beam_offset) + start)
 
 
-def fill_weather(msfile: str, hdu: BinTableHDU):
-    row_iterator = _get_weather_row(hdu)
-    with open_table(msfile + "/WEATHER", read_only=False) as tb:
-        for row_id, row in enumerate(row_iterator):
-            if tb.nrows() <= row_id:
-                tb.addrows(tb.nrows() - row_id + 1)
-
-            for key, value in row.items():
-                tb.putcell(key, row_id, value)
-            LOG.debug("weather table %d row %s", row_id, row)
+def fill_weather(msfile: str, context: ConversionContext):
+    _, rows_per_beam = _get_weather_rows(context)
+    num_rows = sum(len(r) for r in rows_per_beam)
+    fill_ms_table(msfile, context, "WEATHER", _get_weather_columns, num_rows=num_rows)
@@ -4,6 +4,30 @@ import numpy as np
 import numpy.typing as npt
 
 
+@dataclass
+class DataManager:
+    """Data manager specification of the table.
+
+    For tiled storage managers, DEFAULTTILESHAPE in spec is given in
+    the order of axes of column values followed by row axis, e.g.
+    (npol, nchan, nrow) for FLOAT_DATA.
+
+    For virtual column engines, stored_columns maps name of the columns
+    that hold actual values to their column description.
+    """
+
+    name: str
+    type: str = "StandardStMan"
+    columns: list = field(default_factory=list)
+    spec: dict = field(default_factory=dict)
+    # columns required by virtual column engine, e.g. stored column of
+    # CompressFloat, which are added to the table description
+    stored_columns: dict = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {"NAME": self.name, "TYPE": self.type, "COLUMNS": list(self.columns), "SPEC": self.spec}
+
+
 @dataclass
 class StandardColumn:
     comment: str = ""
@@ -14,6 +38,20 @@ class StandardColumn:
     option: int = 0
 
 
+@dataclass
+class IncrementalColumn:
+    """Mixin to store column with IncrementalStMan.
+
+    IncrementalStMan stores values only when they change so that
+    it is suitable for columns that are constant or change rarely.
+    Mixin must precede the base column class, e.g.,
+    class XColumn(IncrementalColumn, ScalarColumn).
+    """
+
+    dataManagerGroup: str = "IncrementalStMan"
+    dataManagerType: str = "IncrementalStMan"
+
+
 @dataclass
 class ScalarColumn(StandardColumn):
     valueType: str = ""
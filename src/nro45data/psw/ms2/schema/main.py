@@ -6,6 +6,7 @@ from .column_description import (
     ArrayColumn,
     ChronoColumn,
     DurationColumn,
+    IncrementalColumn,
     PositionColumn,
     ScalarColumn,
 )
@@ -13,7 +14,7 @@ from .table import Table
 
 
 @dataclass
-class MsMainUvwColumn(PositionColumn):
+class MsMainUvwColumn(IncrementalColumn, PositionColumn):
     comment: str = "Vector with uvw coordinates (in meters)"
     keywords: dict = field(
         default_factory=lambda: {"MEASINFO": {"Ref": "ITRF", "type": "uvw"}, "QuantumUnits": np.array(["m", "m", "m"])}
@@ -58,13 +59,13 @@ class MsMainAntenna1Column(ScalarColumn):
 
 
 @dataclass
-class MsMainAntenna2Column(ScalarColumn):
+class MsMainAntenna2Column(IncrementalColumn, ScalarColumn):
     comment: str = "ID of second antenna in interferometer"
     valueType: str = "int"
 
 
 @dataclass
-class MsMainArrayIdColumn(ScalarColumn):
+class MsMainArrayIdColumn(IncrementalColumn, ScalarColumn):
     comment: str = "ID of array or subarray"
     valueType: str = "int"
 
@@ -81,19 +82,19 @@ class MsMainExposureColumn(DurationColumn):
 
 
 @dataclass
-class MsMainFeed1Column(ScalarColumn):
+class MsMainFeed1Column(IncrementalColumn, ScalarColumn):
     comment: str = "The feed index for ANTENNA1"
     valueType: str = "int"
 
 
 @dataclass
-class MsMainFeed2Column(ScalarColumn):
+class MsMainFeed2Column(IncrementalColumn, ScalarColumn):
     comment: str = "The feed index for ANTENNA2"
     valueType: str = "int"
 
 
 @dataclass
-class MsMainFieldIdColumn(ScalarColumn):
+class MsMainFieldIdColumn(IncrementalColumn, ScalarColumn):
     comment: str = "Unique id for this pointing"
     valueType: str = "int"
 
@@ -105,18 +106,18 @@ class MsMainFlagRowColumn(ScalarColumn):
 
 
 @dataclass
-class MsMainIntervalColumn(DurationColumn):
+class MsMainIntervalColumn(IncrementalColumn, DurationColumn):
     comment: str = "The sampling interval"
 
 
 @dataclass
-class MsMainObservationIdColumn(ScalarColumn):
+class MsMainObservationIdColumn(IncrementalColumn, ScalarColumn):
     comment: str = "ID for this observation, index in OBSERVATION table"
     valueType: str = "int"
 
 
 @dataclass
-class MsMainProcessorIdColumn(ScalarColumn):
+class MsMainProcessorIdColumn(IncrementalColumn, ScalarColumn):
     comment: str = "Id for backend processor, index in PROCESSOR table"
     valueType: str = "int"
 
@@ -150,6 +151,25 @@ class MsMainFloatDataColumn(ArrayColumn):
     ndim: int = 2
 
 
+@dataclass
+class MsMainCompressedFloatDataColumn(ArrayColumn):
+    comment: str = "FLOAT_DATA compressed by CompressFloat"
+    valueType: str = "short"
+    ndim: int = 2
+
+
+@dataclass
+class MsMainFloatDataScaleColumn(ScalarColumn):
+    comment: str = "Scale factor of compressed FLOAT_DATA"
+    valueType: str = "float"
+
+
+@dataclass
+class MsMainFloatDataOffsetColumn(ScalarColumn):
+    comment: str = "Offset of compressed FLOAT_DATA"
+    valueType: str = "float"
+
+
 @dataclass
 class MsMainTable(Table):
     ARRAY_ID: MsMainArrayIdColumn
@@ -0,0 +1,159 @@
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .column_description import DataManager
+from .main import (
+    MsMainCompressedFloatDataColumn,
+    MsMainFloatDataOffsetColumn,
+    MsMainFloatDataScaleColumn,
+)
+
+LOG = logging.getLogger(__name__)
+
+# storage profiles for data columns of MAIN table
+#   default: StandardStMan for all columns
+#   write-optimized: tile holds whole spectra of all polarizations so that
+#                    row-wise writes touch as few tiles as possible
+#   read-optimized: tile holds a channel range of single polarization so that
+#                   per-polarization and channel-slice reads are cheap
+#   compressed-lossy: FLOAT_DATA is a virtual column of CompressFloat engine
+#                     that stores each spectrum as 16-bit integers with scale
+#                     and offset. WARNING: it is lossy. Quantized spectra of
+#                     NRO 45m (LDATA) have up to 30 bits, which are
+#                     requantized into 16 bits so that the original values
+#                     are not recovered. Only for data that tolerates the
+#                     precision of about 1/65534 of the value range.
+STORAGE_PROFILES = ("default", "write-optimized", "read-optimized", "compressed-lossy")
+
+# target size of each tile in bytes
+TILE_SIZE = 128 * 1024
+
+# number of channels per tile for read-optimized profile
+READ_OPTIMIZED_CHANNELS = 128
+
+# columns stored in tiled storage manager
+TILED_COLUMNS = {
+    "FLOAT_DATA": "TiledFloatData",
+    "FLAG": "TiledFlag",
+}
+
+
+# virtual column of compressed profile and its stored columns
+COMPRESSED_COLUMN = "FLOAT_DATA"
+COMPRESSED_STORED_COLUMNS = {
+    "TARGETNAME": ("FLOAT_DATA_COMPRESSED", MsMainCompressedFloatDataColumn),
+    "SCALENAME": ("FLOAT_DATA_SCALE", MsMainFloatDataScaleColumn),
+    "OFFSETNAME": ("FLOAT_DATA_OFFSET", MsMainFloatDataOffsetColumn),
+}
+
+
+class DataShape(NamedTuple):
+    """Shape of data columns of MAIN table.
+
+    npol and nchan are the maximum among data descriptions.
+    Number of rows is not included so that tile shape, and therefore
+    template MS, is shared among files with different number of rows.
+    """
+
+    npol: int
+    nchan: int
+
+
+def get_tile_shape(storage_profile: str, data_shape: DataShape) -> tuple[int, int, int]:
+    """Compute tile shape for data columns.
+
+    Args:
+        storage_profile: Storage profile. See STORAGE_PROFILES.
+        data_shape: Shape of data columns.
+
+    Raises:
+        ValueError: storage_profile is not tiled one.
+
+    Returns:
+        Tile shape (npol, nchan, nrow)
+    """
+    npol, nchan = data_shape
+    if storage_profile == "write-optimized":
+        pol_per_tile = npol
+        chan_per_tile = nchan
+    elif storage_profile == "read-optimized":
+        pol_per_tile = 1
+        chan_per_tile = min(nchan, READ_OPTIMIZED_CHANNELS)
+    else:
+        raise ValueError(f"Storage profile {storage_profile} doesn't use tiled storage manager")
+
+    # 4 bytes per element for float. row_per_tile is not clamped by
+    # number of rows of the data so that every small file gets the same
+    # tile shape.
+    row_per_tile = TILE_SIZE // (pol_per_tile * chan_per_tile * np.dtype(np.float32).itemsize)
+    row_per_tile = max(1, row_per_tile)
+
+    return pol_per_tile, chan_per_tile, row_per_tile
+
+
+def get_data_managers(storage_profile: str, data_shape: Optional[DataShape] = None) -> list[DataManager]:
+    """Get data manager specification for MAIN table.
+
+    Args:
+        storage_profile: Storage profile. See STORAGE_PROFILES.
+        data_shape: Shape of data columns. Required for tiled profiles,
+            "write-optimized" and "read-optimized".
+
+    Raises:
+        ValueError: Invalid storage profile or missing data shape.
+
+    Returns:
+        List of data managers. Empty list for default profile.
+    """
+    if storage_profile not in STORAGE_PROFILES:
+        raise ValueError(f"Invalid storage profile {storage_profile}. Should be one of {STORAGE_PROFILES}")
+
+    if storage_profile == "default":
+        return []
+
+    if storage_profile == "compressed-lossy":
+        LOG.warning("storage profile %s requantizes FLOAT_DATA into 16-bit integers. It is lossy.", storage_profile)
+        return [get_compressed_data_manager()]
+
+    if data_shape is None:
+        raise ValueError(f"Data shape is required for storage profile {storage_profile}")
+
+    # TiledShapeStMan is used instead of TiledColumnStMan since
+    # the shape of data columns varies with data description
+    tile_shape = get_tile_shape(storage_profile, data_shape)
+    LOG.info("storage profile %s: tile shape %s", storage_profile, tile_shape)
+    return [
+        DataManager(
+            name=group,
+            type="TiledShapeStMan",
+            columns=[column_name],
+            spec={"DEFAULTTILESHAPE": np.array(tile_shape, dtype=np.int32)},
+        )
+        for column_name, group in TILED_COLUMNS.items()
+    ]
+
+
+def get_compressed_data_manager() -> DataManager:
+    """Get CompressFloat engine specification for FLOAT_DATA.
+
+    Scale and offset of each row are computed automatically
+    when FLOAT_DATA is put to the table. Note that FLOAT_DATA is
+    requantized into 16-bit integers so that it is lossy.
+
+    Returns:
+        Data manager of virtual FLOAT_DATA column
+    """
+    spec = {"SOURCENAME": COMPRESSED_COLUMN, "AUTOSCALE": True}
+    stored_columns = {}
+    for key, (column_name, column_type) in COMPRESSED_STORED_COLUMNS.items():
+        spec[key] = column_name
+        stored_columns[column_name] = column_type()
+    return DataManager(
+        name="CompressedFloatData",
+        type="CompressFloat",
+        columns=[COMPRESSED_COLUMN],
+        spec=spec,
+        stored_columns=stored_columns,
+    )
@@ -1,7 +1,21 @@
 from dataclasses import asdict, fields
+from typing import Optional
+
+from .column_description import DataManager
 
 
 class Table:
     @classmethod
-    def as_dict(cls):
-        return dict((f.name, asdict(f.type())) for f in fields(cls))
+    def as_dict(cls, data_managers: Optional[list[DataManager]] = None):
+        table_desc = dict((f.name, asdict(f.type())) for f in fields(cls))
+        for dm in data_managers or []:
+            for column_name, column in dm.stored_columns.items():
+                table_desc[column_name] = asdict(column)
+            for column_name in dm.columns:
+                table_desc[column_name]["dataManagerType"] = dm.type
+                table_desc[column_name]["dataManagerGroup"] = dm.name
+        return table_desc
+
+    @classmethod
+    def dminfo(cls, data_managers: Optional[list[DataManager]] = None) -> dict:
+        return dict((f"*{i + 1}", dm.as_dict()) for i, dm in enumerate(data_managers or []))
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+from typing import TYPE_CHECKING, Generator, Optional
+
+from ._casa import create_table, open_table, open_table_tool
+
+if TYPE_CHECKING:
+    from ._casa import _table
+
+LOG = logging.getLogger(__name__)
+
+# lock mode of tables during write session:
+# lock is acquired once (wait if necessary) and held until tables are closed
+SESSION_LOCK_MODE = "permanentwait"
+
+# active write sessions keyed by absolute path of MS
+_active_sessions: dict[str, MsWriteSession] = {}
+
+
+def _table_path(msfile: str, table_name: str) -> str:
+    if table_name.upper() == "MAIN":
+        return msfile
+    else:
+        return os.path.join(msfile, table_name.upper())
+
+
+class MsWriteSession:
+    """Exclusive write session of MS.
+
+    Every table of MS is opened (or created) once with permanent lock
+    and the table tool is reused until the session is closed. Tables
+    are flushed only when the session is closed. This avoids repeated
+    open/close and lock-file handling during build and fill of MS.
+
+    While the session is active, build_ms2 and MS fillers use the tables
+    of the session. The session is only valid in the process that created
+    it. Tables that should be accessed from other processes must be
+    released beforehand.
+
+    Usage:
+        with MsWriteSession(msfile):
+            build_ms2(msfile)
+            fill_ms2(msfile, hdu)
+
+    Args:
+        msfile: Name of MS file.
+    """
+
+    def __init__(self, msfile: str):
+        self.msfile = msfile
+        self._key = os.path.abspath(msfile)
+        self._pid = os.getpid()
+        self._tables: dict[str, _table] = {}
+
+    def __enter__(self) -> MsWriteSession:
+        if self._key in _active_sessions:
+            raise RuntimeError(f"Write session for {self.msfile} is already active")
+        _active_sessions[self._key] = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_active(self) -> bool:
+        return _active_sessions.get(self._key) is self and self._pid == os.getpid()
+
+    def create_table(self, table_name: str, table_desc: dict, dminfo: Optional[dict] = None) -> _table:
+        """Create new table and keep it open.
+
+        Args:
+            table_name: Name of subtable or "MAIN" for MAIN table.
+            table_desc: Table description
+            dminfo: Data manager information
+
+        Returns:
+            Table tool
+        """
+        key = table_name.upper()
+        if key in self._tables:
+            self._tables.pop(key).close()
+        tb = create_table(_table_path(self.msfile, key), table_desc, dminfo, lock_mode=SESSION_LOCK_MODE)
+        self._tables[key] = tb
+        return tb
+
+    def get_table(self, table_name: str) -> _table:
+        """Get table tool opened for writing.
+
+        Args:
+            table_name: Name of subtable or "MAIN" for MAIN table.
+
+        Returns:
+            Table tool
+        """
+        key = table_name.upper()
+        if key not in self._tables:
+            path = _table_path(self.msfile, key)
+            self._tables[key] = open_table_tool(path, read_only=False, lock_mode=SESSION_LOCK_MODE)
+        return self._tables[key]
+
+    def release(self, table_name: str):
+        """Close table so that other processes can access it.
+
+        Table is opened again if it is requested later.
+
+        Args:
+            table_name: Name of subtable or "MAIN" for MAIN table.
+        """
+        tb = self._tables.pop(table_name.upper(), None)
+        if tb is not None:
+            tb.close()
+
+    def close(self):
+        """Flush and close all tables, and end the session."""
+        if self._pid != os.getpid():
+            # tables belong to the parent process
+            return
+
+        try:
+            while self._tables:
+                _, tb = self._tables.popitem()
+                tb.close()
+        finally:
+            if _active_sessions.get(self._key) is self:
+                del _active_sessions[self._key]
+
+
+def get_active_session(msfile: str) -> Optional[MsWriteSession]:
+    """Get active write session of MS in this process.
+
+    Args:
+        msfile: Name of MS file.
+
+    Returns:
+        Write session or None if no session is active.
+    """
+    session = _active_sessions.get(os.path.abspath(msfile))
+    if session is not None and session.is_active:
+        return session
+    return None
+
+
+@contextlib.contextmanager
+def open_ms_table(msfile: str, table_name: str) -> Generator[_table, None, None]:
+    """Open MS table for writing.
+
+    Table of active write session is used if available.
+    Otherwise, table is opened and closed as usual.
+
+    Args:
+        msfile: Name of MS file.
+        table_name: Name of subtable or "MAIN" for MAIN table.
+
+    Yields:
+        Table tool
+    """
+    session = get_active_session(msfile)
+    if session is None:
+        with open_table(_table_path(msfile, table_name), read_only=False) as tb:
+            yield tb
+    else:
+        yield session.get_table(table_name)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Optional
+
+import numpy as np
+
+from ._casa import BACKEND
+from .builder import SUBTABLES, build_ms2
+from .schema.main import MsMainTable
+from .schema.storage import DataShape, get_data_managers
+
+LOG = logging.getLogger(__name__)
+
+# version of template layout. Increment to invalidate existing templates
+# when MS is built differently without any change of the schema.
+TEMPLATE_VERSION = 1
+
+# environment variable to override cache directory
+CACHE_DIR_ENV = "NRO45DATA_CACHE_DIR"
+
+# maximum number of templates kept in cache directory. Least recently
+# used templates are removed when a new template is built.
+MAX_TEMPLATES = 16
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@functools.lru_cache(maxsize=None)
+def get_template_key(storage_profile: str = "default", data_shape: Optional[DataShape] = None) -> str:
+    """Compute key of template MS.
+
+    Key is a hash of table descriptions and data manager information
+    of all tables as well as casa backend, so that template is rebuilt
+    whenever the schema changes.
+
+    Args:
+        storage_profile: Storage profile of data columns of MAIN table.
+        data_shape: Shape of data columns. See build_ms2.
+
+    Returns:
+        Key of template MS
+    """
+    data_managers = get_data_managers(storage_profile, data_shape)
+    schema = {
+        "version": TEMPLATE_VERSION,
+        "backend": BACKEND,
+        "MAIN": [MsMainTable.as_dict(data_managers), MsMainTable.dminfo(data_managers)],
+        "subtables": [[name, table_schema.as_dict()] for name, table_schema in SUBTABLES],
+    }
+    serialized = json.dumps(schema, sort_keys=True, default=_to_json)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+def get_cache_dir() -> str:
+    """Get directory to store template MS.
+
+    The directory is taken from NRO45DATA_CACHE_DIR environment variable
+    if set. Otherwise, nro45data/ms2_templates under user cache directory
+    (XDG_CACHE_HOME or ~/.cache) is used.
+
+    Returns:
+        Name of cache directory
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(cache_home, "nro45data")
+    return os.path.join(cache_dir, "ms2_templates")
+
+
+def get_template(storage_profile: str = "default", data_shape: Optional[DataShape] = None) -> str:
+    """Get template MS, building it if necessary.
+
+    Template is built in a staging directory and then renamed so that
+    concurrent processes never see incomplete template.
+
+    Args:
+        storage_profile: Storage profile of data columns of MAIN table.
+        data_shape: Shape of data columns. See build_ms2.
+
+    Raises:
+        OSError: Failed to build template in cache directory
+
+    Returns:
+        Name of template MS
+    """
+    cache_dir = get_cache_dir()
+    template = os.path.join(cache_dir, f"{get_template_key(storage_profile, data_shape)}.ms")
+    if os.path.isdir(template):
+        _touch(template)
+        return template
+
+    os.makedirs(cache_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".staging.", dir=cache_dir)
+    try:
+        staging = os.path.join(staging_dir, "template.ms")
+        build_ms2(staging, storage_profile, data_shape)
+        try:
+            os.rename(staging, template)
+            LOG.info("created template MS %s", template)
+        except OSError:
+            # template has been created by another process
+            if not os.path.isdir(template):
+                raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    _evict_templates(cache_dir)
+    return template
+
+
+def _touch(template: str):
+    """Mark template as recently used."""
+    try:
+        os.utime(template)
+    except OSError:
+        # template may be removed by another process
+        pass
+
+
+def _evict_templates(cache_dir: str, max_templates: Optional[int] = None):
+    """Remove least recently used templates from cache directory.
+
+    Template is renamed into a staging directory before removal so that
+    other processes never see partially removed template.
+
+    Args:
+        cache_dir: Cache directory
+        max_templates: Number of templates to keep. Defaults to MAX_TEMPLATES.
+    """
+    if max_templates is None:
+        max_templates = MAX_TEMPLATES
+
+    templates = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".ms") and entry.is_dir(follow_symlinks=False):
+            try:
+                templates.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+
+    templates.sort(reverse=True)
+    for _, template in templates[max_templates:]:
+        staging_dir = tempfile.mkdtemp(prefix=".staging.", dir=cache_dir)
+        try:
+            os.rename(template, os.path.join(staging_dir, "template.ms"))
+            LOG.info("removed template MS %s", template)
+        except OSError:
+            # template has been removed by another process
+            pass
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def build_ms2_from_template(msfile: str, storage_profile: str = "default", data_shape: Optional[DataShape] = None):
+    """Build empty MS by copying cached template MS.
+
+    Template is built by build_ms2 on first use. If template is not
+    available, e.g. cache directory is not writable, MS is built
+    from scratch by build_ms2.
+
+    Args:
+        msfile: Name of MS file.
+        storage_profile: Storage profile of data columns of MAIN table.
+        data_shape: Shape of data columns. See build_ms2.
+    """
+    try:
+        template = get_template(storage_profile, data_shape)
+    except OSError as e:
+        LOG.warning("template MS is not available (%s). Build MS from scratch.", e)
+        build_ms2(msfile, storage_profile, data_shape)
+        return
+
+    try:
+        shutil.copytree(template, msfile)
+    except OSError as e:
+        # template has been removed by another process during copy
+        LOG.warning("failed to copy template MS (%s). Build MS from scratch.", e)
+        shutil.rmtree(msfile, ignore_errors=True)
+        build_ms2(msfile, storage_profile, data_shape)
+        return
+
+    LOG.info("created %s from template %s", msfile, template)
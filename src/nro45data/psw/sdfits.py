@@ -0,0 +1,212 @@
+import logging
+import os
+from typing import TYPE_CHECKING, List
+
+import astropy.io.fits as fits
+import numpy as np
+from astropy.time import Time
+
+from .frequency import _get_frequency_axis
+
+if TYPE_CHECKING:
+    from .io import PswTable
+
+LOG = logging.getLogger(__name__)
+
+# columns of PSW data required to build SDFITS table
+SDFITS_SOURCE_COLUMNS = (
+    "ISCN",
+    "MJDST",
+    "MJDET",
+    "SCNTP",
+    "RA",
+    "DEC",
+    "AZ",
+    "EL",
+    "RX",
+    "SIDBD",
+    "POLTP",
+    "TSYS",
+    "F0CAL",
+    "ARRYT",
+    "MULTN",
+    "BEBW",
+    "BERES",
+    "CHWID",
+    "NCH",
+    "SFCTR",
+    "ADOFF",
+    "LDATA",
+)
+
+# number of rows decoded at once to bound temporary memory
+DECODE_ROWS_PER_BLOCK = 4096
+
+# polarization type to Stokes code defined in FITS standard
+FITS_STOKES_CODE = {
+    "R": -1,
+    "L": -2,
+    "H": -5,
+    "V": -6,
+}
+
+
+def _decode_spectra(ldata: np.ndarray, sfctr: np.ndarray, adoff: np.ndarray, nch: np.ndarray) -> np.ndarray:
+    """Decode quantized spectra into float32.
+
+    Spectra are decoded as SFCTR * LDATA + ADOFF in double precision
+    and then stored in single precision. Channels beyond NCH are
+    filled with NaN.
+
+    Args:
+        ldata: Quantized spectra (nrow, nchan)
+        sfctr: Scaling factor (nrow,)
+        adoff: Offset (nrow,)
+        nch: Number of valid channels (nrow,)
+
+    Returns:
+        Decoded spectra (nrow, nchan)
+    """
+    nrow, nchan = ldata.shape
+    spectra = np.empty((nrow, nchan), dtype=np.float32)
+    for start in range(0, nrow, DECODE_ROWS_PER_BLOCK):
+        end = min(start + DECODE_ROWS_PER_BLOCK, nrow)
+        block = slice(start, end)
+        spectra[block] = ldata[block] * sfctr[block, np.newaxis] + adoff[block, np.newaxis]
+
+    spectra[np.arange(nchan) >= nch[:, np.newaxis]] = np.nan
+
+    return spectra
+
+
+def _get_stokes_code(poltp: np.ndarray, rx: np.ndarray) -> np.ndarray:
+    """Get Stokes code of each row.
+
+    Polarization type is taken from POLTP or, if POLTP is empty
+    throughout the data, from the last character of RX as in
+    get_array_configuration.
+
+    Args:
+        poltp: POLTP column
+        rx: RX column
+
+    Returns:
+        Stokes code. 0 if polarization type is unknown.
+    """
+    pol_spec = rx if np.all(poltp == "") else poltp
+    codes = np.zeros(len(pol_spec), dtype=np.int32)
+    for pol in np.unique(pol_spec):
+        code = FITS_STOKES_CODE.get(pol[-1:], 0)
+        if code == 0:
+            LOG.warning("Unknown polarization type: %s", pol)
+        codes[pol_spec == pol] = code
+
+    return codes
+
+
+def _string_column(name: str, values: np.ndarray) -> fits.Column:
+    """Make fixed-width string column."""
+    width = max(int(np.char.str_len(values).max(initial=1)), 1)
+    return fits.Column(name=name, format=f"{width}A", array=values)
+
+
+def _build_sdfits_columns(table: "PswTable") -> List[fits.Column]:
+    """Build columns of SDFITS binary table.
+
+    Args:
+        table: Data table generated from NRO 45m PSW file (.nqm)
+
+    Returns:
+        List of columns
+    """
+    data = table.data
+
+    mjdst = data["MJDST"]
+    mjdet = data["MJDET"]
+    time = (mjdst + mjdet) / 2
+    exposure = mjdet - mjdst
+    date_obs = Time(time / 86400, format="mjd", scale="utc").isot
+
+    crpix, crval, cdelt = _get_frequency_axis(table)
+    stokes = _get_stokes_code(data["POLTP"], data["RX"])
+    spectra = _decode_spectra(data["LDATA"], data["SFCTR"], data["ADOFF"], data["NCH"])
+    nchan = spectra.shape[1]
+
+    return [
+        fits.Column(name="SCAN", format="J", array=data["ISCN"]),
+        _string_column("OBSMODE", data["SCNTP"]),
+        _string_column("ARRAY", data["ARRYT"]),
+        fits.Column(name="BEAM", format="J", array=data["MULTN"]),
+        _string_column("DATE-OBS", date_obs),
+        fits.Column(name="TIME", format="D", unit="s", array=time),
+        fits.Column(name="EXPOSURE", format="D", unit="s", array=exposure),
+        fits.Column(name="TSYS", format="E", unit="K", array=data["TSYS"]),
+        fits.Column(name="BANDWID", format="D", unit="Hz", array=data["BEBW"]),
+        fits.Column(name="FREQRES", format="D", unit="Hz", array=data["BERES"]),
+        fits.Column(name="NCHAN", format="J", array=data["NCH"]),
+        fits.Column(name="CRPIX1", format="D", array=crpix),
+        fits.Column(name="CRVAL1", format="D", unit="Hz", array=crval),
+        fits.Column(name="CDELT1", format="D", unit="Hz", array=cdelt),
+        fits.Column(name="CRVAL2", format="D", unit="deg", array=np.degrees(data["RA"])),
+        fits.Column(name="CRVAL3", format="D", unit="deg", array=np.degrees(data["DEC"])),
+        fits.Column(name="CRVAL4", format="J", array=stokes),
+        fits.Column(name="AZIMUTH", format="D", unit="deg", array=np.degrees(data["AZ"])),
+        fits.Column(name="ELEVATIO", format="D", unit="deg", array=np.degrees(data["EL"])),
+        fits.Column(name="DATA", format=f"{nchan}E", array=spectra),
+    ]
+
+
+def _build_sdfits_hdu(table: "PswTable") -> fits.BinTableHDU:
+    """Build SDFITS binary table HDU.
+
+    Axes that are constant throughout the data, i.e. CTYPEn, are
+    given as header keywords as allowed in SDFITS convention.
+
+    Args:
+        table: Data table generated from NRO 45m PSW file (.nqm)
+
+    Returns:
+        SDFITS binary table HDU
+    """
+    hdu = fits.BinTableHDU.from_columns(_build_sdfits_columns(table), name="SINGLE DISH")
+
+    header = table.header
+    hdu.header["NMATRIX"] = (1, "Number of DATA arrays")
+    hdu.header["TELESCOP"] = str(header.get("TELESCOP", "")).strip()
+    hdu.header["OBSERVER"] = str(header.get("OBSERVER", "")).strip()
+    hdu.header["OBJECT"] = str(header.get("OBJECT", "")).strip()
+    hdu.header["EQUINOX"] = float(header.get("EPOCH", 2000.0))
+    hdu.header["SPECSYS"] = ("LSRK", "Reference frame of frequency axis")
+    hdu.header["CTYPE1"] = "FREQ"
+    hdu.header["CTYPE2"] = "RA"
+    hdu.header["CTYPE3"] = "DEC"
+    hdu.header["CTYPE4"] = "STOKES"
+
+    return hdu
+
+
+def _to_sdfits(table: "PswTable", sdfitsfile: str, overwrite: bool = False) -> bool:
+    """Export PSW data table to SDFITS.
+
+    Args:
+        table: Data table generated from NRO 45m PSW file (.nqm)
+        sdfitsfile: Output SDFITS file name
+        overwrite: Overwrite existing output file or not.
+            Default is False (not overwrite).
+
+    Returns:
+        Export status. True is successful.
+    """
+    status = True
+
+    try:
+        if os.path.exists(sdfitsfile) and not overwrite:
+            raise FileExistsError(f"File {sdfitsfile!r} already exists. Set overwrite=True to overwrite it.")
+
+        hdulist = fits.HDUList([fits.PrimaryHDU(), _build_sdfits_hdu(table)])
+        hdulist.writeto(sdfitsfile, overwrite=overwrite)
+    except Exception as e:
+        print(e)
+        status = False
+
+    return status
@@ -37,3 +37,16 @@ def unit_test_mocks(monkeypatch: None):
 def data_dir() -> str:
     """Return the path to the data directory."""
     return os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ms2_template_cache(tmp_path_factory):
+    """Keep template MS in temporary directory instead of user cache."""
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    original = os.environ.get("NRO45DATA_CACHE_DIR")
+    os.environ["NRO45DATA_CACHE_DIR"] = cache_dir
+    yield cache_dir
+    if original is None:
+        del os.environ["NRO45DATA_CACHE_DIR"]
+    else:
+        os.environ["NRO45DATA_CACHE_DIR"] = original
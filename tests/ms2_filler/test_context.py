@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2.builder import build_ms2
+from nro45data.psw.ms2.filler import context as context_module
+from nro45data.psw.ms2.filler import fill_ms2
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.filler.utils import get_array_configuration, get_intent_map
+
+
+@pytest.fixture(scope="module", params=["nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"])
+def table(data_dir, request):
+    return _read_psw_table(os.path.join(data_dir, request.param))
+
+
+def test_context_values(table):
+    context = ConversionContext(table)
+    assert context.array_conf == get_array_configuration(table)
+    assert context.beam_list == sorted(set(table.data["MULTN"]))
+
+    intent_map = get_intent_map(table.data["ISCN"], table.data["SCNTP"])
+    assert context.intent_map == intent_map
+    np.testing.assert_array_equal(context.state_ids, [intent_map[x] for x in table.data["SCNTP"]])
+
+    index = context.integration_index
+    np.testing.assert_array_equal(index.unique_time[index.time_index], table.data["MJDST"])
+    np.testing.assert_array_equal(table.data["MJDST"][index.first_rows], index.unique_time)
+    unique_time, time_index = index.unique_time, index.time_index
+
+    for key, conf in context.array_conf.items():
+        rows = context.array_rows[key]
+        assert rows.shape == (len(unique_time), len(conf[3]))
+        for ipol, array in enumerate(conf[3]):
+            valid = rows[:, ipol] != -1
+            assert np.all(table.data["ARRYT"][rows[valid, ipol]] == array)
+            assert np.all(time_index[rows[valid, ipol]] == np.arange(len(unique_time))[valid])
+
+
+def test_context_iter_chunks(table):
+    # whole data is a single chunk unless context is associated with the file
+    context = ConversionContext(table)
+    chunks = list(context.iter_chunks())
+    assert len(chunks) == 1
+    assert chunks[0].table is table
+    assert chunks[0].row_offset == 0
+    assert chunks[0].integrations == slice(0, len(context.integration_index))
+
+
+@pytest.mark.parametrize("rows_per_chunk", [1, 5, 1000])
+def test_context_iter_chunks_from_file(data_dir, rows_per_chunk):
+    path = os.path.join(data_dir, "nmlzrf.241001030006.01.nqm")
+    table = _read_psw_table(path)
+    context = ConversionContext.from_file(path, rows_per_chunk=rows_per_chunk)
+    assert context.filename == path
+    assert "LDATA" not in context.hdu.data
+
+    time_index = context.integration_index.time_index
+    row_offset = 0
+    integration = 0
+    for chunk in context.iter_chunks():
+        num_rows = len(chunk.table)
+        assert chunk.row_offset == row_offset
+        assert chunk.integrations.start == integration
+        # integrations are not split among chunks
+        np.testing.assert_array_equal(
+            np.unique(time_index[row_offset : row_offset + num_rows]),
+            np.arange(chunk.integrations.start, chunk.integrations.stop),
+        )
+        expected = table.data["LDATA"][row_offset : row_offset + num_rows]
+        np.testing.assert_array_equal(chunk.table.data["LDATA"], expected)
+        row_offset += num_rows
+        integration = chunk.integrations.stop
+    assert row_offset == len(table)
+    assert integration == len(context.integration_index)
+
+
+def test_context_cached(table):
+    context = ConversionContext(table)
+    assert context.array_conf is context.array_conf
+    assert context.data_description_map is context.data_description_map
+    assert context.array_rows is context.array_rows
+
+
+def test_fill_ms2_derives_once(table, tmp_path, monkeypatch):
+    counts = {}
+
+    def counted(func):
+        def wrapper(*args, **kwargs):
+            counts[func.__name__] = counts.get(func.__name__, 0) + 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name in ("get_array_configuration", "get_data_description_map", "get_processor_map"):
+        monkeypatch.setattr(context_module, name, counted(getattr(context_module, name)))
+
+    msfile = str(tmp_path / "test.ms")
+    build_ms2(msfile)
+    fill_ms2(msfile, table)
+
+    assert counts == {
+        "get_array_configuration": 1,
+        "get_data_description_map": 1,
+        "get_processor_map": 1,
+    }
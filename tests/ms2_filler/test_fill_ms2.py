@@ -0,0 +1,110 @@
+import gzip
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import nro45data.psw.ms2.filler as filler
+from nro45data.psw.io import _read_psw, _read_psw_table
+from nro45data.psw.ms2._casa import open_table
+from nro45data.psw.ms2.builder import build_ms2
+from nro45data.psw.ms2.filler.context import ConversionContext
+
+# columns to compare between sequential and concurrent filling
+COLUMNS = {
+    "": ["TIME", "DATA_DESC_ID", "FLOAT_DATA", "FLAG"],
+    "ANTENNA": ["NAME"],
+    "DATA_DESCRIPTION": ["SPECTRAL_WINDOW_ID", "POLARIZATION_ID"],
+    "POINTING": ["TIME", "DIRECTION"],
+    "POLARIZATION": ["CORR_TYPE"],
+    "SPECTRAL_WINDOW": ["NAME", "CHAN_FREQ"],
+    "STATE": ["OBS_MODE"],
+    "SYSCAL": ["TIME", "TSYS_SPECTRUM"],
+    "WEATHER": ["TIME", "TEMPERATURE"],
+}
+
+
+@pytest.fixture(scope="module")
+def nqmpath(data_dir):
+    return os.path.join(data_dir, "nmlzrf.241001030006.01.nqm")
+
+
+@pytest.fixture(scope="module")
+def table(nqmpath):
+    return _read_psw_table(nqmpath)
+
+
+def _fill(table, msfile, jobs, context=None):
+    build_ms2(msfile)
+    filler.fill_ms2(msfile, table, context=context, jobs=jobs)
+
+
+def _assert_columns_equal(expected_ms, actual_ms):
+    for subtable_name, columns in COLUMNS.items():
+        with open_table(os.path.join(expected_ms, subtable_name)) as tb0, open_table(
+            os.path.join(actual_ms, subtable_name)
+        ) as tb1:
+            assert tb1.nrows() > 0
+            assert tb1.nrows() == tb0.nrows(), subtable_name
+            for column_name in columns:
+                for row in range(tb0.nrows()):
+                    np.testing.assert_array_equal(tb1.getcell(column_name, row), tb0.getcell(column_name, row))
+
+
+def test_fill_ms2_concurrent(table, tmp_path):
+    sequential = str(tmp_path / "sequential.ms")
+    concurrent = str(tmp_path / "concurrent.ms")
+    _fill(table, sequential, jobs=1)
+    _fill(table, concurrent, jobs=3)
+
+    for subtable_name in filler.SUBTABLE_FILLERS:
+        with open_table(concurrent) as tb:
+            assert tb.getkeyword(subtable_name) == f"Table: {os.path.join(concurrent, subtable_name)}"
+
+        with open_table(os.path.join(sequential, subtable_name)) as tb:
+            num_rows = tb.nrows()
+        with open_table(os.path.join(concurrent, subtable_name)) as tb:
+            assert tb.nrows() == num_rows, subtable_name
+
+    _assert_columns_equal(sequential, concurrent)
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_fill_ms2_chunked(nqmpath, table, tmp_path, compressed):
+    if compressed:
+        path = str(tmp_path / "data.nqm.gz")
+        with open(nqmpath, "rb") as fin, gzip.open(path, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+    else:
+        path = nqmpath
+
+    context = ConversionContext.from_file(path, rows_per_chunk=5)
+    assert "LDATA" not in context.hdu.data
+    assert len(list(context.iter_chunks())) > 1
+
+    expected = str(tmp_path / "whole.ms")
+    chunked = str(tmp_path / "chunked.ms")
+    _fill(table, expected, jobs=1)
+    _fill(context.hdu, chunked, jobs=1, context=context)
+    _assert_columns_equal(expected, chunked)
+
+
+def test_fill_ms2_astropy_hdu(nqmpath, table, tmp_path):
+    # BinTableHDU has no categorical accessor
+    hdu = _read_psw(nqmpath)[0]
+    expected = str(tmp_path / "psw_table.ms")
+    actual = str(tmp_path / "astropy.ms")
+    _fill(table, expected, jobs=1)
+    _fill(hdu, actual, jobs=1)
+    _assert_columns_equal(expected, actual)
+
+
+def test_fill_ms2_concurrent_error(table, tmp_path, monkeypatch):
+    def fail(msfile, context):
+        raise RuntimeError("failed to fill STATE")
+
+    monkeypatch.setitem(filler.SUBTABLE_FILLERS, "STATE", fail)
+    with pytest.raises(RuntimeError, match="failed to fill STATE"):
+        _fill(table, str(tmp_path / "concurrent.ms"), jobs=2)
+    assert filler._worker_context is None
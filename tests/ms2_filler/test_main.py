@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2.filler import utils
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.filler.main import _get_main_columns
+from nro45data.psw.ms2.filler.utils import get_array_configuration
+
+
+@pytest.fixture(scope="module", params=["nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"])
+def table(data_dir, request):
+    return _read_psw_table(os.path.join(data_dir, request.param))
+
+
+def _collect(table):
+    num_rows = 0
+    collected = {}
+    for block in _get_main_columns(ConversionContext(table)):
+        for key, value in block.columns.items():
+            for i, v in enumerate(value):
+                # copy since data buffers are reused among blocks
+                collected.setdefault(key, {})[block.start_row + i * block.row_increment] = np.array(v)
+        num_rows = max(num_rows, block.start_row + (block.num_rows - 1) * block.row_increment + 1)
+    return num_rows, collected
+
+
+def test_main_columns_cover_all_rows(table):
+    num_rows, collected = _collect(table)
+    assert num_rows == len(np.unique(table.data["MJDST"])) * len(get_array_configuration(table))
+    for key, values in collected.items():
+        assert sorted(values.keys()) == list(range(num_rows)), key
+
+
+def test_main_columns_block_size(table, monkeypatch):
+    num_rows, expected = _collect(table)
+    monkeypatch.setattr(utils, "TIMES_PER_BLOCK", 5)
+    num_rows_small, actual = _collect(table)
+    assert num_rows_small == num_rows
+    for key in expected:
+        for row in range(num_rows):
+            np.testing.assert_array_equal(actual[key][row], expected[key][row])
+
+
+def test_main_columns_values(table):
+    data = table.data
+    _, collected = _collect(table)
+    for row, float_data in collected["FLOAT_DATA"].items():
+        flag = collected["FLAG"][row]
+        assert float_data.shape == flag.shape
+        assert np.all(float_data[flag] == 0)
+        sigma = collected["SIGMA"][row]
+        weight = collected["WEIGHT"][row]
+        np.testing.assert_allclose(weight[sigma != 0], 1 / sigma[sigma != 0].astype(float) ** 2, rtol=1e-6)
+        assert collected["EXPOSURE"][row] == (collected["INTERVAL"][row] if not np.all(flag) else 0)
+
+    # decoded spectra are found in the input
+    decoded = data["SFCTR"][:, np.newaxis] * data["LDATA"] + data["ADOFF"][:, np.newaxis]
+    decoded = decoded.astype(np.float32)
+    float_data = collected["FLOAT_DATA"][0]
+    assert float_data.dtype == np.float32
+    for ipol in range(float_data.shape[0]):
+        if not collected["FLAG"][0][ipol].all():
+            assert np.any(np.all(decoded == float_data[ipol], axis=1))
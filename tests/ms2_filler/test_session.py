@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2 import session as session_module
+from nro45data.psw.ms2._casa import open_table
+from nro45data.psw.ms2.builder import SUBTABLES, build_ms2
+from nro45data.psw.ms2.filler import fill_ms2
+from nro45data.psw.ms2.session import MsWriteSession, get_active_session, open_ms_table
+
+
+@pytest.fixture(scope="module")
+def table(data_dir):
+    return _read_psw_table(os.path.join(data_dir, "nmlh40.240926005833.01.nqm"))
+
+
+def test_session_opens_each_table_once(table, tmp_path, monkeypatch):
+    calls = []
+
+    def counted(func):
+        def wrapper(table_name, *args, **kwargs):
+            calls.append(table_name)
+            return func(table_name, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(session_module, "create_table", counted(session_module.create_table))
+    monkeypatch.setattr(session_module, "open_table_tool", counted(session_module.open_table_tool))
+
+    msfile = str(tmp_path / "test.ms")
+    with MsWriteSession(msfile) as session:
+        assert get_active_session(msfile) is session
+        build_ms2(msfile)
+        fill_ms2(msfile, table)
+    assert get_active_session(msfile) is None
+
+    # tables are created once and never reopened
+    assert len(calls) == len(SUBTABLES) + 1
+    assert sorted(calls) == sorted([msfile] + [os.path.join(msfile, name) for name, _ in SUBTABLES])
+
+    with open_table(msfile) as tb:
+        assert tb.nrows() == 76
+        assert tb.getkeyword("MS_VERSION") == 2.0
+        assert tb.getkeyword("ANTENNA") == f"Table: {os.path.join(msfile, 'ANTENNA')}"
+    with open_table(os.path.join(msfile, "STATE")) as tb:
+        assert tb.nrows() > 0
+
+
+def test_session_reuse_and_release(tmp_path):
+    msfile = str(tmp_path / "test.ms")
+    with MsWriteSession(msfile) as session:
+        build_ms2(msfile)
+        with open_ms_table(msfile, "ANTENNA") as tb0, open_ms_table(msfile, "antenna") as tb1:
+            assert tb0 is tb1
+            tb0.addrows(2)
+
+        session.release("ANTENNA")
+        with open_ms_table(msfile, "ANTENNA") as tb2:
+            assert tb2 is not tb0
+            assert tb2.nrows() == 2
+
+
+def test_session_nested(tmp_path):
+    msfile = str(tmp_path / "test.ms")
+    with MsWriteSession(msfile):
+        with pytest.raises(RuntimeError):
+            with MsWriteSession(os.path.join(str(tmp_path), ".", "test.ms")):
+                pass
+        assert get_active_session(msfile) is not None
+    assert get_active_session(msfile) is None
+
+
+def test_open_ms_table_without_session(tmp_path):
+    msfile = str(tmp_path / "test.ms")
+    build_ms2(msfile)
+    with open_ms_table(msfile, "MAIN") as tb:
+        assert tb.getkeyword("MS_VERSION") == 2.0
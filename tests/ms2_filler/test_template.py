@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2 import _to_ms2
+from nro45data.psw.ms2 import template as template_module
+from nro45data.psw.ms2._casa import open_table
+from nro45data.psw.ms2.builder import SUBTABLES, build_ms2
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.schema.storage import DataShape
+from nro45data.psw.ms2.template import build_ms2_from_template, get_cache_dir, get_template, get_template_key
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv("NRO45DATA_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+def _table_desc(msfile):
+    descs = {}
+    for name in ["MAIN"] + [name for name, _ in SUBTABLES]:
+        path = msfile if name == "MAIN" else os.path.join(msfile, name)
+        with open_table(path) as tb:
+            descs[name] = (tb.nrows(), tb.colnames(), [tb.getcoldesc(c)["dataManagerType"] for c in tb.colnames()])
+    return descs
+
+
+def test_template_key():
+    data_shape = DataShape(npol=2, nchan=4096)
+    assert get_template_key() == get_template_key("default")
+    profiles = ("default", "write-optimized", "read-optimized", "compressed-lossy")
+    keys = {get_template_key(p, data_shape) for p in profiles}
+    assert len(keys) == 4
+
+
+def test_cache_dir(cache_dir, monkeypatch):
+    assert get_cache_dir() == os.path.join(cache_dir, "ms2_templates")
+
+    monkeypatch.delenv("NRO45DATA_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/xdg")
+    assert get_cache_dir() == "/xdg/nro45data/ms2_templates"
+
+
+def test_template_built_once(cache_dir, monkeypatch):
+    calls = []
+
+    def counted(msfile, *args, **kwargs):
+        calls.append(msfile)
+        return build_ms2(msfile, *args, **kwargs)
+
+    monkeypatch.setattr(template_module, "build_ms2", counted)
+
+    template = get_template()
+    assert get_template() == template
+    assert len(calls) == 1
+    assert os.path.dirname(template) == get_cache_dir()
+    # staging directory is removed
+    assert os.listdir(get_cache_dir()) == [os.path.basename(template)]
+
+
+def test_template_key_shared_by_row_count(data_dir):
+    # files with different number of rows share the template
+    keys = set()
+    for name in ("nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"):
+        table = _read_psw_table(os.path.join(data_dir, name))
+        keys.add(get_template_key("read-optimized", ConversionContext(table).data_shape))
+    assert len(keys) == 1
+
+
+def test_template_eviction(cache_dir, monkeypatch):
+    monkeypatch.setattr(template_module, "MAX_TEMPLATES", 2)
+
+    first = get_template("default")
+    os.utime(first, (0, 0))
+    second = get_template("compressed-lossy")
+    os.utime(second, (1, 1))
+    # recently used template is kept
+    assert get_template("default") == first
+
+    third = get_template("read-optimized", DataShape(npol=1, nchan=64))
+    assert sorted(os.listdir(get_cache_dir())) == sorted(os.path.basename(t) for t in (first, third))
+    assert not os.path.exists(second)
+
+
+def test_build_ms2_from_template_evicted(cache_dir, tmp_path, monkeypatch):
+    # template removed during copy
+    def failed_copy(src, dst):
+        os.makedirs(dst)
+        raise FileNotFoundError(src)
+
+    monkeypatch.setattr(template_module.shutil, "copytree", failed_copy)
+    msfile = str(tmp_path / "test.ms")
+    build_ms2_from_template(msfile)
+    assert len(_table_desc(msfile)) == len(SUBTABLES) + 1
+
+
+def test_build_ms2_from_template(cache_dir, tmp_path):
+    expected = str(tmp_path / "expected.ms")
+    build_ms2(expected)
+
+    for i in range(2):
+        msfile = str(tmp_path / f"test{i}.ms")
+        build_ms2_from_template(msfile)
+        assert _table_desc(msfile) == _table_desc(expected)
+        with open_table(msfile) as tb:
+            assert tb.getkeyword("MS_VERSION") == 2.0
+
+
+def test_build_ms2_from_template_fallback(tmp_path, monkeypatch):
+    # cache directory cannot be created under regular file
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("NRO45DATA_CACHE_DIR", str(blocker))
+
+    msfile = str(tmp_path / "test.ms")
+    build_ms2_from_template(msfile)
+    assert len(_table_desc(msfile)) == len(SUBTABLES) + 1
+
+
+def test_to_ms2_uses_template(data_dir, cache_dir, tmp_path):
+    table = _read_psw_table(os.path.join(data_dir, "nmlh40.240926005833.01.nqm"))
+    for i in range(2):
+        msfile = str(tmp_path / f"test{i}.ms")
+        assert _to_ms2(table, msfile) is True
+        with open_table(msfile) as tb:
+            assert tb.nrows() == 76
+            assert tb.getkeyword("ANTENNA") == f"Table: {os.path.join(msfile, 'ANTENNA')}"
+    assert os.listdir(get_cache_dir()) == [f"{get_template_key()}.ms"]
@@ -0,0 +1,127 @@
+import contextlib
+import types
+
+import numpy as np
+
+from nro45data.psw.ms2.filler import utils
+from nro45data.psw.ms2.filler.utils import (
+    ColumnBlock,
+    DataChunk,
+    IntegrationIndex,
+    fill_ms_table,
+    iter_time_blocks,
+    rows_to_column_blocks,
+)
+
+
+def test_column_block_num_rows():
+    block = ColumnBlock({"TIME": np.arange(5.0), "FLAG": np.zeros((5, 2, 3), dtype=bool)}, start_row=1, row_increment=2)
+    assert block.num_rows == 5
+    assert ColumnBlock({}).num_rows == 0
+
+
+def test_rows_to_column_blocks():
+    rows = [
+        {"NUM_CHAN": 2, "NAME": "A1", "CHAN_FREQ": np.array([1.0, 2.0])},
+        {"NUM_CHAN": 2, "NAME": "A2", "CHAN_FREQ": np.array([3.0, 4.0])},
+        {"NUM_CHAN": 3, "NAME": "A3", "CHAN_FREQ": np.array([5.0, 6.0, 7.0])},
+        {"NUM_CHAN": 2, "NAME": "A4", "CHAN_FREQ": np.array([8.0, 9.0])},
+    ]
+    blocks = list(rows_to_column_blocks(rows))
+    assert [b.start_row for b in blocks] == [0, 2, 3]
+    assert [b.num_rows for b in blocks] == [2, 1, 1]
+    assert all(b.row_increment == 1 for b in blocks)
+    np.testing.assert_array_equal(blocks[0].columns["NAME"], ["A1", "A2"])
+    np.testing.assert_array_equal(blocks[0].columns["CHAN_FREQ"], [[1.0, 2.0], [3.0, 4.0]])
+    np.testing.assert_array_equal(blocks[1].columns["CHAN_FREQ"], [[5.0, 6.0, 7.0]])
+
+    assert list(rows_to_column_blocks([])) == []
+
+
+class _FakeTable:
+    def __init__(self):
+        self.num_rows = 0
+        self.added = []
+        self.cells = {}
+
+    def nrows(self):
+        return self.num_rows
+
+    def addrows(self, n):
+        self.added.append(n)
+        self.num_rows += n
+
+    def putcell(self, key, row_id, value):
+        assert row_id < self.num_rows
+        self.cells[(key, row_id)] = value
+
+
+def _fill_fake_table(monkeypatch, row_generator, **kwargs):
+    tb = _FakeTable()
+    monkeypatch.setattr(utils, "open_ms_table", lambda msfile, table_name: contextlib.nullcontext(tb))
+    monkeypatch.setattr(utils, "put_column", lambda tb, key, value, start_row, row_increment: None)
+    fill_ms_table("dummy.ms", None, "DUMMY", row_generator, **kwargs)
+    return tb
+
+
+def test_fill_ms_table_allocates_rows_once(monkeypatch):
+    def _column_blocks(context):
+        for start in range(0, 10, 4):
+            yield ColumnBlock({"TIME": np.arange(start, min(start + 4, 10), dtype=float)}, start_row=start)
+
+    tb = _fill_fake_table(monkeypatch, _column_blocks, num_rows=10)
+    assert tb.added == [10]
+
+    def _rows(context):
+        for i in range(3):
+            yield {"NAME": f"row{i}"}
+
+    tb = _fill_fake_table(monkeypatch, _rows)
+    assert tb.added == [3]
+    assert tb.cells == {("NAME", 0): "row0", ("NAME", 1): "row1", ("NAME", 2): "row2"}
+
+
+def test_iter_time_blocks(monkeypatch):
+    monkeypatch.setattr(utils, "TIMES_PER_BLOCK", 4)
+    blocks = list(iter_time_blocks(10))
+    assert [(b.start, b.stop) for b in blocks] == [(0, 4), (4, 8), (8, 10)]
+    assert list(iter_time_blocks(0)) == []
+    blocks = list(iter_time_blocks(10, start=3))
+    assert [(b.start, b.stop) for b in blocks] == [(3, 7), (7, 10)]
+
+
+def test_data_chunk_select():
+    # only the number of rows of the table matters
+    table = types.SimpleNamespace(data=np.zeros(4))
+    chunk = DataChunk(table, row_offset=3, integrations=slice(1, 2))
+    start, rows = chunk.select(np.array([0, 2, 3, 5, 7, 9]))
+    assert start == 2
+    np.testing.assert_array_equal(rows, [0, 2])
+    start, rows = chunk.select(np.array([0, 1]))
+    assert len(rows) == 0
+
+
+def test_integration_index():
+    start_time = np.array([2.0, 1.0, 2.0, 1.0, 3.0, 2.0])
+    end_time = start_time + 0.5
+    index = IntegrationIndex(start_time, end_time)
+    assert len(index) == 3
+    np.testing.assert_array_equal(index.unique_time, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(index.first_rows, [1, 0, 4])
+    np.testing.assert_array_equal(index.time_index, [1, 0, 1, 0, 2, 1])
+    np.testing.assert_array_equal(index.rows(1), [0, 2, 5])
+    np.testing.assert_array_equal(index.mid_time, [1.25, 2.25, 3.25])
+    np.testing.assert_array_equal(index.interval, [0.5, 0.5, 0.5])
+
+    assert not index.is_time_ordered
+
+    assert len(IntegrationIndex(np.array([]), np.array([]))) == 0
+    assert IntegrationIndex(np.array([1.0, 1.0, 2.0]), np.array([1.5, 1.5, 2.5])).is_time_ordered
+
+
+def test_integration_index_first_rows_where():
+    arryt = np.array(["A1", "A2", "A1", "A1", "A2"])
+    start_time = np.array([0.0, 0.0, 1.0, 1.0, 2.0])
+    index = IntegrationIndex(start_time, start_time + 1)
+    np.testing.assert_array_equal(index.first_rows_where(arryt == "A1"), [0, 2, -1])
+    np.testing.assert_array_equal(index.first_rows_where(arryt == "A2"), [1, -1, 4])
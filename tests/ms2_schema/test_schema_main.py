@@ -172,3 +172,26 @@ def test_main_schema_flag_row(tb):
     col = get_checker(tb, "FLAG_ROW")
     assert col.is_scalar()
     assert col.get_type() == "boolean"
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "ANTENNA2",
+        "FEED1",
+        "FEED2",
+        "FIELD_ID",
+        "ARRAY_ID",
+        "OBSERVATION_ID",
+        "PROCESSOR_ID",
+        "UVW",
+        "INTERVAL",
+    ],
+)
+def test_main_schema_incremental_storage(tb, name):
+    assert tb.getcoldesc(name)["dataManagerType"] == "IncrementalStMan"
+
+
+@pytest.mark.parametrize("name", ["TIME", "ANTENNA1", "DATA_DESC_ID", "FLOAT_DATA", "FLAG"])
+def test_main_schema_standard_storage(tb, name):
+    assert tb.getcoldesc(name)["dataManagerType"] == "StandardStMan"
@@ -0,0 +1,112 @@
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io import _read_psw_table
+from nro45data.psw.ms2 import _to_ms2
+from nro45data.psw.ms2._casa import open_table
+from nro45data.psw.ms2.filler.context import ConversionContext
+from nro45data.psw.ms2.schema.main import MsMainTable
+from nro45data.psw.ms2.schema.storage import DataShape, get_data_managers, get_tile_shape
+
+
+def test_tile_shape_write_optimized():
+    assert get_tile_shape("write-optimized", DataShape(npol=2, nchan=4096)) == (2, 4096, 4)
+    # at least one row per tile
+    assert get_tile_shape("write-optimized", DataShape(npol=4, nchan=65536)) == (4, 65536, 1)
+
+
+def test_tile_shape_read_optimized():
+    assert get_tile_shape("read-optimized", DataShape(npol=2, nchan=4096)) == (1, 128, 256)
+    # number of rows per tile doesn't depend on data
+    assert get_tile_shape("read-optimized", DataShape(npol=1, nchan=64)) == (1, 64, 512)
+
+
+def test_data_managers():
+    assert get_data_managers("default") == []
+
+    data_managers = get_data_managers("read-optimized", DataShape(npol=2, nchan=4096))
+    assert [dm.columns for dm in data_managers] == [["FLOAT_DATA"], ["FLAG"]]
+    assert all(dm.type == "TiledShapeStMan" for dm in data_managers)
+
+    table_desc = MsMainTable.as_dict(data_managers)
+    assert table_desc["FLOAT_DATA"]["dataManagerType"] == "TiledShapeStMan"
+    assert table_desc["FLOAT_DATA"]["dataManagerGroup"] == "TiledFloatData"
+    assert table_desc["TIME"]["dataManagerType"] == "StandardStMan"
+
+    dminfo = MsMainTable.dminfo(data_managers)
+    assert list(dminfo.keys()) == ["*1", "*2"]
+    np.testing.assert_array_equal(dminfo["*1"]["SPEC"]["DEFAULTTILESHAPE"], [1, 128, 256])
+
+
+def test_data_managers_compressed(caplog):
+    # lossy profile must be requested explicitly
+    with pytest.raises(ValueError, match="Invalid storage profile"):
+        get_data_managers("compressed")
+
+    with caplog.at_level(logging.WARNING):
+        data_managers = get_data_managers("compressed-lossy")
+    assert "lossy" in caplog.text
+    assert len(data_managers) == 1
+    dm = data_managers[0]
+    assert dm.type == "CompressFloat"
+    assert dm.columns == ["FLOAT_DATA"]
+    assert dm.spec["TARGETNAME"] == "FLOAT_DATA_COMPRESSED"
+
+    table_desc = MsMainTable.as_dict(data_managers)
+    assert table_desc["FLOAT_DATA"]["dataManagerType"] == "CompressFloat"
+    assert table_desc["FLOAT_DATA_COMPRESSED"]["valueType"] == "short"
+    assert table_desc["FLOAT_DATA_SCALE"]["valueType"] == "float"
+    assert table_desc["FLOAT_DATA_OFFSET"]["valueType"] == "float"
+    assert "FLOAT_DATA_COMPRESSED" not in MsMainTable.as_dict()
+
+
+def test_data_managers_invalid():
+    with pytest.raises(ValueError, match="Invalid storage profile"):
+        get_data_managers("fast")
+
+    with pytest.raises(ValueError, match="Data shape is required"):
+        get_data_managers("write-optimized")
+
+
+@pytest.mark.parametrize("storage_profile", ["write-optimized", "read-optimized"])
+def test_to_ms2_tiled(data_dir, tmp_path, storage_profile):
+    table = _read_psw_table(os.path.join(data_dir, "nmlzrf.241001030006.01.nqm"))
+    assert ConversionContext(table).data_shape == DataShape(npol=2, nchan=4096)
+
+    msfile = str(tmp_path / "tiled.ms")
+    assert _to_ms2(table, msfile, storage_profile=storage_profile) is True
+
+    with open_table(msfile) as tb:
+        assert tb.nrows() == 44
+        for column_name in ("FLOAT_DATA", "FLAG"):
+            assert tb.getcoldesc(column_name)["dataManagerType"] == "TiledShapeStMan"
+        assert tb.getcoldesc("TIME")["dataManagerType"] == "StandardStMan"
+        float_data = tb.getcell("FLOAT_DATA", 0)
+        assert float_data.size == 2 * 4096
+        assert np.any(float_data != 0)
+
+
+def test_to_ms2_compressed(data_dir, tmp_path):
+    table = _read_psw_table(os.path.join(data_dir, "nmlzrf.241001030006.01.nqm"))
+
+    msfile_default = str(tmp_path / "default.ms")
+    msfile = str(tmp_path / "compressed.ms")
+    assert _to_ms2(table, msfile_default) is True
+    assert _to_ms2(table, msfile, storage_profile="compressed-lossy") is True
+
+    with open_table(msfile_default) as tb:
+        expected = tb.getcol("FLOAT_DATA")
+
+    with open_table(msfile) as tb:
+        assert tb.nrows() == 44
+        assert tb.getcoldesc("FLOAT_DATA")["dataManagerType"] == "CompressFloat"
+        assert tb.getcoldesc("FLOAT_DATA_COMPRESSED")["valueType"] == "short"
+        float_data = tb.getcol("FLOAT_DATA")
+
+    # quantization error is bounded by value range of each row
+    value_range = np.ptp(expected.reshape(len(expected), -1), axis=1)
+    error = np.abs(float_data - expected).reshape(len(expected), -1).max(axis=1)
+    assert np.all(error <= value_range / 65534 + 1e-6 * np.abs(expected).reshape(len(expected), -1).max(axis=1))
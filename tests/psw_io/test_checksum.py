@@ -0,0 +1,147 @@
+import os
+import warnings
+
+import astropy.io.fits as fits
+import numpy as np
+import pytest
+from astropy.io.fits.hdu.base import _ValidHDU
+
+from nro45data.psw import nqm2fits
+from nro45data.psw.io import DataChecksum, iter_psw_chunks, _read_psw, _read_psw_table, _to_fits
+from nro45data.psw.io.checksum import _compute_datasum
+
+
+@pytest.fixture(scope="module")
+def nqmpath(data_dir):
+    return os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+
+
+def _astropy_datasum(buffer):
+    return int(_ValidHDU._compute_checksum(None, np.frombuffer(buffer, dtype="u1")))
+
+
+@pytest.mark.parametrize("size", [0, 1, 4, 7, 2880, 10001])
+def test_compute_datasum(size):
+    rng = np.random.default_rng(size)
+    buffer = rng.integers(0, 256, size, dtype="u1").tobytes()
+    assert _compute_datasum(buffer) == _astropy_datasum(buffer)
+
+
+def test_data_checksum_incremental():
+    rng = np.random.default_rng(0)
+    buffer = rng.integers(0, 256, 10001, dtype="u1").tobytes()
+    checksum = DataChecksum()
+    for start, end in [(0, 3), (3, 5), (5, 5), (5, 4097), (4097, 10001)]:
+        checksum.update(buffer[start:end])
+    assert checksum.nbytes == len(buffer)
+    assert checksum.value == _astropy_datasum(buffer)
+    assert checksum.datasum == str(checksum.value)
+
+
+def test_iter_psw_chunks_checksum(nqmpath):
+    table = _read_psw_table(nqmpath)
+    checksum = DataChecksum()
+    for _ in iter_psw_chunks(nqmpath, rows_per_chunk=10, checksum=checksum):
+        pass
+    assert checksum.nbytes == 76 * 18432
+    assert checksum.value == _astropy_datasum(table.data.array.tobytes())
+
+
+def _verify_checksum(fitsfile):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", fits.verify.VerifyWarning)
+        with fits.open(fitsfile, checksum=True) as hdulist:
+            for hdu in hdulist:
+                assert "CHECKSUM" in hdu.header
+                assert hdu.verify_checksum() == 1
+                assert hdu.verify_datasum() == 1
+            hdu = hdulist[1]
+            assert int(hdu.header["DATASUM"]) == _astropy_datasum(hdu.data.tobytes())
+
+
+def test_to_fits_checksum(nqmpath, tmp_path, monkeypatch):
+    fitsfile = str(tmp_path / "out.fits")
+
+    # data should not be summed again at the time of writing
+    summed = []
+    original = _ValidHDU._compute_checksum
+
+    def _compute_checksum(self, data, sum32=0):
+        summed.append(len(data))
+        return original(self, data, sum32)
+
+    monkeypatch.setattr(_ValidHDU, "_compute_checksum", _compute_checksum)
+    hdulist = _read_psw(nqmpath, checksum=True)
+    assert _to_fits(hdulist, fitsfile, checksum=True) is True
+    assert max(summed) < 76 * 18432
+    monkeypatch.undo()
+
+    # header of the input is not modified
+    assert "DATASUM" not in hdulist[0].header
+    assert "CHECKSUM" not in hdulist[0].header
+    _verify_checksum(fitsfile)
+
+
+def test_to_fits_checksum_ignores_header(nqmpath, tmp_path):
+    # DATASUM in the header is not trusted
+    fitsfile = str(tmp_path / "out.fits")
+    hdulist = _read_psw(nqmpath)
+    hdulist[0].header["DATASUM"] = "12345"
+    assert _to_fits(hdulist, fitsfile, checksum=True) is True
+    _verify_checksum(fitsfile)
+
+
+def test_to_fits_checksum_modified_data(nqmpath, tmp_path):
+    # data checksum is computed again once data is loaded
+    fitsfile = str(tmp_path / "out.fits")
+    hdulist = _read_psw(nqmpath, checksum=True)
+    hdulist[0].data["LDATA"][0, 0] += 1
+    assert _to_fits(hdulist, fitsfile, checksum=True) is True
+    _verify_checksum(fitsfile)
+
+
+def test_to_fits_checksum_header_grows(nqmpath, tmp_path):
+    # fill the last header block so that checksum keywords require new block
+    fitsfile = str(tmp_path / "out.fits")
+    hdulist = _read_psw(nqmpath, checksum=True)
+    header = hdulist[0].header
+    for i in range(-(len(header) + 1) % 36):
+        header[f"DUMMY{i}"] = i
+    assert _to_fits(hdulist, fitsfile, checksum=True) is True
+    assert not os.path.exists(fitsfile + ".tmp")
+    _verify_checksum(fitsfile)
+    with fits.open(fitsfile) as output:
+        assert output[1].header["DUMMY0"] == 0
+
+
+def test_nqm2fits_checksum(nqmpath, tmp_path):
+    fitsfile = str(tmp_path / "out.fits")
+    assert nqm2fits(nqmpath, fitsfile, checksum=True) is True
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", fits.verify.VerifyWarning)
+        with fits.open(fitsfile, checksum=True) as hdulist:
+            for hdu in hdulist:
+                assert hdu.verify_checksum() == 1
+                assert hdu.verify_datasum() == 1
+
+
+def test_nqm2fits_without_checksum(nqmpath, tmp_path):
+    fitsfile = str(tmp_path / "out.fits")
+    assert nqm2fits(nqmpath, fitsfile) is True
+    with fits.open(fitsfile) as hdulist:
+        assert "CHECKSUM" not in hdulist[1].header
+        assert "DATASUM" not in hdulist[1].header
+
+
+def test_truncated_input(nqmpath, tmp_path):
+    truncated = tmp_path / "truncated.nqm"
+    with open(nqmpath, "rb") as f:
+        truncated.write_bytes(f.read(9 * 2880 + 75 * 18432 + 100))
+
+    with pytest.raises(RuntimeError, match="Truncated"):
+        _read_psw(str(truncated))
+    with pytest.raises(RuntimeError, match="Truncated"):
+        _read_psw_table(str(truncated))
+    with pytest.raises(RuntimeError, match="Truncated"):
+        list(iter_psw_chunks(str(truncated)))
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io import _read_psw_table, iter_psw_chunks, read_psw_configuration
+from nro45data.psw.ms2.filler.utils import get_array_configuration, get_intent_map
+
+NQM_FILES = ["nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"]
+
+
+@pytest.mark.parametrize("nqmfile", NQM_FILES)
+@pytest.mark.parametrize("rows_per_chunk", [1, 7, 16, 10000])
+def test_iter_psw_chunks(data_dir, nqmfile, rows_per_chunk):
+    nqmpath = os.path.join(data_dir, nqmfile)
+    table = _read_psw_table(nqmpath)
+
+    chunks = list(iter_psw_chunks(nqmpath, rows_per_chunk=rows_per_chunk))
+    assert sum(len(c) for c in chunks) == len(table)
+
+    # chunk boundary never splits an integration
+    for prev, curr in zip(chunks[:-1], chunks[1:]):
+        assert prev.data["MJDST"][-1] != curr.data["MJDST"][0]
+
+    for name in ("MJDST", "ARRYT", "SCNTP", "LDATA"):
+        concatenated = np.concatenate([c.data[name] for c in chunks])
+        assert np.array_equal(concatenated, table.data[name])
+
+
+def test_iter_psw_chunks_invalid_size(data_dir):
+    nqmpath = os.path.join(data_dir, NQM_FILES[0])
+    with pytest.raises(ValueError):
+        next(iter_psw_chunks(nqmpath, rows_per_chunk=0))
+
+
+@pytest.mark.parametrize("nqmfile", NQM_FILES)
+def test_read_psw_configuration(data_dir, nqmfile):
+    nqmpath = os.path.join(data_dir, nqmfile)
+    table = _read_psw_table(nqmpath)
+    config = read_psw_configuration(nqmpath)
+
+    assert len(config) < len(table)
+    assert get_array_configuration(config) == get_array_configuration(table)
+
+    expected = get_intent_map(table.data["ISCN"], table.data["SCNTP"])
+    assert get_intent_map(config.data["ISCN"], config.data["SCNTP"]) == expected
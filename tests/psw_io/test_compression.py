@@ -0,0 +1,175 @@
+import gzip
+import io
+import lzma
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io import iter_psw_chunks, read_psw_configuration, read_psw_header, _read_psw, _read_psw_table
+from nro45data.psw.io.compression import (
+    _detect_compression,
+    _open_psw,
+    _read_zstd_seek_table,
+    _SeekableZstdReader,
+    write_seekable_zstd,
+)
+
+zstandard = pytest.importorskip("zstandard")
+
+ROW_SIZE = 18432
+
+
+@pytest.fixture(scope="module")
+def nqmpath(data_dir):
+    return os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+
+
+@pytest.fixture(scope="module")
+def compressed_files(nqmpath, tmp_path_factory):
+    outdir = tmp_path_factory.mktemp("compressed")
+    with open(nqmpath, "rb") as f:
+        content = f.read()
+
+    files = {}
+    files["gzip"] = str(outdir / "data.nqm.gz")
+    with gzip.open(files["gzip"], "wb") as f:
+        f.write(content)
+    files["xz"] = str(outdir / "data.nqm.xz")
+    with lzma.open(files["xz"], "wb") as f:
+        f.write(content)
+    files["zstd"] = str(outdir / "data.nqm.zst")
+    with open(files["zstd"], "wb") as f:
+        f.write(zstandard.ZstdCompressor().compress(content))
+    files["zstd-seekable"] = str(outdir / "data.seekable.nqm.zst")
+    write_seekable_zstd(nqmpath, files["zstd-seekable"], frame_size=8 * ROW_SIZE)
+    return files
+
+
+@pytest.fixture(params=["gzip", "xz", "zstd", "zstd-seekable"])
+def compressed_path(compressed_files, request):
+    return compressed_files[request.param]
+
+
+def test_detect_compression(nqmpath, compressed_files):
+    assert _detect_compression(nqmpath) is None
+    assert _detect_compression(compressed_files["gzip"]) == "gzip"
+    assert _detect_compression(compressed_files["xz"]) == "xz"
+    assert _detect_compression(compressed_files["zstd"]) == "zstd"
+    assert _detect_compression(compressed_files["zstd-seekable"]) == "zstd"
+
+
+def test_write_seekable_zstd(nqmpath, compressed_files):
+    path = compressed_files["zstd-seekable"]
+    with open(path, "rb") as f:
+        frames = _read_zstd_seek_table(f)
+    file_size = os.path.getsize(nqmpath)
+    assert sum(frame.size for frame in frames) == file_size
+    assert all(frame.size == 8 * ROW_SIZE for frame in frames[:-1])
+
+    # standard decompressor should ignore seek table
+    with open(path, "rb") as f, open(nqmpath, "rb") as g:
+        decompressed = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read()
+        assert decompressed == g.read()
+
+    # no seek table
+    with open(compressed_files["zstd"], "rb") as f:
+        assert _read_zstd_seek_table(f) is None
+
+
+def test_seekable_zstd_reader(nqmpath, compressed_files, monkeypatch):
+    with open(nqmpath, "rb") as f:
+        expected = f.read()
+
+    with _open_psw(compressed_files["zstd-seekable"]) as f:
+        assert isinstance(f, _SeekableZstdReader)
+        decompressed = []
+        original = f._decompress_frame
+
+        def _decompress_frame(index):
+            decompressed.append(index)
+            return original(index)
+
+        monkeypatch.setattr(f, "_decompress_frame", _decompress_frame)
+
+        # only the frame holding requested range is decompressed
+        offset = 20 * ROW_SIZE + 100
+        f.seek(offset)
+        assert f.read(ROW_SIZE) == expected[offset : offset + ROW_SIZE]
+        assert set(decompressed) == {2}
+
+        # read across frame boundary
+        f.seek(-10, io.SEEK_CUR)
+        assert f.read(8 * ROW_SIZE) == expected[offset + ROW_SIZE - 10 : offset + 9 * ROW_SIZE - 10]
+        assert set(decompressed) == {2, 3}
+
+        f.seek(-5, io.SEEK_END)
+        assert f.read() == expected[-5:]
+        assert f.read(10) == b""
+
+
+@pytest.mark.parametrize("size_offset", [ROW_SIZE, -ROW_SIZE])
+def test_seekable_zstd_reader_size_mismatch(tmp_path, compressed_files, size_offset):
+    # make seek table inconsistent with the last frame
+    content = bytearray(open(compressed_files["zstd-seekable"], "rb").read())
+    footer_offset = len(content) - 9
+    (size,) = struct.unpack_from("<I", content, footer_offset - 4)
+    struct.pack_into("<I", content, footer_offset - 4, size + size_offset)
+    path = tmp_path / "mismatch.nqm.zst"
+    path.write_bytes(bytes(content))
+
+    with _open_psw(str(path)) as f:
+        assert isinstance(f, _SeekableZstdReader)
+        with pytest.raises(EOFError):
+            f.read()
+
+
+def test_read_compressed(nqmpath, compressed_path):
+    expected_header, expected_offset = read_psw_header(nqmpath)
+    header, data_offset = read_psw_header(compressed_path)
+    assert header == expected_header
+    assert data_offset == expected_offset
+
+    expected = _read_psw_table(nqmpath).data.array
+    actual = _read_psw_table(compressed_path).data.array
+    assert actual.tobytes() == expected.tobytes()
+
+    projected = _read_psw_table(compressed_path, columns=["ARRYT"]).data
+    assert np.all(projected["ARRYT"][:4] == ["A5", "A6", "A13", "A14"])
+    # only projected columns are held in memory
+    projected = _read_psw_table(compressed_path, columns=["MJDST", "LDATA"]).data
+    assert projected.names == ["MJDST", "LDATA"]
+    assert projected.array.dtype.itemsize == 8 + 4096 * 4
+    np.testing.assert_array_equal(projected["LDATA"], expected["LDATA"])
+
+    hdu = _read_psw(compressed_path)[0]
+    assert len(hdu.data) == 76
+    assert np.all(hdu.data["MJDST"] == expected["MJDST"])
+
+
+@pytest.mark.parametrize("start_row, stop_row", [(0, None), (40, 60), (75, 100)])
+def test_iter_psw_chunks_compressed(nqmpath, compressed_path, start_row, stop_row):
+    expected = _read_psw_table(nqmpath).data.array[start_row:stop_row]
+    chunks = list(iter_psw_chunks(compressed_path, rows_per_chunk=7, start_row=start_row, stop_row=stop_row))
+    assert b"".join(c.data.array.tobytes() for c in chunks) == expected.tobytes()
+
+
+def test_iter_psw_chunks_invalid_range(nqmpath):
+    with pytest.raises(ValueError):
+        next(iter_psw_chunks(nqmpath, start_row=-1))
+    with pytest.raises(ValueError):
+        next(iter_psw_chunks(nqmpath, start_row=10, stop_row=5))
+
+
+def test_read_psw_configuration_compressed(nqmpath, compressed_path):
+    expected = read_psw_configuration(nqmpath).data.array
+    actual = read_psw_configuration(compressed_path).data.array
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_truncated_seek_table(tmp_path):
+    path = tmp_path / "broken.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(b"abc") + struct.pack("<IBI", 100, 0, 0x8F92EAB1))
+    with open(path, "rb") as f:
+        assert _read_zstd_seek_table(f) is None
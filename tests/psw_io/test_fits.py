@@ -0,0 +1,155 @@
+import gzip
+import os
+import warnings
+
+import astropy.io.fits as fits
+import numpy as np
+import pytest
+
+from nro45data.psw import nqm2fits
+from nro45data.psw.io import _read_psw, _to_fits, _to_fits_compressed, _to_fits_raw
+from nro45data.psw.io import fits as fits_module
+
+
+@pytest.fixture(scope="module")
+def nqmpath(data_dir):
+    return os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+
+
+@pytest.fixture(scope="module")
+def reference_fits(nqmpath, tmp_path_factory):
+    fitsfile = str(tmp_path_factory.mktemp("reference") / "reference.fits")
+    assert _to_fits(_read_psw(nqmpath), fitsfile) is True
+    return fitsfile
+
+
+def _read_bytes(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def test_to_fits_raw_identical(nqmpath, reference_fits, tmp_path):
+    fitsfile = str(tmp_path / "raw.fits")
+    assert _to_fits_raw(nqmpath, fitsfile) is True
+    assert _read_bytes(fitsfile) == _read_bytes(reference_fits)
+
+
+def test_to_fits_raw_buffered_copy(nqmpath, reference_fits, tmp_path, monkeypatch):
+    # small buffer to exercise partial reads and writes
+    monkeypatch.setattr(fits_module, "COPY_BUFFER_SIZE", 1000)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    fitsfile = str(tmp_path / "raw.fits")
+    assert _to_fits_raw(nqmpath, fitsfile) is True
+    assert _read_bytes(fitsfile) == _read_bytes(reference_fits)
+
+
+def test_to_fits_raw_checksum(nqmpath, reference_fits, tmp_path):
+    fitsfile = str(tmp_path / "raw.fits")
+    assert _to_fits_raw(nqmpath, fitsfile, checksum=True) is True
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", fits.verify.VerifyWarning)
+        with fits.open(fitsfile, checksum=True) as hdulist, fits.open(reference_fits) as reference:
+            assert len(hdulist) == 2
+            for hdu in hdulist:
+                assert hdu.verify_checksum() == 1
+                assert hdu.verify_datasum() == 1
+            assert hdulist[1].header["DATASUM"] != "0"
+            np.testing.assert_array_equal(hdulist[1].data, reference[1].data)
+
+    # size doesn't change with checksum keywords as long as they fit in the header blocks
+    assert os.path.getsize(fitsfile) == os.path.getsize(reference_fits)
+
+
+def test_to_fits_raw_gzip(nqmpath, reference_fits, tmp_path):
+    gzipfile = str(tmp_path / "data.nqm.gz")
+    with gzip.open(gzipfile, "wb") as f:
+        f.write(_read_bytes(nqmpath))
+
+    fitsfile = str(tmp_path / "raw.fits")
+    assert _to_fits_raw(gzipfile, fitsfile) is True
+    assert _read_bytes(fitsfile) == _read_bytes(reference_fits)
+
+
+def test_to_fits_raw_no_overwrite(nqmpath, tmp_path):
+    fitsfile = tmp_path / "raw.fits"
+    fitsfile.write_bytes(b"existing")
+    assert _to_fits_raw(nqmpath, str(fitsfile)) is False
+    assert fitsfile.read_bytes() == b"existing"
+
+    assert _to_fits_raw(nqmpath, str(fitsfile), overwrite=True) is True
+    with fits.open(str(fitsfile)) as hdulist:
+        assert hdulist[1].header["NAXIS2"] == 76
+
+
+def test_to_fits_raw_truncated(nqmpath, tmp_path):
+    truncated = tmp_path / "truncated.nqm"
+    with open(nqmpath, "rb") as f:
+        truncated.write_bytes(f.read(9 * 2880 + 75 * 18432 + 100))
+
+    fitsfile = tmp_path / "raw.fits"
+    assert _to_fits_raw(str(truncated), str(fitsfile)) is False
+    assert not fitsfile.exists()
+
+
+def test_to_fits_raw_invalid(tmp_path):
+    invalid = tmp_path / "invalid.nqm"
+    invalid.write_bytes(b"\0" * 2880)
+    with pytest.raises(RuntimeError):
+        _to_fits_raw(str(invalid), str(tmp_path / "raw.fits"))
+
+    with pytest.raises(FileNotFoundError):
+        _to_fits_raw(str(tmp_path / "missing.nqm"), str(tmp_path / "raw.fits"))
+
+
+@pytest.mark.parametrize("compression", ["RICE_1", "GZIP_1", "gzip_2"])
+def test_to_fits_compressed(nqmpath, tmp_path, compression):
+    fitsfile = str(tmp_path / "compressed.fits")
+    hdulist = _read_psw(nqmpath)
+    assert _to_fits_compressed(hdulist, fitsfile, compression=compression, checksum=True) is True
+
+    expected = hdulist[0].data
+    with fits.open(fitsfile, checksum=True) as output:
+        assert len(output) == 3
+        table = output[1]
+        assert "LDATA" not in table.columns.names
+        assert table.columns.names == [c for c in expected.columns.names if c != "LDATA"]
+        assert table.header["OBJECT"] == hdulist[0].header["OBJECT"]
+        np.testing.assert_array_equal(table.data["MJDST"], expected["MJDST"])
+
+        image = output["LDATA"]
+        assert isinstance(image, fits.CompImageHDU)
+        assert image.compression_type == compression.upper()
+        np.testing.assert_array_equal(image.data, expected["LDATA"])
+
+    # checksum of compressed HDU is stored in the header of underlying binary table
+    with fits.open(fitsfile, disable_image_compression=True) as output:
+        for hdu in output:
+            assert hdu.verify_checksum() == 1
+            assert hdu.verify_datasum() == 1
+
+
+def test_to_fits_compressed_tile_rows(nqmpath, tmp_path):
+    fitsfile = str(tmp_path / "compressed.fits")
+    hdulist = _read_psw(nqmpath)
+    assert _to_fits_compressed(hdulist, fitsfile, tile_rows=5) is True
+    with fits.open(fitsfile, disable_image_compression=True) as output:
+        header = output["LDATA"].header
+        assert header["ZTILE1"] == 4096
+        assert header["ZTILE2"] == 5
+        assert header["NAXIS2"] == 16
+    with fits.open(fitsfile) as output:
+        np.testing.assert_array_equal(output["LDATA"].data, hdulist[0].data["LDATA"])
+
+
+def test_to_fits_compressed_invalid(nqmpath, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        _to_fits_compressed(_read_psw(nqmpath), str(tmp_path / "compressed.fits"), compression="HCOMPRESS_1")
+
+
+def test_nqm2fits_compression(nqmpath, tmp_path):
+    fitsfile = str(tmp_path / "compressed.fits")
+    assert nqm2fits(nqmpath, fitsfile, compression="RICE_1") is True
+    with fits.open(fitsfile) as output:
+        assert [hdu.name for hdu in output] == ["PRIMARY", "", "LDATA"]
+        assert output["LDATA"].data.shape == (76, 4096)
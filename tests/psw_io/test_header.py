@@ -0,0 +1,139 @@
+import io
+import os
+import shutil
+
+import numpy as np
+import pytest
+from astropy.io.fits import Header
+
+from nro45data.psw.io.header import (
+    _parse_header_records,
+    _read_header_blocks,
+    _read_psw_header_cached,
+    read_psw_header,
+)
+from nro45data.psw.io.reader import _read_psw
+
+
+def _make_records(*cards):
+    return np.array([c.encode().ljust(80) for c in cards], dtype="S80")
+
+
+@pytest.fixture(scope="module", params=["nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"])
+def nqmpath(data_dir, request):
+    return os.path.join(data_dir, request.param)
+
+
+def test_read_header_blocks():
+    records = _make_records("XTENSION='BINTABLE'", "NAXIS   =2", "END")
+    block = b"".join(records.tolist()).ljust(2880) + b"\0" * 2880
+    header_records, data_offset = _read_header_blocks(io.BytesIO(block), "dummy")
+    assert len(header_records) == 2
+    assert data_offset == 2880
+
+
+def test_read_header_blocks_no_end():
+    records = _make_records("XTENSION='BINTABLE'", "NAXIS   =2")
+    with pytest.raises(RuntimeError):
+        _read_header_blocks(io.BytesIO(b"".join(records.tolist())), "dummy")
+
+
+def test_parse_header_records():
+    records = _make_records(
+        "XTENSION='BINTABLE'                     /",
+        "NAXIS1  =18432                          / Record length",
+        "EPOCH   =2.0000000000000e+03            /",
+        "DAZP    =-7.4000000000000e+00           /",
+        "BEND1   =F                              / Is AOSH used ?",
+        "OBJECT  ='NML-Tau         '             /",
+        "CMTTM   =''                             /",
+        "QUOTE   = 'it''s'                       / escaped quote",
+        "TTYPE1  ='LSDMY11'                      / ='LS  '",
+        "TTYPE2  ='LSDMY11'                      / Reserved",
+        "HISTORY NEWSTAR TITLE2='ffix                           z=1 3b= 0'",
+    )
+    header = _parse_header_records(records)
+    assert header["XTENSION"] == "BINTABLE"
+    assert header["NAXIS1"] == 18432
+    assert isinstance(header["NAXIS1"], int)
+    assert header["EPOCH"] == 2000.0
+    assert header["DAZP"] == -7.4
+    assert header["BEND1"] is False
+    assert header["OBJECT"] == "NML-Tau"
+    assert header["CMTTM"] == ""
+    assert header["QUOTE"] == "it's"
+    assert header["TTYPE1"] == "LSDMY11"
+    assert header["TTYPE2"] == "LSDMY12"
+    assert header["HISTORY"] == ["NEWSTAR TITLE2= 'ffix                           z=1 3b= 0'"]
+
+
+def test_parse_header_records_utf8():
+    records = _make_records(
+        "OBSERVER='Müller'                       / 観測者",
+        "HISTORY température",
+    )
+    header = _parse_header_records(records)
+    assert header["OBSERVER"] == "Müller"
+    assert header["HISTORY"] == ["température"]
+
+    # undecodable bytes don't prevent reading header
+    records = np.array([b"OBJECT  ='Orion\xff'".ljust(80)], dtype="S80")
+    assert _parse_header_records(records)["OBJECT"] == "Orion\ufffd"
+
+
+def test_parse_header_records_duplicate_keyword():
+    cards = ("EPOCH   = 2.0000000000000e+03 /", "OBJECT  = 'NML-Tau'", "EPOCH   = 1.9500000000000e+03")
+    header = _parse_header_records(_make_records(*cards))
+    assert header["EPOCH"] == 2000.0
+
+    # consistent with astropy
+    expected = Header.fromstring("".join(c.ljust(80) for c in cards))
+    assert header["EPOCH"] == expected["EPOCH"]
+
+
+def test_read_psw_header_compatibility(nqmpath):
+    # parsed values should be identical to those of astropy
+    expected = _read_psw(nqmpath)[0].header
+    header, data_offset = read_psw_header(nqmpath)
+
+    assert data_offset == 9 * 2880
+    assert set(header.keys()) == set(expected.keys())
+    for key in expected.keys():
+        if key == "HISTORY":
+            assert header[key] == list(expected[key])
+        else:
+            assert header[key] == expected[key], key
+            assert type(header[key]) is type(expected[key]), key
+
+
+def test_read_psw_header_cache(nqmpath, tmp_path):
+    path = str(tmp_path / os.path.basename(nqmpath))
+    shutil.copy(nqmpath, path)
+
+    _read_psw_header_cached.cache_clear()
+    header, _ = read_psw_header(path)
+    header["OBJECT"] = "modified"
+    header["HISTORY"].append("modified")
+    cached, _ = read_psw_header(path)
+    assert _read_psw_header_cached.cache_info().hits == 1
+    # returned dictionary should not affect cache
+    assert cached["OBJECT"] != "modified"
+    assert "modified" not in cached["HISTORY"]
+
+    # updated file should be read again
+    with open(path, "r+b") as f:
+        f.seek(8 * 80 + 10)
+        f.write(b"NRO45X")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    updated, _ = read_psw_header(path)
+    assert _read_psw_header_cached.cache_info().misses == 2
+    assert updated["TELESCOP"] == "NRO45X"
+
+
+def test_read_psw_header_incompatible(tmp_path):
+    path = tmp_path / "standard.fits"
+    records = _make_records("SIMPLE  =                    T", "END")
+    path.write_bytes(b"".join(records.tolist()).ljust(2880))
+    with pytest.raises(RuntimeError):
+        read_psw_header(str(path))
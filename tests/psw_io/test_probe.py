@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+import nro45data
+from nro45data.psw.io.probe import NqmSummary, _get_newstar_value
+
+
+def test_probe_nqm(data_dir):
+    nqmpath = os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+    summary = nro45data.probe_nqm(nqmpath)
+    assert isinstance(summary, NqmSummary)
+    assert summary.filename == nqmpath
+    assert summary.telescope == "NRO45M"
+    assert summary.observer == "csv24"
+    assert summary.object == "NML-Tau"
+    assert summary.ra == "03:53:28.860"
+    assert summary.dec == "+11:24:22.40"
+    assert summary.epoch == 2000.0
+    assert summary.arrays == (
+        "00000000000000000000",
+        "00000000000000000000",
+        "00001100000011000000",
+        "00000000000000000000",
+    )
+    assert summary.num_rows == 76
+    assert summary.row_size == 18432
+    assert summary.start_time == "20240926005854"
+    assert summary.end_time == "20240926010350"
+
+
+def test_probe_nqm_incompatible(tmp_path):
+    path = tmp_path / "standard.fits"
+    path.write_bytes(b"SIMPLE  =                    T".ljust(80) + b"END".ljust(2800))
+    with pytest.raises(RuntimeError):
+        nro45data.probe_nqm(str(path))
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        ("START-TIME", "20240926005854"),
+        ("SCHED", "nmlh40"),
+        ("TITLE2", "ffix                           z=1 3b= 0"),
+        ("TITLE", None),
+        ("UNKNOWN", None),
+    ],
+)
+def test_get_newstar_value(key, expected):
+    history_cards = [
+        "NEWSTAR START-TIME= '20240926005854'",
+        "NEWSTAR SCHED= 'nmlh40              '",
+        "NEWSTAR TITLE2= 'ffix                           z=1 3b= 0'",
+    ]
+    assert _get_newstar_value(history_cards, key) == expected
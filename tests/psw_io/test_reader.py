@@ -0,0 +1,86 @@
+import gzip
+import os
+import shutil
+import stat
+
+import numpy as np
+import pytest
+
+from nro45data.psw.io.reader import _read_fixed_header_and_data, _read_header_and_data, _read_psw
+
+
+@pytest.fixture(scope="module")
+def nqmpath(data_dir):
+    return os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+
+
+@pytest.fixture
+def readonly_nqmpath(nqmpath, tmp_path):
+    path = tmp_path / os.path.basename(nqmpath)
+    shutil.copy(nqmpath, path)
+    os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    yield str(path)
+    os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+
+
+def test_read_header_and_data(nqmpath):
+    header, data = _read_header_and_data(nqmpath)
+    assert header[0].startswith("XTENSION='BINTABLE'")
+    assert header[-1].strip() == "END"
+    assert all(len(r) == 80 for r in header)
+    # data section starts at the block boundary
+    assert data.readonly
+    assert len(data) == os.path.getsize(nqmpath) - 9 * 2880
+
+
+def test_read_psw_readonly_file(readonly_nqmpath):
+    hdulist = _read_psw(readonly_nqmpath)
+    assert len(hdulist) == 1
+    hdu = hdulist[0]
+    assert hdu.header["NAXIS2"] == 76
+    assert hdu.header["TELESCOP"] == "NRO45M"
+    # duplicate TTYPE has been renamed
+    assert "LSDMY11" in hdu.columns.names
+    assert "LSDMY12" in hdu.columns.names
+
+
+def test_read_psw_zero_copy(nqmpath):
+    hdu = _read_psw(nqmpath)[0]
+    ldata = hdu.data["LDATA"]
+    assert ldata.shape == (76, 4096)
+    # data is a copy-on-write view on the mapped file
+    assert not ldata.flags.owndata
+    assert np.all(hdu.data["ISCN"] >= 0)
+    assert hdu.data["ARRYT"][0] == "A5"
+
+    # modification never reaches the file
+    with open(nqmpath, "rb") as f:
+        original = f.read()
+    ldata[0, 0] = 0
+    with open(nqmpath, "rb") as f:
+        assert f.read() == original
+
+
+def test_read_psw_checksum_keeps_data(nqmpath):
+    _, data = _read_header_and_data(nqmpath)
+    hdu = _read_psw(nqmpath, checksum=True)[0]
+    nbytes = hdu.header["NAXIS1"] * hdu.header["NAXIS2"]
+    # data section is taken as it is in the file
+    assert hdu.data.tobytes() == bytes(data[:nbytes])
+
+
+def test_read_psw_compressed(nqmpath, tmp_path):
+    gzipfile = str(tmp_path / "data.nqm.gz")
+    with open(nqmpath, "rb") as fin, gzip.open(gzipfile, "wb") as fout:
+        shutil.copyfileobj(fin, fout)
+    hdu = _read_psw(gzipfile)[0]
+    expected = _read_psw(nqmpath)[0]
+    assert list(hdu.header.items()) == list(expected.header.items())
+    assert hdu.data.tobytes() == expected.data.tobytes()
+
+
+def test_read_psw_header(nqmpath):
+    header, _ = _read_fixed_header_and_data(nqmpath)
+    hdu = _read_psw(nqmpath)[0]
+    assert list(hdu.header.items()) == list(header.items())
+    assert hdu.columns["MJDST"].unit == header["TUNIT7"]
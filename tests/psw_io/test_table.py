@@ -0,0 +1,143 @@
+import os
+
+import numpy as np
+import pytest
+from astropy.io.fits.header import Header
+
+from nro45data.psw.io import Categorical, PswTable, _read_psw, _read_psw_table
+from nro45data.psw.io.table import _build_dtype, _encode_categorical, _parse_tdim, _parse_tform
+
+
+@pytest.mark.parametrize(
+    "tform, expected",
+    [("4096J", (4096, "J")), ("1D", (1, "D")), ("D", (1, "D")), ("20A", (20, "A")), ("2L", (2, "L"))],
+)
+def test_parse_tform(tform, expected):
+    assert _parse_tform(tform) == expected
+
+
+def test_parse_tform_unsupported():
+    with pytest.raises(ValueError):
+        _parse_tform("1PJ(10)")
+
+
+def test_parse_tdim():
+    assert _parse_tdim("(2,10)") == (10, 2)
+
+
+def _make_header(cards):
+    header = Header()
+    for k, v in cards:
+        header[k] = v
+    return header
+
+
+def test_build_dtype():
+    header = _make_header(
+        [
+            ("NAXIS1", 2 + 4 + 80 + 3),
+            ("NAXIS2", 1),
+            ("TFIELDS", 4),
+            ("TTYPE1", "NAME"),
+            ("TFORM1", "2A"),
+            ("TTYPE2", "SCAN"),
+            ("TFORM2", "1J"),
+            ("TTYPE3", "SPEC"),
+            ("TFORM3", "10D"),
+            ("TDIM3", "(5,2)"),
+            ("TTYPE4", "FLAG"),
+            ("TFORM4", "3L"),
+        ]
+    )
+    dtype = _build_dtype(header)
+    assert dtype.names == ("NAME", "SCAN", "SPEC", "FLAG")
+    assert dtype["NAME"] == np.dtype("S2")
+    assert dtype["SCAN"] == np.dtype(">i4")
+    assert dtype["SPEC"].shape == (2, 5)
+    assert dtype["SPEC"].base == np.dtype(">f8")
+
+    buffer = b"A1" + np.array([7], dtype=">i4").tobytes() + np.arange(10, dtype=">f8").tobytes() + b"TFT"
+    table = PswTable(header, buffer)
+    assert len(table) == 1
+    assert table.data["NAME"][0] == "A1"
+    assert table.data["SCAN"][0] == 7
+    assert table.data["SPEC"].shape == (1, 2, 5)
+    assert np.all(table.data["FLAG"] == [[True, False, True]])
+
+
+def test_build_dtype_row_size_mismatch():
+    header = _make_header([("NAXIS1", 8), ("NAXIS2", 1), ("TFIELDS", 1), ("TTYPE1", "SCAN"), ("TFORM1", "1J")])
+    with pytest.raises(ValueError):
+        _build_dtype(header)
+
+
+@pytest.mark.parametrize("nqmfile", ["nmlh40.240926005833.01.nqm", "nmlzrf.241001030006.01.nqm"])
+def test_psw_table_compatible_with_astropy(data_dir, nqmfile):
+    nqmpath = os.path.join(data_dir, nqmfile)
+    hdu = _read_psw(nqmpath)[0]
+    table = _read_psw_table(nqmpath)
+
+    assert table.columns == hdu.columns.names
+    assert len(table) == hdu.header["NAXIS2"]
+    assert table.header["OBJECT"] == hdu.header["OBJECT"]
+    for name in table.columns:
+        expected = hdu.data[name]
+        actual = table.data[name]
+        assert actual.shape == expected.shape
+        assert np.all(actual == expected), name
+
+    # string columns are stripped on access
+    assert set(np.unique(table.data["SCNTP"])) <= {"ZERO", "ON", "OFF"}
+
+
+def test_encode_categorical():
+    column = np.array([b"ON  ", b"ZERO", b"ON", b"OFF ", b"ZERO"], dtype="S4")
+    categorical = _encode_categorical(column)
+    assert isinstance(categorical, Categorical)
+    np.testing.assert_array_equal(categorical.categories, ["OFF", "ON", "ZERO"])
+    np.testing.assert_array_equal(categorical.codes, [1, 2, 1, 0, 2])
+    np.testing.assert_array_equal(categorical.first_rows(), [3, 0, 1])
+    np.testing.assert_array_equal(categorical.decode(), ["ON", "ZERO", "ON", "OFF", "ZERO"])
+    assert categorical.code_of("ZERO") == 2
+    assert categorical.code_of("OF") == -1
+    assert categorical.code_of("Z") == -1
+
+    # unicode column, e.g. taken from astropy's FITS_rec
+    unicode_categorical = _encode_categorical(column.astype("U4"))
+    np.testing.assert_array_equal(unicode_categorical.categories, categorical.categories)
+    np.testing.assert_array_equal(unicode_categorical.codes, categorical.codes)
+
+
+@pytest.mark.parametrize("name", ["ARRYT", "SCNTP", "SIDBD", "POLTP", "RX"])
+def test_psw_data_categorical(data_dir, name):
+    table = _read_psw_table(os.path.join(data_dir, "nmlzrf.241001030006.01.nqm"))
+    categorical = table.data.categorical(name)
+    assert categorical is table.data.categorical(name)
+    np.testing.assert_array_equal(categorical.categories, np.unique(table.data[name]))
+    np.testing.assert_array_equal(categorical.categories[categorical.codes], table.data[name])
+
+    with pytest.raises(ValueError):
+        table.data.categorical("MJDST")
+
+
+def test_read_psw_table_projection(data_dir):
+    nqmpath = os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+    table = _read_psw_table(nqmpath)
+    columns = ["MJDST", "MJDET", "TEMP", "PATM", "VWIND", "DWIND", "ARRYT"]
+    projected = _read_psw_table(nqmpath, columns=columns)
+
+    assert projected.columns == columns
+    assert len(projected) == len(table)
+    # rows are strided views on the original layout
+    assert projected.data.array.strides == (table.header["NAXIS1"],)
+    for name in columns:
+        assert np.array_equal(projected.data[name], table.data[name])
+    assert "LDATA" not in projected.data
+    with pytest.raises((KeyError, ValueError)):
+        projected.data["LDATA"]
+
+
+def test_read_psw_table_projection_missing_column(data_dir):
+    nqmpath = os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+    with pytest.raises(KeyError):
+        _read_psw_table(nqmpath, columns=["MJDST", "NOSUCHCOLUMN"])
@@ -0,0 +1,87 @@
+import os
+import shutil
+
+import astropy.io.fits as fits
+import pytest
+
+import nro45data
+from nro45data.psw.batch import _make_output_name, _run_batch
+from nro45data.psw.ms2._casa import open_table
+
+H40_FILE = "nmlh40.240926005833.01.nqm"
+ZRF_FILE = "nmlzrf.241001030006.01.nqm"
+
+
+@pytest.fixture
+def nqmfiles(data_dir, tmp_path):
+    broken = tmp_path / "broken.nqm"
+    broken.write_bytes(b"SIMPLE  =                    T".ljust(2880))
+    return [os.path.join(data_dir, H40_FILE), str(broken), os.path.join(data_dir, ZRF_FILE)]
+
+
+def _always_fail(nqmfile, outfile, overwrite):
+    return False
+
+
+@pytest.mark.parametrize(
+    "nqmfile, suffix, expected",
+    [
+        ("/data/a.nqm", ".ms", "/out/a.ms"),
+        ("/data/a.NQM", ".fits", "/out/a.fits"),
+        ("/data/a.dat", ".ms", "/out/a.dat.ms"),
+        ("/data/a.nqm.zst", ".ms", "/out/a.ms"),
+        ("/data/a.nqm.gz", ".fits", "/out/a.fits"),
+    ],
+)
+def test_make_output_name(nqmfile, suffix, expected):
+    assert _make_output_name(nqmfile, "/out", suffix) == expected
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_nqm2fits_batch(nqmfiles, tmp_path, jobs):
+    outdir = str(tmp_path / "out")
+    report = nro45data.nqm2fits_batch(nqmfiles, outdir, jobs=jobs)
+
+    # results are ordered as inputs and failure is isolated
+    assert [r.input for r in report.results] == nqmfiles
+    assert [r.status for r in report.results] == [True, False, True]
+    assert report.status is False
+    assert len(report.succeeded) == 2
+    assert "RuntimeError" in report.failed[0].error
+    assert report.summary().startswith("2 of 3 files converted successfully")
+
+    for r in report.succeeded:
+        assert os.path.basename(r.output) == os.path.basename(r.input).replace(".nqm", ".fits")
+        with fits.open(r.output) as hdulist:
+            assert len(hdulist) == 2
+
+
+def test_nqm2ms2_batch(data_dir, tmp_path):
+    if open_table is None:
+        pytest.skip("casatools or python-casacore is not available")
+
+    nqmfiles = [os.path.join(data_dir, f) for f in (H40_FILE, ZRF_FILE)]
+    outdir = str(tmp_path / "out")
+    report = nro45data.nqm2ms2_batch(nqmfiles, outdir, jobs=2)
+    assert report.status is True
+    for r, expected_nrows in zip(report.results, (76, 44)):
+        with open_table(r.output) as tb:
+            assert tb.nrows() == expected_nrows
+
+
+def test_run_batch_returns_false(nqmfiles, tmp_path):
+    report = _run_batch(_always_fail, nqmfiles[:1], str(tmp_path), ".ms", jobs=1)
+    assert report.results[0].status is False
+    assert report.results[0].error is None
+    assert "conversion returned False" in report.summary()
+
+
+def test_run_batch_invalid(nqmfiles, tmp_path):
+    with pytest.raises(ValueError):
+        _run_batch(_always_fail, nqmfiles, str(tmp_path), ".ms", jobs=0)
+
+    duplicate = tmp_path / "sub" / H40_FILE
+    duplicate.parent.mkdir()
+    shutil.copy(nqmfiles[0], duplicate)
+    with pytest.raises(ValueError):
+        _run_batch(_always_fail, [nqmfiles[0], str(duplicate)], str(tmp_path), ".ms")
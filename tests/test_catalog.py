@@ -0,0 +1,112 @@
+import datetime
+import gzip
+import lzma
+import os
+import shutil
+
+import pytest
+
+from nro45data.catalog import Catalog, _to_mjd_seconds
+
+H40_FILE = "nmlh40.240926005833.01.nqm"
+ZRF_FILE = "nmlzrf.241001030006.01.nqm"
+
+
+@pytest.fixture
+def archive_dir(data_dir, tmp_path):
+    archive = tmp_path / "archive"
+    (archive / "2024").mkdir(parents=True)
+    shutil.copy(os.path.join(data_dir, H40_FILE), archive / H40_FILE)
+    shutil.copy(os.path.join(data_dir, ZRF_FILE), archive / "2024" / ZRF_FILE)
+    # non-PSW file should be ignored with warning
+    (archive / "2024" / "broken.nqm").write_bytes(b"SIMPLE  =                    T".ljust(2880))
+    return str(archive)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    with Catalog(str(tmp_path / "catalog.sqlite")) as c:
+        yield c
+
+
+def test_catalog_update(catalog, archive_dir):
+    result = catalog.update(archive_dir)
+    assert len(result.indexed) == 2
+    assert result.skipped == 0
+    assert result.failed == [os.path.join(archive_dir, "2024", "broken.nqm")]
+    assert len(catalog) == 2
+
+    # unchanged files are skipped
+    result = catalog.update(archive_dir)
+    assert result.indexed == []
+    assert result.skipped == 2
+
+    # modified file is re-indexed, removed file is pruned
+    h40_path = os.path.join(archive_dir, H40_FILE)
+    stat = os.stat(h40_path)
+    os.utime(h40_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.remove(os.path.join(archive_dir, "2024", ZRF_FILE))
+    result = catalog.update(archive_dir)
+    assert result.indexed == [h40_path]
+    assert result.removed == [os.path.join(archive_dir, "2024", ZRF_FILE)]
+    assert len(catalog) == 1
+
+
+@pytest.mark.parametrize("suffix, compress", [(".gz", gzip.compress), (".xz", lzma.compress)])
+def test_catalog_update_corrupt_archive(catalog, archive_dir, data_dir, suffix, compress):
+    with open(os.path.join(data_dir, H40_FILE), "rb") as f:
+        compressed = compress(f.read())
+    truncated = os.path.join(archive_dir, "2024", f"truncated.nqm{suffix}")
+    with open(truncated, "wb") as f:
+        f.write(compressed[: len(compressed) // 2])
+    corrupt = os.path.join(archive_dir, "2024", f"corrupt.nqm{suffix}")
+    with open(corrupt, "wb") as f:
+        f.write(compressed[:20] + bytes(len(compressed) - 20))
+
+    # corrupt archives should not roll back other files
+    result = catalog.update(archive_dir)
+    assert len(result.indexed) == 2
+    assert sorted(result.failed) == sorted([os.path.join(archive_dir, "2024", "broken.nqm"), corrupt, truncated])
+    assert len(catalog) == 2
+    assert catalog.describe(truncated) is None
+    assert catalog.describe(corrupt) is None
+
+
+def test_catalog_query(catalog, archive_dir):
+    catalog.update(archive_dir)
+    h40_path = os.path.join(archive_dir, H40_FILE)
+    zrf_path = os.path.join(archive_dir, "2024", ZRF_FILE)
+
+    assert catalog.query() == [h40_path, zrf_path]
+    assert catalog.query(object="nml-tau") == [h40_path, zrf_path]
+    assert catalog.query(object="Orion-KL") == []
+    assert catalog.query(receiver="H40") == [h40_path]
+    assert catalog.query(receiver="Z45V") == [zrf_path]
+    assert catalog.query(processor="AC45", intent="ZERO") == [h40_path, zrf_path]
+    assert catalog.query(processor="AOS-Wide") == []
+    assert catalog.query(start=datetime.date(2024, 9, 30)) == [zrf_path]
+    assert catalog.query(end=datetime.datetime(2024, 9, 28)) == [h40_path]
+    assert catalog.query(observer="CSV24", receiver="h40", start=datetime.date(2024, 9, 1)) == [h40_path]
+
+
+def test_catalog_describe(catalog, archive_dir):
+    catalog.update(archive_dir)
+    entry = catalog.describe(os.path.join(archive_dir, H40_FILE))
+    assert entry["object"] == "NML-Tau"
+    assert entry["num_rows"] == 76
+    assert entry["num_scans"] == 19
+    assert entry["processors"] == ["AC45"]
+    assert [a["array"] for a in entry["arrays"]] == ["A5", "A6", "A13", "A14"]
+    assert all(a["receiver"] == "H40" for a in entry["arrays"])
+    assert [(i["intent"], i["intent_id"]) for i in entry["intents"]] == [("ZERO", 0), ("ON", 1)]
+    assert sum(i["num_rows"] for i in entry["intents"]) == 76
+
+    assert catalog.describe(os.path.join(archive_dir, "unknown.nqm")) is None
+
+
+def test_to_mjd_seconds():
+    assert _to_mjd_seconds(datetime.date(1858, 11, 17)) == 0
+    assert _to_mjd_seconds(datetime.datetime(1858, 11, 18, 0, 0, 1)) == 86401
+    jst = datetime.timezone(datetime.timedelta(hours=9))
+    assert _to_mjd_seconds(datetime.datetime(1858, 11, 18, 9, tzinfo=jst)) == 86400
+    assert _to_mjd_seconds(1.5e9) == 1.5e9
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pytest
 
 from nro45data import psw
@@ -14,7 +16,14 @@ def test_nqm2fits():
     assert psw.nqm2fits.__name__ == "nqm2fits"
     assert psw.nqm2fits.__module__ == "nro45data.psw"
     assert psw.nqm2fits.__doc__ is not None
-    assert psw.nqm2fits.__annotations__ == {"nqmfile": str, "fitsfile": str, "overwrite": bool, "return": bool}
+    assert psw.nqm2fits.__annotations__ == {
+        "nqmfile": str,
+        "fitsfile": str,
+        "overwrite": bool,
+        "checksum": bool,
+        "compression": Optional[str],
+        "return": bool,
+    }
     assert psw.nqm2fits.__module__ == "nro45data.psw"
     assert psw.nqm2fits.__module__ == "nro45data.psw"
     assert psw.nqm2fits.__module__ == "nro45data.psw"
@@ -26,7 +35,14 @@ def test_nqm2ms2():
     assert psw.nqm2ms2.__name__ == "nqm2ms2"
     assert psw.nqm2ms2.__module__ == "nro45data.psw"
     assert psw.nqm2ms2.__doc__ is not None
-    assert psw.nqm2ms2.__annotations__ == {"nqmfile": str, "msfile": str, "overwrite": bool, "return": bool}
+    assert psw.nqm2ms2.__annotations__ == {
+        "nqmfile": str,
+        "msfile": str,
+        "overwrite": bool,
+        "storage_profile": str,
+        "jobs": int,
+        "return": bool,
+    }
     assert psw.nqm2ms2.__module__ == "nro45data.psw"
     assert psw.nqm2ms2.__module__ == "nro45data.psw"
     assert psw.nqm2ms2.__module__ == "nro45data.psw"
@@ -34,6 +50,13 @@ def test_nqm2ms2():
     assert psw.nqm2ms2.__module__ == "nro45data.psw"
 
 
+def test_nqm2sdfits():
+    assert psw.nqm2sdfits.__name__ == "nqm2sdfits"
+    assert psw.nqm2sdfits.__module__ == "nro45data.psw"
+    assert psw.nqm2sdfits.__doc__ is not None
+    assert psw.nqm2sdfits.__annotations__ == {"nqmfile": str, "sdfitsfile": str, "overwrite": bool, "return": bool}
+
+
 def test_nqm2ms4():
     assert psw.nqm2ms4.__name__ == "nqm2ms4"
     assert psw.nqm2ms4.__module__ == "nro45data.psw"
@@ -44,3 +67,18 @@ def test_nqm2ms4():
     assert psw.nqm2ms4.__module__ == "nro45data.psw"
     assert psw.nqm2ms4.__module__ == "nro45data.psw"
     assert psw.nqm2ms4.__module__ == "nro45data.psw"
+
+
+def test_probe_nqm():
+    assert psw.probe_nqm.__name__ == "probe_nqm"
+    assert psw.probe_nqm.__module__ == "nro45data.psw"
+    assert psw.probe_nqm.__doc__ is not None
+    assert psw.probe_nqm.__annotations__ == {"nqmfile": str, "return": psw.NqmSummary}
+
+
+@pytest.mark.parametrize("name", ["nqm2fits_batch", "nqm2ms2_batch"])
+def test_batch(name):
+    func = getattr(psw, name)
+    assert func.__name__ == name
+    assert func.__module__ == "nro45data.psw"
+    assert func.__doc__ is not None
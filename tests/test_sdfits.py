@@ -0,0 +1,98 @@
+import os
+
+import astropy.io.fits as fits
+import numpy as np
+import pytest
+
+import nro45data
+from nro45data.psw import nqm2sdfits
+from nro45data.psw.frequency import _get_frequency_spec
+from nro45data.psw.io import _read_psw
+from nro45data.psw.sdfits import _decode_spectra, _get_stokes_code
+
+
+@pytest.fixture(scope="module")
+def h40_sdfits(data_dir, tmp_path_factory):
+    nqmpath = os.path.join(data_dir, "nmlh40.240926005833.01.nqm")
+    sdfitsfile = str(tmp_path_factory.mktemp("sdfits") / "h40.fits")
+    assert nqm2sdfits(nqmpath, sdfitsfile) is True
+    return nqmpath, sdfitsfile
+
+
+def test_nqm2sdfits_structure(h40_sdfits):
+    _, sdfitsfile = h40_sdfits
+    with fits.open(sdfitsfile) as hdulist:
+        assert len(hdulist) == 2
+        hdu = hdulist[1]
+        assert hdu.name == "SINGLE DISH"
+        assert hdu.header["NMATRIX"] == 1
+        assert hdu.header["CTYPE1"] == "FREQ"
+        assert hdu.header["OBJECT"] == "NML-Tau"
+        assert hdu.header["NAXIS2"] == 76
+        for name in ("SCAN", "OBSMODE", "TIME", "EXPOSURE", "TSYS", "CRPIX1", "CRVAL1", "CDELT1", "DATA"):
+            assert name in hdu.columns.names
+        assert hdu.columns["DATA"].format == "4096E"
+
+
+def test_nqm2sdfits_values(h40_sdfits):
+    nqmpath, sdfitsfile = h40_sdfits
+    hdu_in = _read_psw(nqmpath)[0]
+    data_in = hdu_in.data
+    with fits.open(sdfitsfile) as hdulist:
+        data = hdulist[1].data
+
+        # decoded in the same way as the MS filler
+        expected = data_in["SFCTR"][:, np.newaxis] * data_in["LDATA"] + data_in["ADOFF"][:, np.newaxis]
+        np.testing.assert_array_equal(data["DATA"], expected.astype(np.float32))
+
+        np.testing.assert_array_equal(data["SCAN"], data_in["ISCN"])
+        np.testing.assert_array_equal(data["OBSMODE"], data_in["SCNTP"])
+        np.testing.assert_array_equal(data["TSYS"], data_in["TSYS"].astype(np.float32))
+        np.testing.assert_array_equal(data["TIME"], (data_in["MJDST"] + data_in["MJDET"]) / 2)
+        np.testing.assert_array_equal(data["CRVAL4"], -2)
+        assert data["DATE-OBS"][0].startswith("2024-09-2")
+
+        for row in range(len(data)):
+            chan_freq, _, _ = _get_frequency_spec(hdu_in, row)
+            pixel = np.arange(len(chan_freq)) + 1
+            freq = data["CRVAL1"][row] + data["CDELT1"][row] * (pixel - data["CRPIX1"][row])
+            np.testing.assert_allclose(freq, chan_freq, rtol=0, atol=1e-3)
+
+
+def test_nqm2sdfits_stokes_from_receiver(data_dir, tmp_path):
+    nqmpath = os.path.join(data_dir, "nmlzrf.241001030006.01.nqm")
+    sdfitsfile = str(tmp_path / "zrf.fits")
+    assert nro45data.nqm2sdfits(nqmpath, sdfitsfile) is True
+    with fits.open(sdfitsfile) as hdulist:
+        data = hdulist[1].data
+        assert len(data) == 88
+        assert set(data["CRVAL4"]) == {-5, -6}
+        rx = _read_psw(nqmpath)[0].data["RX"]
+        np.testing.assert_array_equal(data["CRVAL4"] == -5, np.char.endswith(np.char.strip(rx), "H"))
+
+
+def test_nqm2sdfits_no_overwrite(h40_sdfits):
+    nqmpath, sdfitsfile = h40_sdfits
+    mtime = os.path.getmtime(sdfitsfile)
+    assert nqm2sdfits(nqmpath, sdfitsfile) is False
+    assert os.path.getmtime(sdfitsfile) == mtime
+    assert nqm2sdfits(nqmpath, sdfitsfile, overwrite=True) is True
+
+
+def test_decode_spectra():
+    ldata = np.arange(12, dtype=">i4").reshape(3, 4)
+    sfctr = np.array([1.0, 0.5, 0.0])
+    adoff = np.array([0.0, 1.0, 8192.0])
+    nch = np.array([4, 4, 2])
+    spectra = _decode_spectra(ldata, sfctr, adoff, nch)
+    assert spectra.dtype == np.float32
+    np.testing.assert_array_equal(spectra[0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(spectra[1], [3, 3.5, 4, 4.5])
+    np.testing.assert_array_equal(spectra[2], [8192, 8192, np.nan, np.nan])
+
+
+def test_get_stokes_code():
+    codes = _get_stokes_code(np.array(["R", "L", "X"]), np.array(["H40", "H40", "H40"]))
+    np.testing.assert_array_equal(codes, [-1, -2, 0])
+    codes = _get_stokes_code(np.array(["", ""]), np.array(["Z45H", "Z45V"]))
+    np.testing.assert_array_equal(codes, [-5, -6])